@@ -101,6 +101,18 @@ class BasicCreditCurve:
         return np.exp(-integration)
 
 
+    # vectorised survival_probability over an array of dates
+    def survival_probabilities(self, dates):
+        xs = np.array([self.daycount.yearFraction(self.today, date) for date in dates], dtype=float)
+        interp_xs = np.array(self.interp_xs, dtype=float)
+        interp_ys = np.array(self.interp_ys, dtype=float)
+        left_xs = np.concatenate(([0.0], interp_xs[:-1]))
+        cum_integrations = np.concatenate(([0.0], np.cumsum((interp_xs - left_xs) * interp_ys)[:-1]))
+        index = np.minimum(np.searchsorted(interp_xs, xs), len(interp_xs) - 1)
+        integration = cum_integrations[index] + (xs - left_xs[index]) * interp_ys[index]
+        return np.where(xs <= 0, 1.0, np.exp(-integration))
+
+
 
 class ParameterCreditCurve:
     def __init__(
@@ -8,7 +8,6 @@ Created on Wed Nov  6 15:44:39 2024
 from typing import Union
 import numpy as np
 import pandas as pd
-from itertools import repeat
 
 import QuantLib as ql
 
@@ -16,6 +15,60 @@ from utils.ql_date_utils import get_year_fraction, ql_date_str
 from utils.cds_utils import get_settle_date
 
 
+#%%
+# 曲线逐日取样缓存: key为(id(curve), func_name, start, end), 曲线原地更新后自动失效
+# 只缓存带interp_ys的曲线(信用曲线), 其状态由节点值决定; 其他曲线每次重新取样
+_CURVE_SAMPLE_CACHE = {}
+_CURVE_SAMPLE_CACHE_SIZE = 64
+
+
+def _curve_state(curve):
+    return (curve.today, tuple(curve.interp_ys))
+
+
+def _sample_curve_daily(curve, func_name, start_serial, end_serial):
+    # curve.func_name在[start, end]每一天上的取值
+    func = getattr(curve, func_name)
+    is_cached = hasattr(curve, 'interp_ys')
+    if is_cached:
+        key = (id(curve), func_name, int(start_serial), int(end_serial))
+        state = _curve_state(curve)
+        cached = _CURVE_SAMPLE_CACHE.get(key)
+        if (cached is not None) and (cached[0] is curve) and (cached[1] == state):
+            return cached[2]
+
+    dates = [ql.Date(serial) for serial in range(int(start_serial), int(end_serial) + 1)]
+    vectorised_func = getattr(curve, func_name + 's', None)
+    if vectorised_func is None:
+        values = np.array([func(date) for date in dates], dtype=float)
+    else:
+        values = np.asarray(vectorised_func(dates), dtype=float)
+
+    if is_cached:
+        if len(_CURVE_SAMPLE_CACHE) >= _CURVE_SAMPLE_CACHE_SIZE:
+            _CURVE_SAMPLE_CACHE.clear()
+        _CURVE_SAMPLE_CACHE[key] = (curve, state, values)
+    return values
+
+
+def _year_fractions(daycount, start_serials, end_serials, day_stub='IncludeFirstExcludeEnd'):
+    # get_year_fraction的向量化版本, 输入为日期序列号
+    start_serials = np.asarray(start_serials)
+    end_serials = np.asarray(end_serials)
+    if daycount is None:
+        return np.ones(len(end_serials))
+    elif daycount in [ql.Actual360(), ql.Actual365Fixed()]:
+        days = end_serials - start_serials
+        if day_stub == 'ExcludeFirstExcludeEnd':
+            days = days - 1
+        elif day_stub == 'IncludeFirstIncludeEnd':
+            days = days + 1
+        return days / (360.0 if daycount == ql.Actual360() else 365.0)
+    else:
+        return np.array([get_year_fraction(daycount, ql.Date(int(start)), ql.Date(int(end)), day_stub)
+                         for start, end in zip(start_serials, end_serials)])
+
+
 #%%
 class Cds:
     def __init__(
@@ -240,18 +293,10 @@ class Cds:
                                           period_start_dates, period_end_dates, 
                                           cal_ratios, payment_amount_fixed_parts, payment_dates)
         else:
-            def gen_repeat(param):
-                return param if isinstance(param, np.ndarray) else repeat(param, len(cal_ratios))
-            npv_parts = np.array([self._get_npv_day_by_day(today, discount_curve, credit_curve,
-                                                           period_start_date, period_end_date,
-                                                           payment_amount_fixed_part,
-                                                           accrual_pillar_date, payment_date)
-                                  for period_start_date, period_end_date,
-                                  payment_amount_fixed_part, accrual_pillar_date, payment_date
-                                  in zip(period_start_dates, period_end_dates,
-                                         gen_repeat(payment_amount_fixed_parts),
-                                         gen_repeat(accrual_pillar_dates),
-                                         gen_repeat(payment_dates))])
+            npv_parts = self._get_npv_day_by_day_batch(today, discount_curve, credit_curve,
+                                                       period_start_dates, period_end_dates,
+                                                       payment_amount_fixed_parts,
+                                                       accrual_pillar_dates, payment_dates)
             return sum(npv_parts * cal_ratios)
         
         
@@ -293,31 +338,69 @@ class Cds:
                             payment_amount_fixed_part,
                             accrual_pillar_date, payment_date):
         
-        all_dates = ql.NullCalendar().businessDayList(period_start_date, period_end_date)
-        all_start_dates = all_dates[:-1]
-        all_end_dates = all_dates[1:]
+        return self._get_npv_day_by_day_batch(
+            today, discount_curve, credit_curve,
+            np.array([period_start_date]), np.array([period_end_date]),
+            payment_amount_fixed_part,
+            None if accrual_pillar_date is None else np.array([accrual_pillar_date]),
+            None if payment_date is None else np.array([payment_date]))[0]
+
+
+    def _get_npv_day_by_day_batch(self, today, discount_curve, credit_curve,
+                                  period_start_dates, period_end_dates,
+                                  payment_amount_fixed_parts,
+                                  accrual_pillar_dates, payment_dates):
+
+        # 各区间逐日拆分后首尾相接, 曲线只在并集日期网格上取样一次
+        start_serials = np.array([date.serialNumber() for date in period_start_dates])
+        end_serials = np.array([date.serialNumber() for date in period_end_dates])
+        num_periods = len(start_serials)
+        num_days = np.maximum(end_serials - start_serials, 0)
+        npv_parts = np.zeros(num_periods)
+
+        cal_flag = num_days > 0
+        if sum(cal_flag) == 0:
+            return npv_parts
+
+        period_index = np.repeat(np.arange(num_periods), num_days)
+        offsets = np.concatenate(([0], np.cumsum(num_days)[:-1]))
+        all_end_serials = np.arange(len(period_index)) - offsets[period_index] + start_serials[period_index] + 1
+
+        grid_start = min(start_serials[cal_flag])
+        grid_end = max(end_serials[cal_flag])
+        grid_index = all_end_serials - grid_start
+
+        # 计算信用事件概率
+        survival_probabilities = _sample_curve_daily(credit_curve.curve, 'survival_probability',
+                                                    grid_start, grid_end)
+        event_probabilities = (survival_probabilities[grid_index - 1] - survival_probabilities[grid_index]) \
+            / credit_curve.curve.survival_probability(today)
+        
+        # 计算折现因子
+        discount_func = discount_curve.curve.discount
+        if payment_dates is None:
+            discount_factors = _sample_curve_daily(discount_curve.curve, 'discount',
+                                                   grid_start, grid_end)[grid_index]
+        else:
+            discount_factors = np.array([discount_func(date) for date in payment_dates])[period_index]
+        discount_factors = discount_factors / discount_func(today)
         
-        if type(accrual_pillar_date) == type(None):
-            payment_amounts = payment_amount_fixed_part
+        payment_amount_fixed_parts = np.broadcast_to(
+            np.asarray(payment_amount_fixed_parts, dtype=float), (num_periods,))[period_index]
+        if accrual_pillar_dates is None:
+            payment_amounts = payment_amount_fixed_parts
         else:
+            pillar_serials = np.array([date.serialNumber() for date in accrual_pillar_dates])[period_index]
             if not self.coupon_pay_front:
-                payment_amounts = payment_amount_fixed_part * np.array([
-                    get_year_fraction(self.daycount, accrual_pillar_date, date)
-                    for date in all_end_dates])
+                payment_amounts = payment_amount_fixed_parts * _year_fractions(
+                    self.daycount, pillar_serials, all_end_serials)
             else:
-                payment_amounts = - payment_amount_fixed_part * np.array([
-                    get_year_fraction(self.daycount, date, accrual_pillar_date,
-                                      day_stub='IncludeFirstIncludeEnd')
-                    for date in all_end_dates])
-        
-        if type(payment_date) == type(None):
-            payment_dates = all_end_dates
-        else:
-            payment_dates = payment_date
+                payment_amounts = - payment_amount_fixed_parts * _year_fractions(
+                    self.daycount, all_end_serials, pillar_serials, day_stub='IncludeFirstIncludeEnd')
         
-        return self._get_sum_npv_base(today, discount_curve, credit_curve,
-                                      all_start_dates, all_end_dates,
-                                      np.array([1]), payment_amounts, payment_dates)
+        npv_parts[cal_flag] = np.add.reduceat(payment_amounts * discount_factors * event_probabilities,
+                                              offsets[cal_flag])
+        return npv_parts
     
     
     def dv01_spread(self, today, discount_curve, credit_curve, valuation_mode='FI', tweak=1):
@@ -2,3 +2,4 @@ from .interpolator import *
 from .discount_curve import *
 from .discount_curve_zeros import *
 from .forward_curve import *
+from .curve_roll import *
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from enum import Enum
+
+import numpy as np
+
+from ...utils.date import Date
+from ...utils.day_count import DayCountTypes
+from ...utils.error import FinError
+from ...utils.frequency import FrequencyTypes
+from ...utils.helpers import label_to_string, times_from_dates
+from .discount_curve import DiscountCurve
+from .interpolator import Interpolator
+
+
+###############################################################################
+
+
+class RollTypes(Enum):
+    CONSTANT_FORWARDS = 1  # today's forwards are realised, pure carry
+    CONSTANT_ZEROS = 2  # zero rates by time to maturity are unchanged
+
+
+###############################################################################
+
+
+class RolledDiscountCurve(DiscountCurve):
+    """A discount curve rolled forward from its valuation date to a horizon
+    date. Discount factors are read from the base curve. The pillars of the
+    rolled curve, and an interpolator fitted to them, are taken from the
+    base pillars once, when the curve is rolled, so a base curve that is
+    refit must be rolled again.
+
+    With CONSTANT_FORWARDS the discount factor from the horizon to a time t
+    after it is the base forward discount factor df(h + t) / df(h). With
+    CONSTANT_ZEROS it is the base discount factor df(t) to the same time to
+    maturity, which is the roll-down of an unchanged zero curve."""
+
+    def __init__(
+        self,
+        base_curve: DiscountCurve,
+        horizon_dt: Date,
+        roll_type: RollTypes = RollTypes.CONSTANT_FORWARDS,
+    ):
+        if horizon_dt < base_curve.value_dt:
+            raise FinError("Horizon date before curve valuation date")
+
+        if isinstance(roll_type, RollTypes) is False:
+            raise FinError("Unknown roll type " + str(roll_type))
+
+        self.base_curve = base_curve
+        self.roll_type = roll_type
+        self.value_dt = horizon_dt
+        self.dc_type = base_curve.dc_type
+        self.freq_type = getattr(
+            base_curve, "freq_type", FrequencyTypes.CONTINUOUS
+        )
+        self._interp_type = base_curve._interp_type
+
+        # year fraction from the base valuation date to the horizon
+        self._roll_t = times_from_dates(
+            horizon_dt, base_curve.value_dt, base_curve.dc_type
+        )
+        self._df_roll = base_curve.df_t(self._roll_t)
+
+        # pillars of the rolled curve measured from the horizon
+        base_times = np.asarray(base_curve._times)
+        base_dfs = np.asarray(base_curve._dfs)
+
+        if roll_type == RollTypes.CONSTANT_ZEROS:
+            self._times = base_times
+            self._dfs = base_dfs
+        else:
+            live = base_times > self._roll_t
+            self._times = np.concatenate(([0.0], base_times[live] - self._roll_t))
+            self._dfs = np.concatenate(([1.0], base_dfs[live] / self._df_roll))
+
+        self._interpolator = Interpolator(self._interp_type)
+        self._interpolator.fit(self._times, self._dfs)
+
+    ###########################################################################
+
+    def df(self, dt: list | Date, dc_type: DayCountTypes = None):
+        """Discount factor from the horizon date to a date or a vector of
+        dates. With CONSTANT_FORWARDS this is the base forward discount
+        factor, in which both times are measured in the same day count."""
+
+        if self.roll_type == RollTypes.CONSTANT_ZEROS:
+            return super().df(dt, dc_type)
+
+        return self.base_curve.df(dt, dc_type) / self.base_curve.df(
+            self.value_dt, dc_type
+        )
+
+    ###########################################################################
+
+    def df_t(self, t: float | np.ndarray):
+        """Discount factor from the horizon date to a time or a vector of
+        times measured from the horizon."""
+
+        if self.roll_type == RollTypes.CONSTANT_ZEROS:
+            return self.base_curve.df_t(t)
+
+        return self.base_curve.df_t(np.asarray(t) + self._roll_t) / self._df_roll
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("BASE VALUE DATE", self.base_curve.value_dt)
+        s += label_to_string("HORIZON DATE", self.value_dt)
+        s += label_to_string("ROLL TYPE", self.roll_type)
+        return s
+
+
+###############################################################################
+
+
+class CurveRollEngine:
+    """Revalues a portfolio on curves rolled forward to a set of horizon
+    dates, for carry, roll-down and daily P&L attribution.
+
+    The engine holds the curves of the portfolio keyed as the portfolio
+    expects them. For each horizon every curve is rolled once and the whole
+    portfolio is revalued in one call of a user supplied function
+
+        value_fn(value_dt, curves) -> float or np.ndarray
+
+    which may for example price a SwapPortfolio and return its per-trade
+    PVs. Fixings between the valuation date and a horizon are not known
+    today, so value_fn must supply a fixing source that covers them when
+    trades reset inside the horizon."""
+
+    def __init__(
+        self,
+        curves: dict[Hashable, DiscountCurve],
+        roll_type: RollTypes = RollTypes.CONSTANT_FORWARDS,
+    ):
+        if len(curves) == 0:
+            raise FinError("Roll engine needs at least one curve")
+
+        value_dts = {curve.value_dt for curve in curves.values()}
+        if len(value_dts) != 1:
+            raise FinError("Curves must share the same valuation date")
+
+        self.curves = dict(curves)
+        self.roll_type = roll_type
+        self.value_dt = value_dts.pop()
+
+    ###########################################################################
+
+    def rolled_curves(
+        self,
+        horizon_dt: Date,
+        roll_type: RollTypes | None = None,
+    ) -> dict[Hashable, DiscountCurve]:
+        """The curves rolled forward to a horizon date. Rolling to the
+        valuation date returns the curves themselves."""
+
+        if horizon_dt == self.value_dt:
+            return dict(self.curves)
+
+        roll_type = roll_type or self.roll_type
+
+        return {
+            key: RolledDiscountCurve(curve, horizon_dt, roll_type)
+            for key, curve in self.curves.items()
+        }
+
+    ###########################################################################
+
+    def revalue(
+        self,
+        value_fn: Callable,
+        horizon_dts: list[Date],
+        roll_type: RollTypes | None = None,
+    ) -> np.ndarray:
+        """Values of the portfolio at each horizon date on rolled curves.
+        Returns an array with one row per horizon."""
+
+        return np.array(
+            [
+                value_fn(horizon_dt, self.rolled_curves(horizon_dt, roll_type))
+                for horizon_dt in horizon_dts
+            ]
+        )
+
+    ###########################################################################
+
+    def carry_roll_down(
+        self,
+        value_fn: Callable,
+        horizon_dts: list[Date],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Split the value change to each horizon into carry, the change if
+        today's forwards are realised, and roll-down, the further change if
+        instead the zero curve keeps its shape. Returns two arrays with one
+        row per horizon."""
+
+        value_today = np.asarray(value_fn(self.value_dt, dict(self.curves)))
+
+        fwd_values = self.revalue(
+            value_fn, horizon_dts, RollTypes.CONSTANT_FORWARDS
+        )
+        zero_values = self.revalue(
+            value_fn, horizon_dts, RollTypes.CONSTANT_ZEROS
+        )
+
+        return fwd_values - value_today, zero_values - fwd_values
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("VALUE DATE", self.value_dt)
+        s += label_to_string("ROLL TYPE", self.roll_type)
+        s += label_to_string("NUM CURVES", len(self.curves))
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        print(self)
+
+
+###############################################################################
@@ -26,6 +26,13 @@ class DiscountCurve:
     a vector of times and discount factors and an interpolation scheme for
     interpolating between these fixed points."""
 
+    # Discount factor memo - off unless enable_df_memo is called. These are
+    # class level defaults as the curve subclasses build their own state.
+    _df_memo = None
+    _df_memo_size = 0
+    _df_memo_owner = None
+    _df_memo_state = None
+
     ###########################################################################
 
     def __init__(
@@ -295,6 +302,10 @@ class DiscountCurve:
         years."""
 
         day_count_type = dc_type or self.dc_type
+
+        if self._df_memo is not None:
+            return self._df_memoized(dt, day_count_type)
+
         times = times_from_dates(dt, self.value_dt, day_count_type)
         dfs = self.df_t(times)
 
@@ -305,6 +316,139 @@ class DiscountCurve:
 
     ###########################################################################
 
+    def enable_df_memo(self, max_size: int = 10000):
+        """Switch on a bounded memo of discount factors keyed by the date
+        serial and the day count type. Repeated valuations on the same curve
+        then reuse previous lookups. The memo is cleared when the valuation
+        date, the pillars or the interpolation of the curve change, so it
+        stays valid through refits and in place bumps."""
+
+        if max_size < 1:
+            raise FinError("Memo size must be positive.")
+
+        self._df_memo = {}
+        self._df_memo_size = max_size
+        self._df_memo_owner = self
+        self._df_memo_state = None
+
+    ###########################################################################
+
+    def disable_df_memo(self):
+        """Switch off the discount factor memo and release its contents."""
+
+        self._df_memo = None
+        self._df_memo_size = 0
+        self._df_memo_owner = None
+        self._df_memo_state = None
+
+    ###########################################################################
+
+    def warm_df_memo(
+        self, dts: Union[list, Date], dc_type: DayCountTypes = None
+    ):
+        """Pre-compute the discount factors on a set of dates, typically the
+        union of the payment and reset dates of a portfolio, in a single
+        vectorised call. The memo is switched on if it is not already."""
+
+        if self._df_memo is None:
+            self.enable_df_memo()
+
+        if isinstance(dts, Date):
+            dts = [dts]
+
+        unique_dts = list({dt.excel_dt: dt for dt in dts}.values())
+
+        if len(unique_dts) > 0:
+            self._df_memoized(unique_dts, dc_type or self.dc_type)
+
+    ###########################################################################
+
+    def _df_memo_key_state(self):
+        """State of the curve that the memoised discount factors depend on.
+        The pillar arrays are compared by value so that in place bumps of
+        single pillars are seen."""
+
+        return (
+            self.value_dt.excel_dt,
+            self._interp_type,
+            getattr(self, "_interpolator", None),
+            np.asarray(self._times, dtype=float).tobytes(),
+            np.asarray(self._dfs, dtype=float).tobytes(),
+        )
+
+    ###########################################################################
+
+    def _df_memoized(self, dt: Union[list, Date], day_count_type):
+        """Discount factor lookup through the memo. Misses are computed in one
+        batch and stored, evicting the oldest entries beyond the memo size."""
+
+        # a copied curve shares the memo of the original so starts its own
+        if self._df_memo_owner is not self:
+            self.enable_df_memo(self._df_memo_size)
+
+        state = self._df_memo_key_state()
+        memo_state = self._df_memo_state
+
+        if (
+            memo_state is None
+            or memo_state[:2] != state[:2]
+            or memo_state[2] is not state[2]
+            or memo_state[3:] != state[3:]
+        ):
+            self._df_memo.clear()
+            self._df_memo_state = state
+
+        memo = self._df_memo
+
+        if isinstance(dt, Date):
+            key = (dt.excel_dt, day_count_type)
+            df = memo.get(key)
+            if df is None:
+                df = self.df_t(
+                    times_from_dates(dt, self.value_dt, day_count_type)
+                )
+                self._store_dfs([key], [df])
+            return df
+
+        if not isinstance(dt, list) or len(dt) == 0:
+            # let the plain lookup handle arrays and raise the usual errors
+            times = times_from_dates(dt, self.value_dt, day_count_type)
+            return np.array(self.df_t(times))
+
+        keys = [(d.excel_dt, day_count_type) for d in dt]
+        miss_dts = {}
+        for d, key in zip(dt, keys):
+            if key not in memo:
+                miss_dts[key] = d
+
+        if len(miss_dts) > 0:
+            times = times_from_dates(
+                list(miss_dts.values()), self.value_dt, day_count_type
+            )
+            self._store_dfs(list(miss_dts.keys()), self.df_t(times))
+
+        # lookups are repeated in case the batch was larger than the memo
+        dfs = [memo.get(key) for key in keys]
+        if any(df is None for df in dfs):
+            times = times_from_dates(dt, self.value_dt, day_count_type)
+            return np.array(self.df_t(times))
+
+        return np.array(dfs)
+
+    ###########################################################################
+
+    def _store_dfs(self, keys: list, dfs):
+        """Insert discount factors into the memo in first in first out order
+        so that it never grows beyond the configured size."""
+
+        memo = self._df_memo
+        for key, df in zip(keys, np.atleast_1d(dfs)):
+            if len(memo) >= self._df_memo_size:
+                del memo[next(iter(memo))]
+            memo[key] = np.float64(df)
+
+    ###########################################################################
+
     def df_t(self, t: Union[float, np.ndarray]):
         """Function to calculate a discount factor from a time or a
         vector of times. Discourage usage in favour of passing in dates."""
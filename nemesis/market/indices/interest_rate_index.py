@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import datetime
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+import numpy as np
 import pandas as pd
 
 from ...market.curves.discount_curve import DiscountCurve
@@ -12,6 +14,27 @@ from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.error import FinError
 
 
+# Accrual denominators of the day counts the overnight compounding engine
+# handles on date serials directly
+_DAILY_DC_DENOMINATORS = {
+    DayCountTypes.ACT_360: 360.0,
+    DayCountTypes.ACT_365F: 365.0,
+}
+
+# Bound on the number of fully fixed overnight periods cached per index
+_MAX_FIXED_COMPOUNDS = 4096
+
+
+def _dates_from_serials(serials: np.ndarray) -> list[Date]:
+    """Convert Excel date serials, as in Date.excel_dt, to Dates."""
+    epoch = datetime.date(1899, 12, 30)
+    dts = []
+    for serial in serials:
+        dt = epoch + datetime.timedelta(days=int(serial))
+        dts.append(Date(dt.day, dt.month, dt.year))
+    return dts
+
+
 class FixingSource(ABC):
     """Abstract source for historical index fixing data."""
 
@@ -19,6 +42,21 @@ class FixingSource(ABC):
     def get_fixing(self, fixing_dt: Date, value_dt: Date) -> float | None:
         """Return fixing for fixing_dt, or None if unavailable."""
 
+    def get_fixings(
+        self, fixing_dts: list | np.ndarray, value_dt: Date
+    ) -> np.ndarray:
+        """Return fixings for a list of dates, or an array of date serials,
+        as an array with NaN where a fixing is unavailable. Sources should
+        override this with a bulk lookup where they can."""
+        if isinstance(fixing_dts, np.ndarray):
+            fixing_dts = _dates_from_serials(fixing_dts)
+        fixings = np.full(len(fixing_dts), np.nan)
+        for i, fixing_dt in enumerate(fixing_dts):
+            fixing = self.get_fixing(fixing_dt, value_dt)
+            if fixing is not None:
+                fixings[i] = fixing
+        return fixings
+
 
 class DataFrameFixingSource(FixingSource):
     """Fixing source backed by a pandas DataFrame.
@@ -27,6 +65,10 @@ class DataFrameFixingSource(FixingSource):
     - YYYYMMDD strings
     - datetime-like values
 
+    The index is normalised once at construction into a sorted array of date
+    serials (as in Date.excel_dt) and an array of fixings, so lookups are
+    binary searches. Later changes to fixing_df are not seen by the source.
+
     Args:
         fallback_to_last: If True, return the most recent available fixing
             on or before fixing_dt when an exact match is not found.
@@ -44,29 +86,67 @@ class DataFrameFixingSource(FixingSource):
         self.fixing_col = fixing_col
         self.fallback_to_last = fallback_to_last
 
+        self._serials, self._fixings = self._normalise(fixing_df, fixing_col)
+
+    @staticmethod
+    def _normalise(
+        fixing_df: pd.DataFrame, fixing_col: str
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the fixing dates as sorted int32 date serials together with
+        the float64 fixings. For repeated dates the last row wins."""
+        if len(fixing_df) == 0:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float64)
+
+        if pd.api.types.is_string_dtype(fixing_df.index):
+            idx_dt = pd.to_datetime(fixing_df.index, format="%Y%m%d")
+        else:
+            idx_dt = pd.DatetimeIndex(fixing_df.index)
+
+        days = idx_dt.normalize().values.astype("datetime64[D]")
+        serials = (days - np.datetime64("1899-12-30", "D")).astype(np.int32)
+        fixings = fixing_df[fixing_col].to_numpy(dtype=np.float64)
+
+        order = np.argsort(serials, kind="stable")
+        serials = serials[order]
+        fixings = fixings[order]
+
+        is_last = np.append(serials[1:] != serials[:-1], True)
+        return serials[is_last], fixings[is_last]
+
     def get_fixing(self, fixing_dt: Date, value_dt: Date) -> float | None:
         if fixing_dt > value_dt:
             return None
 
-        key_str = fixing_dt.datetime().strftime("%Y%m%d")
-        if key_str in self.fixing_df.index:
-            return float(self.fixing_df.loc[key_str][self.fixing_col])
+        fixing = self.get_fixings([fixing_dt], value_dt)[0]
+        if np.isnan(fixing):
+            return None
+
+        return float(fixing)
 
-        key_ts = pd.Timestamp(fixing_dt.datetime())
-        if key_ts in self.fixing_df.index:
-            return float(self.fixing_df.loc[key_ts][self.fixing_col])
+    def get_fixings(
+        self, fixing_dts: list | np.ndarray, value_dt: Date
+    ) -> np.ndarray:
+        if isinstance(fixing_dts, np.ndarray):
+            serials = fixing_dts.astype(np.int64)
+        else:
+            serials = np.array([int(dt.excel_dt) for dt in fixing_dts], dtype=np.int64)
 
-        if self.fallback_to_last:
-            if pd.api.types.is_string_dtype(self.fixing_df.index):
-                idx_dt = pd.to_datetime(self.fixing_df.index, format="%Y%m%d")
-            else:
-                idx_dt = pd.DatetimeIndex(self.fixing_df.index)
-            mask = idx_dt <= key_ts
-            if mask.any():
-                last_pos = mask.nonzero()[0][-1]
-                return float(self.fixing_df.iloc[last_pos][self.fixing_col])
+        fixings = np.full(len(serials), np.nan)
 
-        return None
+        if len(self._serials) == 0 or len(serials) == 0:
+            return fixings
+
+        # position of the last fixing on or before each date
+        pos = np.searchsorted(self._serials, serials, side="right") - 1
+        found = pos >= 0
+
+        if not self.fallback_to_last:
+            found &= self._serials[np.maximum(pos, 0)] == serials
+
+        found &= serials <= value_dt.excel_dt
+
+        fixings[found] = self._fixings[pos[found]]
+        return fixings
 
 
 @dataclass
@@ -116,6 +196,62 @@ class InterestRateIndex:
 
         return projection_curve.fwd_rate(start_dt, end_dt, self.dc_type) * multiplier
 
+    def period_rates(
+        self,
+        value_dt: Date,
+        reset_dts: list,
+        start_dts: list,
+        end_dts: list,
+        projection_curve: DiscountCurve | None,
+        multiplier: float,
+        fixing_source: FixingSource | None = None,
+        fixing_dts: list | None = None,
+        year_fracs: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Vectorised period_rate over a list of periods. Historical fixings
+        are taken from the fixing source in one bulk lookup and forward rates
+        from two vectorised discount factor calls. Fixing dates and the index
+        year fractions of the periods may be passed in when the caller has
+        already computed them."""
+        if fixing_dts is None:
+            fixing_dts = [
+                self.calendar.add_business_days(dt, -self.fixing_lag)
+                for dt in reset_dts
+            ]
+
+        rates = np.zeros(len(reset_dts))
+        is_fixed = np.array([dt < value_dt for dt in fixing_dts], dtype=bool)
+
+        if is_fixed.any():
+            if fixing_source is None:
+                raise FinError("Require fixing data source")
+            fixings = fixing_source.get_fixings(
+                [dt for dt, fixed in zip(fixing_dts, is_fixed) if fixed], value_dt
+            )
+            if np.isnan(fixings).any():
+                raise FinError("Missing fixing for a historical period")
+            rates[is_fixed] = fixings
+
+        if not is_fixed.all():
+            if projection_curve is None:
+                raise FinError("Projection curve is required for future period rates")
+            fwd_start_dts = [dt for dt, fixed in zip(start_dts, is_fixed) if not fixed]
+            fwd_end_dts = [dt for dt, fixed in zip(end_dts, is_fixed) if not fixed]
+            if year_fracs is None:
+                fwd_year_fracs = np.array(
+                    [
+                        self.day_count.year_frac(dt1, dt2)[0]
+                        for dt1, dt2 in zip(fwd_start_dts, fwd_end_dts)
+                    ]
+                )
+            else:
+                fwd_year_fracs = np.asarray(year_fracs)[~is_fixed]
+            df1 = projection_curve.df(fwd_start_dts, self.dc_type)
+            df2 = projection_curve.df(fwd_end_dts, self.dc_type)
+            rates[~is_fixed] = (df1 / df2 - 1.0) / fwd_year_fracs
+
+        return rates * multiplier
+
 
 @dataclass
 class OvernightIndex(InterestRateIndex):
@@ -126,6 +262,11 @@ class OvernightIndex(InterestRateIndex):
     projection curve's daily forward rate.
     """
 
+    # Growth factors of fully fixed periods, see _fixed_period_compound
+    _fixed_compounds: dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     def _iter_business_days(self, from_dt: Date, to_dt: Date):
         """Yield each business day in [from_dt, to_dt)."""
         dt = from_dt
@@ -155,6 +296,71 @@ class OvernightIndex(InterestRateIndex):
                     continue
         return compound
 
+    def _compound_period_fixings(
+        self,
+        from_dt: Date,
+        to_dt: Date,
+        next_start_dt: Date,
+        value_dt: Date,
+        multiplier: float,
+        fixing_source: FixingSource | None,
+    ) -> float:
+        """Compound the historical fixings of all business days in
+        [from_dt, to_dt), the last one accruing to next_start_dt; return growth
+        factor. Business days come from the calendar bitmap and fixings from
+        one bulk lookup, so no Date is built per day."""
+        if self.dc_type not in _DAILY_DC_DENOMINATORS:
+            reset_dts = list(self._iter_business_days(from_dt, to_dt))
+            return self._compound_fixings(
+                reset_dts, next_start_dt, value_dt, multiplier, fixing_source
+            )
+
+        if fixing_source is None:
+            return 1.0
+
+        # Include the fixing_lag business days before from_dt so that the
+        # fixing of each reset day is the serial fixing_lag places earlier
+        first_fixing_dt = from_dt
+        if self.fixing_lag > 0:
+            first_fixing_dt = self.calendar.add_business_days(from_dt, -self.fixing_lag)
+
+        serials = self.calendar.business_day_serials(first_fixing_dt, to_dt)
+        reset_serials = serials[self.fixing_lag:]
+
+        if len(reset_serials) == 0:
+            return 1.0
+
+        fixing_serials = serials[: len(reset_serials)]
+        accrual_days = np.diff(np.append(reset_serials, int(next_start_dt.excel_dt)))
+        dcfs = accrual_days / _DAILY_DC_DENOMINATORS[self.dc_type]
+
+        fixings = fixing_source.get_fixings(fixing_serials, value_dt)
+        growth = np.where(np.isnan(fixings), 1.0, 1.0 + fixings * multiplier * dcfs)
+        return float(np.prod(growth))
+
+    def _fixed_period_compound(
+        self,
+        start_dt: Date,
+        end_dt: Date,
+        value_dt: Date,
+        multiplier: float,
+        fixing_source: FixingSource | None,
+    ) -> float:
+        """Growth factor of a period whose fixings are all known. These are
+        cached per period, value date, multiplier and fixing source."""
+        key = (start_dt.excel_dt, end_dt.excel_dt, value_dt.excel_dt, multiplier, fixing_source)
+
+        compound = self._fixed_compounds.get(key)
+        if compound is None:
+            compound = self._compound_period_fixings(
+                start_dt, end_dt, end_dt, value_dt, multiplier, fixing_source
+            )
+            if len(self._fixed_compounds) >= _MAX_FIXED_COMPOUNDS:
+                self._fixed_compounds.clear()
+            self._fixed_compounds[key] = compound
+
+        return compound
+
     def period_rate(
         self,
         value_dt: Date,
@@ -179,17 +385,17 @@ class OvernightIndex(InterestRateIndex):
 
         # Fully fixed: compound all historical fixings
         if last_fixing_dt <= value_dt:
-            reset_dts = list(self._iter_business_days(start_dt, end_dt))
-            compound = self._compound_fixings(reset_dts, end_dt, value_dt, multiplier, fixing_source)
+            compound = self._fixed_period_compound(start_dt, end_dt, value_dt, multiplier, fixing_source)
             return (compound - 1.0) / total_dcf
 
         # Partial: historical fixings up to value_dt + one forward for remainder
         if fixing_source is None:
             raise FinError("Require fixing data source for in-progress OIS period")
 
-        fixed_reset_dts = list(self._iter_business_days(start_dt, value_dt.add_days(1)))
         next_reset_dt = self.calendar.adjust(value_dt.add_days(1), BusDayAdjustTypes.FOLLOWING)
-        compound = self._compound_fixings(fixed_reset_dts, next_reset_dt, value_dt, multiplier, fixing_source)
+        compound = self._compound_period_fixings(
+            start_dt, value_dt.add_days(1), next_reset_dt, value_dt, multiplier, fixing_source
+        )
         if projection_curve is None:
             raise FinError("Projection curve is required for future OIS period rates.")
         future_rate = projection_curve.fwd_rate(next_reset_dt, end_dt, dc_type=self.dc_type) * multiplier
@@ -197,3 +403,32 @@ class OvernightIndex(InterestRateIndex):
         compound *= 1.0 + future_rate * future_dcf
 
         return (compound - 1.0) / total_dcf
+
+    def period_rates(
+        self,
+        value_dt: Date,
+        reset_dts: list,
+        start_dts: list,
+        end_dts: list,
+        projection_curve: DiscountCurve | None,
+        multiplier: float,
+        fixing_source: FixingSource | None = None,
+        fixing_dts: list | None = None,
+        year_fracs: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Compounded rates for a list of periods. Each period compounds its
+        own daily fixings so this is evaluated period by period."""
+        return np.array(
+            [
+                self.period_rate(
+                    value_dt,
+                    reset_dt,
+                    start_dt,
+                    end_dt,
+                    projection_curve,
+                    multiplier,
+                    fixing_source,
+                )
+                for reset_dt, start_dt, end_dt in zip(reset_dts, start_dts, end_dts)
+            ]
+        )
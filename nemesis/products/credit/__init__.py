@@ -1,5 +1,7 @@
 from .cds import *
 from .cds_curve import *
+from .cds_portfolio import *
+from .cds_quotes import *
 from .general_cds import *
 from .general_cds_curve import *
-from .ql_cds_curve import *
\ No newline at end of file
+from .ql_cds_curve import *
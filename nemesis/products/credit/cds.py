@@ -1,4 +1,3 @@
-from copy import deepcopy
 from math import exp, log
 
 import numpy as np
@@ -14,7 +13,6 @@ from ...utils.frequency import annual_frequency, FrequencyTypes
 from ...utils.global_vars import g_days_in_year
 from ...utils.math import ONE_MILLION
 from ...utils.helpers import label_to_string, table_to_string
-from ...market.curves.interpolator import InterpTypes, _uinterpolate
 
 from ...utils.helpers import check_argument_types
 
@@ -30,21 +28,61 @@ GLOB_NUM_STEPS_PER_YEAR = 25
 ###############################################################################
 
 
-# @njit(
-#     float64[:](
-#         float64,
-#         float64,
-#         float64[:],
-#         float64[:],
-#         float64[:],
-#         float64[:],
-#         float64[:],
-#         float64[:],
-#         int64,
-#     ),
-#     fastmath=True,
-#     cache=True,
-# )
+@njit(
+    float64(float64, float64[:], float64[:]),
+    fastmath=True,
+    cache=True,
+    nogil=True,
+)
+def _flat_fwd_interpolate(t, times, values):
+    """Compiled FLAT_FWD_RATES branch of _uinterpolate, used by the kernels
+    below on the pillar arrays of the Ibor and survival curves."""
+
+    num_points = times.size
+
+    if t == times[0]:
+        return values[0]
+
+    i = 0
+    while times[i] < t and i < num_points - 1:
+        i = i + 1
+
+    if t > times[i]:
+        i = num_points
+
+    if i < num_points:
+        rt1 = -log(values[i - 1])
+        rt2 = -log(values[i])
+        dt = times[i] - times[i - 1]
+        rtvalue = ((times[i] - t) * rt1 + (t - times[i - 1]) * rt2) / dt
+    else:
+        rt1 = -log(values[i - 2])
+        rt2 = -log(values[i - 1])
+        dt = times[i - 1] - times[i - 2]
+        rtvalue = ((times[i - 1] - t) * rt1 + (t - times[i - 2]) * rt2) / dt
+
+    return exp(-rtvalue)
+
+
+###############################################################################
+
+
+@njit(
+    float64[:](
+        float64,
+        float64,
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        int64,
+    ),
+    fastmath=True,
+    cache=True,
+    nogil=True,
+)
 def _risky_pv01_numba(
     teff,
     accrual_factor_pcd_to_now,
@@ -57,9 +95,8 @@ def _risky_pv01_numba(
     pv01_method,
 ):
     """Fast calculation of the risky PV01 of a CDS using NUMBA.
-    The output is a numpy array of the full and clean risky PV01."""
-
-    method = InterpTypes.FLAT_FWD_RATES.value
+    The output is a numpy array of the full and clean risky PV01. Both
+    curves are interpolated flat in forwards on their pillar arrays."""
 
     if 1 == 0:
         print("===================")
@@ -80,9 +117,9 @@ def _risky_pv01_numba(
 
     # The first cpn is a special case which needs to be handled carefully
     # taking into account what cpn has already accrued and what has not
-    qeff = _uinterpolate(teff, np_surv_times, np_surv_values, method)
-    q1 = _uinterpolate(tncd, np_surv_times, np_surv_values, method)
-    z1 = _uinterpolate(tncd, np_ibor_times, np_ibor_values, method)
+    qeff = _flat_fwd_interpolate(teff, np_surv_times, np_surv_values)
+    q1 = _flat_fwd_interpolate(tncd, np_surv_times, np_surv_values)
+    z1 = _flat_fwd_interpolate(tncd, np_ibor_times, np_ibor_values)
 
     # this is the part of the cpn accrued from previous cpn date to now
     # accrual_factor_pcd_to_now = day_count.year_frac(pcd,teff)
@@ -111,8 +148,8 @@ def _risky_pv01_numba(
 
         t2 = payment_times[it]
 
-        q2 = _uinterpolate(t2, np_surv_times, np_surv_values, method)
-        z2 = _uinterpolate(t2, np_ibor_times, np_ibor_values, method)
+        q2 = _flat_fwd_interpolate(t2, np_surv_times, np_surv_values)
+        z2 = _flat_fwd_interpolate(t2, np_ibor_times, np_ibor_values)
 
         accrual_factor = year_fracs[it]
 
@@ -151,21 +188,22 @@ def _risky_pv01_numba(
 ###############################################################################
 
 
-# @njit(
-#     float64(
-#         float64,
-#         float64,
-#         float64[:],
-#         float64[:],
-#         float64[:],
-#         float64[:],
-#         float64,
-#         int64,
-#         int64,
-#     ),
-#     fastmath=True,
-#     cache=True,
-# )
+@njit(
+    float64(
+        float64,
+        float64,
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64,
+        int64,
+        int64,
+    ),
+    fastmath=True,
+    cache=True,
+    nogil=True,
+)
 def _prot_leg_pv_numba(
     teff,
     t_mat,
@@ -180,14 +218,13 @@ def _prot_leg_pv_numba(
     """Fast calculation of the CDS protection leg PV using NUMBA to speed up
     the numerical integration over time."""
 
-    method = InterpTypes.FLAT_FWD_RATES.value
     dt = 1.0 / num_steps_per_year
     num_steps = int((t_mat - teff) * num_steps_per_year + 0.50)
     dt = (t_mat - teff) / num_steps
 
     t = teff
-    z1 = _uinterpolate(t, np_ibor_times, np_ibor_values, method)
-    q1 = _uinterpolate(t, np_surv_times, np_surv_values, method)
+    z1 = _flat_fwd_interpolate(t, np_ibor_times, np_ibor_values)
+    q1 = _flat_fwd_interpolate(t, np_surv_times, np_surv_values)
 
     prot_pv = 0.0
     small = 1e-8
@@ -196,8 +233,8 @@ def _prot_leg_pv_numba(
 
         for _ in range(0, num_steps):
             t = t + dt
-            z2 = _uinterpolate(t, np_ibor_times, np_ibor_values, method)
-            q2 = _uinterpolate(t, np_surv_times, np_surv_values, method)
+            z2 = _flat_fwd_interpolate(t, np_ibor_times, np_ibor_values)
+            q2 = _flat_fwd_interpolate(t, np_surv_times, np_surv_values)
             # This needs to be updated to handle small h+r
             h12 = -log(q2 / q1) / dt
             r12 = -log(z2 / z1) / dt
@@ -213,8 +250,8 @@ def _prot_leg_pv_numba(
 
         for _ in range(0, num_steps):
             t += dt
-            z2 = _uinterpolate(t, np_ibor_times, np_ibor_values, method)
-            q2 = _uinterpolate(t, np_surv_times, np_surv_values, method)
+            z2 = _flat_fwd_interpolate(t, np_ibor_times, np_ibor_values)
+            q2 = _flat_fwd_interpolate(t, np_surv_times, np_surv_values)
             dq = q1 - q2
             dprot_pv = 0.5 * (z1 + z2) * dq
             prot_pv += dprot_pv
@@ -225,6 +262,365 @@ def _prot_leg_pv_numba(
     return prot_pv
 
 
+###############################################################################
+
+
+@njit(
+    float64[:, :](
+        float64[:],
+        float64[:],
+        float64[:],
+        int64[:],
+        float64[:],
+        int64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        int64,
+    ),
+    fastmath=True,
+    cache=True,
+    nogil=True,
+)
+def _risky_pv01_batch_numba(
+    teffs,
+    accrual_factors_pcd_to_now,
+    payment_times,
+    payment_offsets,
+    year_fracs,
+    year_frac_offsets,
+    np_ibor_times,
+    np_ibor_values,
+    np_surv_times,
+    np_surv_values,
+    pv01_method,
+):
+    """Risky PV01s of many CDS contracts on the same curves. The payment
+    times of all contracts are stacked in one flat array and those of
+    contract i are held in payment_offsets[i]:payment_offsets[i+1], and
+    likewise for the year fractions. Returns an array with the full and
+    clean risky PV01 of each contract in a row."""
+
+    num_contracts = teffs.size
+    rpv01s = np.empty((num_contracts, 2))
+
+    for i in range(0, num_contracts):
+        rpv01s[i, :] = _risky_pv01_numba(
+            teffs[i],
+            accrual_factors_pcd_to_now[i],
+            payment_times[payment_offsets[i]:payment_offsets[i + 1]],
+            year_fracs[year_frac_offsets[i]:year_frac_offsets[i + 1]],
+            np_ibor_times,
+            np_ibor_values,
+            np_surv_times,
+            np_surv_values,
+            pv01_method,
+        )
+
+    return rpv01s
+
+
+###############################################################################
+
+
+@njit(
+    float64[:](
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        int64,
+        int64,
+    ),
+    fastmath=True,
+    cache=True,
+    nogil=True,
+)
+def _prot_leg_pv_batch_numba(
+    teffs,
+    t_mats,
+    np_ibor_times,
+    np_ibor_values,
+    np_surv_times,
+    np_surv_values,
+    contract_recovery_rates,
+    num_steps_per_year,
+    prot_method,
+):
+    """Protection leg PVs per unit notional of many CDS contracts on the
+    same curves."""
+
+    num_contracts = teffs.size
+    prot_pvs = np.empty(num_contracts)
+
+    for i in range(0, num_contracts):
+        prot_pvs[i] = _prot_leg_pv_numba(
+            teffs[i],
+            t_mats[i],
+            np_ibor_times,
+            np_ibor_values,
+            np_surv_times,
+            np_surv_values,
+            contract_recovery_rates[i],
+            num_steps_per_year,
+            prot_method,
+        )
+
+    return prot_pvs
+
+
+###############################################################################
+
+
+@njit(
+    float64[:](
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+        float64,
+    ),
+    fastmath=True,
+    cache=True,
+    nogil=True,
+)
+def _value_fast_approx_numba(
+    t_eff,
+    t_mat,
+    flat_cont_interest_rate,
+    flat_cds_curve_spread,
+    curve_recovery,
+    contract_recovery_rate,
+    running_cpn,
+    notional,
+    long_protect,
+    accrued,
+):
+    """Flat curve approximation of the full and clean PV of a CDS and of
+    its credit and interest rate sensitivities to 1bp bumps. The output is
+    a numpy array of full_pv, clean_pv, credit01 and ir01."""
+
+    fwd_df = 1.0
+    bump_size = 0.0001
+
+    h = flat_cds_curve_spread / (1.0 - curve_recovery)
+    r = flat_cont_interest_rate
+    w = r + h
+    z = exp(-w * t_eff) - exp(-w * t_mat)
+    clean_rpv01 = (z / w) * 365.0 / 360.0
+    prot_pv = h * (1.0 - contract_recovery_rate) * (z / w) * notional
+    clean_pv = (
+        fwd_df * long_protect * (prot_pv - running_cpn * clean_rpv01 * notional)
+    )
+    full_pv = clean_pv + fwd_df * accrued
+
+    # bump CDS spread and calculate
+    h = (flat_cds_curve_spread + bump_size) / (1.0 - contract_recovery_rate)
+    r = flat_cont_interest_rate
+    w = r + h
+    z = exp(-w * t_eff) - exp(-w * t_mat)
+    clean_rpv01 = (z / w) * 365.0 / 360.0
+    prot_pv = h * (1.0 - contract_recovery_rate) * (z / w) * notional
+    clean_pv_credit_bumped = (
+        fwd_df * long_protect * (prot_pv - running_cpn * clean_rpv01 * notional)
+    )
+    full_pv_credit_bumped = (
+        clean_pv_credit_bumped + fwd_df * long_protect * accrued
+    )
+    credit01 = full_pv_credit_bumped - full_pv
+
+    # bump Rate and calculate
+    h = flat_cds_curve_spread / (1.0 - contract_recovery_rate)
+    r = flat_cont_interest_rate + bump_size
+    w = r + h
+    z = exp(-w * t_eff) - exp(-w * t_mat)
+    clean_rpv01 = (z / w) * 365.0 / 360.0
+    prot_pv = h * (1.0 - contract_recovery_rate) * (z / w) * notional
+    clean_pv_ir_bumped = (
+        fwd_df * long_protect * (prot_pv - running_cpn * clean_rpv01 * notional)
+    )
+    full_pv_ir_bumped = clean_pv_ir_bumped + fwd_df * long_protect * accrued
+    ir01 = full_pv_ir_bumped - full_pv
+
+    return np.array([full_pv, clean_pv, credit01, ir01])
+
+
+###############################################################################
+
+
+@njit(
+    float64[:, :](
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+        float64[:],
+    ),
+    fastmath=True,
+    cache=True,
+    nogil=True,
+)
+def _value_fast_approx_batch_numba(
+    t_effs,
+    t_mats,
+    flat_cont_interest_rates,
+    flat_cds_curve_spreads,
+    curve_recoveries,
+    contract_recovery_rates,
+    running_cpns,
+    notionals,
+    long_protects,
+    accrueds,
+):
+    """Flat curve approximation for many CDS contracts. Returns an array
+    with full_pv, clean_pv, credit01 and ir01 of each contract in a row."""
+
+    num_contracts = t_effs.size
+    values = np.empty((num_contracts, 4))
+
+    for i in range(0, num_contracts):
+        values[i, :] = _value_fast_approx_numba(
+            t_effs[i],
+            t_mats[i],
+            flat_cont_interest_rates[i],
+            flat_cds_curve_spreads[i],
+            curve_recoveries[i],
+            contract_recovery_rates[i],
+            running_cpns[i],
+            notionals[i],
+            long_protects[i],
+            accrueds[i],
+        )
+
+    return values
+
+
+###############################################################################
+
+
+def _curve_arrays(issuer_curve):
+    """The Ibor and survival pillar arrays of an issuer curve in the float64
+    layout expected by the kernels."""
+
+    libor_curve = issuer_curve.libor_curve
+
+    return (
+        np.asarray(libor_curve._times, dtype=np.float64),
+        np.asarray(libor_curve._dfs, dtype=np.float64),
+        np.asarray(issuer_curve._times, dtype=np.float64),
+        np.asarray(issuer_curve._values, dtype=np.float64),
+    )
+
+
+###############################################################################
+
+
+def value_cds_batch(
+    cds_contracts: list,
+    value_dt: Date,
+    issuer_curve,
+    contract_recovery_rate=STANDARD_RECOVERY_RATE,
+    pv01_method=0,
+    prot_method=0,
+    num_steps_per_year=GLOB_NUM_STEPS_PER_YEAR,
+):
+    """Value many CDS contracts on one issuer curve in two compiled passes,
+    one for the risky PV01s and one for the protection legs. Returns the
+    same dictionary as CDS.value with arrays holding one entry per
+    contract. The contract recovery rate may be a float or an array."""
+
+    num_contracts = len(cds_contracts)
+
+    if num_contracts == 0:
+        raise FinError("No CDS contracts have been supplied.")
+
+    teffs = np.empty(num_contracts)
+    t_mats = np.empty(num_contracts)
+    accrual_factors_pcd_to_now = np.empty(num_contracts)
+    running_cpns = np.empty(num_contracts)
+    notionals = np.empty(num_contracts)
+    long_prots = np.empty(num_contracts)
+    payment_offsets = np.zeros(num_contracts + 1, dtype=np.int64)
+    year_frac_offsets = np.zeros(num_contracts + 1, dtype=np.int64)
+    payment_times = []
+    year_fracs = []
+
+    for i, cds in enumerate(cds_contracts):
+        cds_payment_times, accrual_factor_pcd_to_now = cds._premium_times(
+            value_dt
+        )
+        teffs[i] = (cds.step_in_dt - value_dt) / g_days_in_year
+        t_mats[i] = (cds.maturity_dt - value_dt) / g_days_in_year
+        accrual_factors_pcd_to_now[i] = accrual_factor_pcd_to_now
+        running_cpns[i] = cds.running_cpn
+        notionals[i] = cds.notional
+        long_prots[i] = 1.0 if cds.long_protect else -1.0
+        payment_offsets[i + 1] = payment_offsets[i] + len(cds_payment_times)
+        year_frac_offsets[i + 1] = year_frac_offsets[i] + len(
+            cds.accrual_factors
+        )
+        payment_times.extend(cds_payment_times)
+        year_fracs.extend(cds.accrual_factors)
+
+    curve_arrays = _curve_arrays(issuer_curve)
+
+    rpv01s = _risky_pv01_batch_numba(
+        teffs,
+        accrual_factors_pcd_to_now,
+        np.array(payment_times, dtype=np.float64),
+        payment_offsets,
+        np.array(year_fracs, dtype=np.float64),
+        year_frac_offsets,
+        *curve_arrays,
+        pv01_method,
+    )
+
+    recovery_rates = np.broadcast_to(
+        np.asarray(contract_recovery_rate, dtype=np.float64), (num_contracts,)
+    ).copy()
+
+    prot_pvs = (
+        _prot_leg_pv_batch_numba(
+            teffs,
+            t_mats,
+            *curve_arrays,
+            recovery_rates,
+            num_steps_per_year,
+            prot_method,
+        )
+        * notionals
+    )
+
+    fwd_df = 1.0
+
+    dirty_pv = (
+        fwd_df
+        * long_prots
+        * (prot_pvs - running_cpns * rpv01s[:, 0] * notionals)
+    )
+    clean_pv = (
+        fwd_df
+        * long_prots
+        * (prot_pvs - running_cpns * rpv01s[:, 1] * notionals)
+    )
+
+    return {"dirty_pv": dirty_pv, "clean_pv": clean_pv}
+
+
 ###############################################################################
 ###############################################################################
 ###############################################################################
@@ -273,6 +669,7 @@ class CDS:
         self.cal_type = cal_type
         self.freq_type = freq_type
         self.bd_type = bd_type
+        self._premium_times_memo = None
 
         self._generate_adjusted_cds_payment_dts()
         self._calc_flows()
@@ -446,102 +843,133 @@ class CDS:
         num_steps_per_year=GLOB_NUM_STEPS_PER_YEAR,
     ):
         """Calculation of the change in the value of the CDS contract for a
-        one basis point change in the level of the CDS curve."""
+        one basis point change in the level of the CDS curve. This is the
+        parallel total of the bucketed CS01."""
 
-        v0 = self.value(
+        return self.bucketed_credit_dv01(
             value_dt,
             issuer_curve,
             contract_recovery_rate,
             pv01_method,
             prot_method,
             num_steps_per_year,
-        )
+        )["parallel_cs01"]
 
-        bump = 0.0001  # 1 basis point
-
-        # we create a deep copy to avoid state issues
-        bumpedIssuerCurve = deepcopy(issuer_curve)
-        for cds in bumpedIssuerCurve.cds_contracts:
-            cds.running_cpn += bump
-
-        bumpedIssuerCurve._build_curve()
+    ###########################################################################
 
-        v1 = self.value(
+    def bucketed_credit_dv01(
+        self,
+        value_dt,
+        issuer_curve,
+        contract_recovery_rate,
+        pv01_method=0,
+        prot_method=0,
+        num_steps_per_year=GLOB_NUM_STEPS_PER_YEAR,
+        bump=0.0001,  # 1 basis point
+    ):
+        """First order change in the value of the CDS contract for a bump to
+        the running coupon of each calibration contract of a CDSCurve, and
+        their sum for a parallel bump. The sensitivities of the value to the
+        pillar survival probabilities are chained with the quote Jacobian of
+        the bootstrap, so no curve is copied or rebuilt. Returns the pillar
+        dates, the bucketed CS01 and the parallel CS01."""
+
+        pv_survival = issuer_curve._pillar_sensitivities(
+            self,
             value_dt,
-            bumpedIssuerCurve,
             contract_recovery_rate,
             pv01_method,
             prot_method,
             num_steps_per_year,
         )
 
-        credit_dv01 = v1["dirty_pv"] - v0["dirty_pv"]
-        return credit_dv01
+        cs01 = pv_survival @ issuer_curve.quote_jacobian() * bump
+
+        return {
+            "pillar_dts": [cds.maturity_dt for cds in issuer_curve.cds_contracts],
+            "cs01": cs01,
+            "parallel_cs01": float(np.sum(cs01)),
+        }
 
     ###########################################################################
 
-    def interest_dv01(
+    def bucketed_interest_dv01(
         self,
-        value_dt: Date,
+        value_dt,
         issuer_curve,
         contract_recovery_rate,
-        pv01_method: int = 0,
-        prot_method: int = 0,
+        pv01_method=0,
+        prot_method=0,
         num_steps_per_year=GLOB_NUM_STEPS_PER_YEAR,
+        bump=0.0001,  # 1 basis point
     ):
-        """Calculation of the interest DV01 based on a simple bump of
-        the discount factors and reconstruction of the CDS curve."""
+        """First order change in the dirty value of the CDS contract for a
+        bump to each quote of the Ibor curve of a CDSCurve, with the issuer
+        curve recalibrated to its CDS quotes, and their sum for a parallel
+        bump. The sensitivities of the value to the Ibor pillar discount
+        factors are chained with the quote Jacobian of the Ibor curve, and
+        the recalibration adds the pillar survival sensitivities chained
+        with the Ibor Jacobian of the bootstrap. Returns the Ibor pillar
+        dates, the bucketed IR01 and the parallel IR01."""
+
+        libor_curve = issuer_curve.libor_curve
+
+        if not hasattr(libor_curve, "quote_jacobian"):
+            raise FinError("Ibor curve does not have a quote Jacobian.")
 
-        v0 = self.value(
+        pv_df = issuer_curve._ibor_pillar_sensitivities(
+            self,
             value_dt,
-            issuer_curve,
             contract_recovery_rate,
             pv01_method,
             prot_method,
             num_steps_per_year,
+            pv_type="dirty_pv",
         )
 
-        # we create a deep copy to avoid state issues
-        new_issuer_curve = deepcopy(issuer_curve)
-
-        bump = 0.0001  # 1 basis point
-
-        for depo in new_issuer_curve.libor_curve.used_deposits:
-
-            depo.deposit_rate += bump
-
-        for fra in new_issuer_curve.libor_curve.used_fras:
-
-            fra.fra_rate += bump
+        pv_survival = issuer_curve._pillar_sensitivities(
+            self,
+            value_dt,
+            contract_recovery_rate,
+            pv01_method,
+            prot_method,
+            num_steps_per_year,
+        )
 
-        for swap in new_issuer_curve.libor_curve.used_swaps:
+        ir01 = (
+            pv_df @ libor_curve.quote_jacobian()
+            + pv_survival @ issuer_curve.ibor_jacobian()
+        ) * bump
 
-            cpn = swap.fixed_leg.cpn
-            swap.fixed_leg.cpn = cpn + bump
+        return {
+            "pillar_dts": libor_curve.pillar_dts[1:],
+            "ir01": ir01,
+            "parallel_ir01": float(np.sum(ir01)),
+        }
 
-            # Need to regenerate fixed leg payments with bumped cpn
-            # I could call swap.fixed_leg.generate_payments() but it is
-            # overkill as it has to do all the schedule generation which is
-            # not needed as the dates are unchanged
-            num_payments = len(swap.fixed_leg.payments)
-            for i in range(0, num_payments):
-                old_pmt = swap.fixed_leg.payments[i]
-                swap.fixed_leg.payments[i] = old_pmt * (cpn + bump) / cpn
+    ###########################################################################
 
-        new_issuer_curve.libor_curve._build_curve()
-        new_issuer_curve._build_curve()
+    def interest_dv01(
+        self,
+        value_dt: Date,
+        issuer_curve,
+        contract_recovery_rate,
+        pv01_method: int = 0,
+        prot_method: int = 0,
+        num_steps_per_year=GLOB_NUM_STEPS_PER_YEAR,
+    ):
+        """Calculation of the change in the value of the CDS contract for a
+        one basis point change in the quotes of the Ibor curve. This is the
+        parallel total of the bucketed IR01."""
 
-        v1 = self.value(
+        return self.bucketed_interest_dv01(
             value_dt,
-            new_issuer_curve,
+            issuer_curve,
             contract_recovery_rate,
             pv01_method,
             prot_method,
             num_steps_per_year,
-        )
-
-        interest_dv01 = v1["dirty_pv"] - v0["dirty_pv"]
-        return interest_dv01
+        )["parallel_ir01"]
 
     ###########################################################################
 
@@ -650,15 +1078,10 @@ class CDS:
         teff = (self.step_in_dt - value_dt) / g_days_in_year
         t_mat = (self.maturity_dt - value_dt) / g_days_in_year
 
-        libor_curve = issuer_curve.libor_curve
-
         v = _prot_leg_pv_numba(
             teff,
             t_mat,
-            libor_curve._times,
-            libor_curve._dfs,
-            issuer_curve._times,
-            issuer_curve._values,
+            *_curve_arrays(issuer_curve),
             contract_recovery_rate,
             num_steps_per_year,
             prot_method,
@@ -668,11 +1091,18 @@ class CDS:
 
     ###########################################################################
 
-    def risky_pv01(self, value_dt, issuer_curve, pv01_method=0):
-        """The risky_pv01 is the present value of a risky one dollar paid on
-        the premium leg of a CDS contract."""
+    def _premium_times(self, value_dt):
+        """Times of the premium payments after value_dt and the accrual
+        factor from the previous coupon date to the step in date. They are
+        kept for the last valuation date as a curve bootstrap revalues the
+        contract many times on the same date."""
 
-        libor_curve = issuer_curve.libor_curve
+        if self._premium_times_memo is not None:
+            memo_dt, payment_times, accrual_factor_pcd_to_now = (
+                self._premium_times_memo
+            )
+            if memo_dt == value_dt:
+                return payment_times, accrual_factor_pcd_to_now
 
         payment_times = []
         for date in self.payment_dts:
@@ -689,18 +1119,34 @@ class CDS:
 
         accrual_factor_pcd_to_now = day_count.year_frac(pcd, eff)[0]
 
+        payment_times = np.array(payment_times, dtype=np.float64)
+        self._premium_times_memo = (
+            value_dt,
+            payment_times,
+            accrual_factor_pcd_to_now,
+        )
+
+        return payment_times, accrual_factor_pcd_to_now
+
+    ###########################################################################
+
+    def risky_pv01(self, value_dt, issuer_curve, pv01_method=0):
+        """The risky_pv01 is the present value of a risky one dollar paid on
+        the premium leg of a CDS contract."""
+
+        payment_times, accrual_factor_pcd_to_now = self._premium_times(
+            value_dt
+        )
+
         year_fracs = self.accrual_factors
-        teff = (eff - value_dt) / g_days_in_year
+        teff = (self.step_in_dt - value_dt) / g_days_in_year
 
         value_rpv01 = _risky_pv01_numba(
             teff,
             accrual_factor_pcd_to_now,
-            np.array(payment_times),
-            np.array(year_fracs),
-            libor_curve._times,
-            libor_curve._dfs,
-            issuer_curve._times,
-            issuer_curve._values,
+            payment_times,
+            np.array(year_fracs, dtype=np.float64),
+            *_curve_arrays(issuer_curve),
             pv01_method,
         )
 
@@ -772,11 +1218,6 @@ class CDS:
         t_mat = (self.maturity_dt - value_dt) / g_days_in_year
         t_eff = (self.step_in_dt - value_dt) / g_days_in_year
 
-        h = flat_cds_curve_spread / (1.0 - curve_recovery)
-        r = flat_cont_interest_rate
-        fwd_df = 1.0
-        bump_size = 0.0001
-
         if self.long_protect:
             long_protect = +1
         else:
@@ -788,66 +1229,19 @@ class CDS:
         # This is the clean RPV01 as it treats the PV01 stream as though it
         # pays just the accrued for the time between 0 and the maturity
         # It therefore omits the part that has accrued
-
-        w = r + h
-        z = np.exp(-w * t_eff) - np.exp(-w * t_mat)
-        clean_rpv01 = (z / w) * 365.0 / 360.0
-        prot_pv = h * (1.0 - contract_recovery_rate) * (z / w) * self.notional
-        clean_pv = (
-            fwd_df
-            * long_protect
-            * (prot_pv - self.running_cpn * clean_rpv01 * self.notional)
-        )
-        full_pv = clean_pv + fwd_df * accrued
-
-        #######################################################################
-        # bump CDS spread and calculate
-        #######################################################################
-
-        h = (flat_cds_curve_spread + bump_size) / (
-            1.0 - contract_recovery_rate
-        )
-        r = flat_cont_interest_rate
-        w = r + h
-        z = np.exp(-w * t_eff) - np.exp(-w * t_mat)
-        clean_rpv01 = (z / w) * 365.0 / 360.0
-        prot_pv = h * (1.0 - contract_recovery_rate) * (z / w) * self.notional
-        clean_pv_credit_bumped = (
-            fwd_df
-            * long_protect
-            * (prot_pv - self.running_cpn * clean_rpv01 * self.notional)
-        )
-        full_pv_credit_bumped = (
-            clean_pv_credit_bumped + fwd_df * long_protect * accrued
-        )
-        credit01 = full_pv_credit_bumped - full_pv
-
-        #######################################################################
-        # bump Rate and calculate
-        #######################################################################
-
-        h = flat_cds_curve_spread / (1.0 - contract_recovery_rate)
-        r = flat_cont_interest_rate + bump_size
-
-        w = r + h
-        z = np.exp(-w * t_eff) - np.exp(-w * t_mat)
-
-        clean_rpv01 = (z / w) * 365.0 / 360.0
-
-        prot_pv = h * (1.0 - contract_recovery_rate) * (z / w) * self.notional
-
-        clean_pv_ir_bumped = (
-            fwd_df
-            * long_protect
-            * (prot_pv - self.running_cpn * clean_rpv01 * self.notional)
-        )
-
-        full_pv_ir_bumped = (
-            clean_pv_ir_bumped + fwd_df * long_protect * accrued
+        full_pv, clean_pv, credit01, ir01 = _value_fast_approx_numba(
+            t_eff,
+            t_mat,
+            flat_cont_interest_rate,
+            flat_cds_curve_spread,
+            curve_recovery,
+            contract_recovery_rate,
+            self.running_cpn,
+            self.notional,
+            long_protect,
+            accrued,
         )
 
-        ir01 = full_pv_ir_bumped - full_pv
-
         return (full_pv, clean_pv, credit01, ir01)
 
     ###########################################################################
@@ -10,6 +10,7 @@ from ...utils.day_count import DayCount
 from ...utils.frequency import annual_frequency, FrequencyTypes
 from ...utils.helpers import check_argument_types, _func_name
 from ...utils.helpers import label_to_string
+from .cds import GLOB_NUM_STEPS_PER_YEAR
 
 
 ###############################################################################
@@ -35,6 +36,27 @@ def f(q, *args):
 ###############################################################################
 
 
+def f_and_fprime(q, *args):
+    """Value of f and its derivative with respect to the survival probability
+    at the last pillar, the latter by a one sided bump of that pillar in
+    place. Newton then needs two valuations of the CDS per step."""
+
+    curve = args[0]
+    num_points = len(curve._times)
+    dq = 1e-6 * q
+
+    try:
+        obj_fn_up = f(q + dq, *args)
+        obj_fn = f(q, *args)
+    finally:
+        curve._values[num_points - 1] = q
+
+    return obj_fn, (obj_fn_up - obj_fn) / dq
+
+
+###############################################################################
+
+
 class CDSCurve:
     """Generate a survival probability curve implied by the value of CDS
     contracts given a Ibor curve and an assumed recovery rate. The recovery
@@ -70,6 +92,9 @@ class CDSCurve:
 
         self._times = []
         self._values = []
+        self._quote_jacobian = None
+        self._pv_survival = None
+        self._ibor_jacobian = None
 
         if len(self.cds_contracts) > 0:
             self._build_curve()
@@ -164,6 +189,9 @@ class CDSCurve:
         # we size the vectors to include time zero
         self._times = np.array([0.0])
         self._values = np.array([1.0])
+        self._quote_jacobian = None
+        self._pv_survival = None
+        self._ibor_jacobian = None
 
         for i in range(0, num_times):
 
@@ -182,16 +210,222 @@ class CDSCurve:
             self._times = np.append(self._times, t_mat)
             self._values = np.append(self._values, q)
 
-            optimize.newton(
-                f,
-                x0=q,
-                fprime=None,
+            sol = optimize.root_scalar(
+                f_and_fprime,
                 args=argtuple,
-                tol=1e-7,
+                method="newton",
+                x0=q,
+                fprime=True,
+                xtol=1e-7,
                 maxiter=50,
-                fprime2=None,
             )
 
+            if not sol.converged:
+                raise FinError(
+                    "Unable to bootstrap CDS curve at " + str(maturity_dt)
+                )
+
+    ###########################################################################
+
+    def _pillar_sensitivities(
+        self,
+        cds,
+        value_dt,
+        contract_recovery_rate,
+        pv01_method=0,
+        prot_method=0,
+        num_steps_per_year=GLOB_NUM_STEPS_PER_YEAR,
+        rel_bump=1e-6,
+    ):
+        """Derivatives of the clean value of a CDS contract with respect to
+        the survival probability at each pillar. Each pillar is bumped in
+        place and restored, which is cheap as the CDS kernels are compiled,
+        so the curve is neither copied nor rebuilt."""
+
+        sensitivities = np.zeros(len(self._times) - 1)
+
+        for k in range(1, len(self._times)):
+            q = self._values[k]
+            dq = rel_bump * q
+
+            values = []
+            try:
+                for shift in (dq, -dq):
+                    self._values[k] = q + shift
+                    values.append(
+                        cds.value(
+                            value_dt,
+                            self,
+                            contract_recovery_rate,
+                            pv01_method,
+                            prot_method,
+                            num_steps_per_year,
+                        )["clean_pv"]
+                    )
+            finally:
+                self._values[k] = q
+
+            sensitivities[k - 1] = (values[0] - values[1]) / (2.0 * dq)
+
+        return sensitivities
+
+    ###########################################################################
+
+    def _ibor_pillar_sensitivities(
+        self,
+        cds,
+        value_dt,
+        contract_recovery_rate,
+        pv01_method=0,
+        prot_method=0,
+        num_steps_per_year=GLOB_NUM_STEPS_PER_YEAR,
+        pv_type="clean_pv",
+        rel_bump=1e-6,
+    ):
+        """Derivatives of the value of a CDS contract with respect to the
+        discount factor at each pillar of the Ibor curve, time zero included,
+        at fixed survival probabilities. The CDS kernels read the pillar
+        arrays of the Ibor curve directly, so each discount factor is bumped
+        in place and restored and the Ibor curve is not rebuilt."""
+
+        dfs = self.libor_curve._dfs
+        sensitivities = np.zeros(len(dfs))
+
+        for k in range(1, len(dfs)):
+            df = dfs[k]
+            d_df = rel_bump * df
+
+            values = []
+            try:
+                for shift in (d_df, -d_df):
+                    dfs[k] = df + shift
+                    values.append(
+                        cds.value(
+                            value_dt,
+                            self,
+                            contract_recovery_rate,
+                            pv01_method,
+                            prot_method,
+                            num_steps_per_year,
+                        )[pv_type]
+                    )
+            finally:
+                dfs[k] = df
+
+            sensitivities[k] = (values[0] - values[1]) / (2.0 * d_df)
+
+        return sensitivities
+
+    ###########################################################################
+
+    def _calibration_survival_sensitivities(self):
+        """Sensitivities of the clean values of the calibration contracts to
+        the pillar survival probabilities, with one row per contract. They
+        are cached until the curve is rebuilt."""
+
+        if self._pv_survival is not None:
+            return self._pv_survival
+
+        num_contracts = len(self.cds_contracts)
+
+        if num_contracts == 0:
+            raise FinError("No CDS contracts have been supplied.")
+
+        self._pv_survival = np.zeros((num_contracts, num_contracts))
+
+        for i, cds in enumerate(self.cds_contracts):
+            self._pv_survival[i] = self._pillar_sensitivities(
+                cds, self.value_dt, self.recovery_rate
+            )
+
+        return self._pv_survival
+
+    ###########################################################################
+
+    def quote_jacobian(self):
+        """Jacobian of the pillar survival probabilities to the running
+        coupons of the calibration contracts, with one row per pillar and
+        one column per contract. Each contract prices to zero on the curve,
+        so by implicit differentiation of the bootstrap the Jacobian is
+        minus the inverse of the sensitivities of the contract values to
+        the survival probabilities times the sensitivities of the contract
+        values to their coupons. It is cached until the curve is rebuilt."""
+
+        if self._quote_jacobian is not None:
+            return self._quote_jacobian
+
+        pv_survival = self._calibration_survival_sensitivities()
+        pv_quote = np.zeros(len(self.cds_contracts))
+
+        for i, cds in enumerate(self.cds_contracts):
+
+            if cds.long_protect:
+                long_prot = +1
+            else:
+                long_prot = -1
+
+            clean_rpv01 = cds.risky_pv01(self.value_dt, self)["clean_rpv01"]
+            pv_quote[i] = -long_prot * cds.notional * clean_rpv01
+
+        self._quote_jacobian = -np.linalg.solve(pv_survival, np.diag(pv_quote))
+
+        return self._quote_jacobian
+
+    ###########################################################################
+
+    def ibor_jacobian(self):
+        """Jacobian of the pillar survival probabilities to the quotes of
+        the Ibor curve, with one row per pillar and one column per Ibor
+        quote. The sensitivities of the calibration contracts to the Ibor
+        pillar discount factors are chained with the quote Jacobian of the
+        Ibor curve and the bootstrap is differentiated implicitly as for
+        the quote Jacobian. It is cached until the curve is rebuilt."""
+
+        if self._ibor_jacobian is not None:
+            return self._ibor_jacobian
+
+        if not hasattr(self.libor_curve, "quote_jacobian"):
+            raise FinError("Ibor curve does not have a quote Jacobian.")
+
+        pv_survival = self._calibration_survival_sensitivities()
+        df_jacobian = self.libor_curve.quote_jacobian()
+
+        pv_ibor = np.zeros((len(self.cds_contracts), df_jacobian.shape[1]))
+
+        for i, cds in enumerate(self.cds_contracts):
+            pv_ibor[i] = self._ibor_pillar_sensitivities(
+                cds, self.value_dt, self.recovery_rate
+            ) @ df_jacobian
+
+        self._ibor_jacobian = -np.linalg.solve(pv_survival, pv_ibor)
+
+        return self._ibor_jacobian
+
+        num_contracts = len(self.cds_contracts)
+
+        if num_contracts == 0:
+            raise FinError("No CDS contracts have been supplied.")
+
+        pv_survival = np.zeros((num_contracts, num_contracts))
+        pv_quote = np.zeros(num_contracts)
+
+        for i, cds in enumerate(self.cds_contracts):
+            pv_survival[i] = self._pillar_sensitivities(
+                cds, self.value_dt, self.recovery_rate
+            )
+
+            if cds.long_protect:
+                long_prot = +1
+            else:
+                long_prot = -1
+
+            clean_rpv01 = cds.risky_pv01(self.value_dt, self)["clean_rpv01"]
+            pv_quote[i] = -long_prot * cds.notional * clean_rpv01
+
+        self._quote_jacobian = -np.linalg.solve(pv_survival, np.diag(pv_quote))
+
+        return self._quote_jacobian
+
     ###########################################################################
 
     def fwd(self, dt):
@@ -0,0 +1,507 @@
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ...utils.date import Date
+from ...utils.error import FinError
+from ...utils.helpers import label_to_string
+from .general_cds import STANDARD_RECOVERY_RATE, GeneralCDS, ProtLegTypes
+from .general_cds_curve import GeneralCDSCurve, _cumulative_hazard, _daily_dfs
+
+
+###############################################################################
+
+
+def _build_issuer_curve(args):
+    """Process pool worker that bootstraps one issuer curve."""
+
+    value_dt, cds_contracts, libor_curve, recovery_rate = args
+    return GeneralCDSCurve(value_dt, cds_contracts, libor_curve, recovery_rate)
+
+
+###############################################################################
+
+
+def build_cds_curves(
+    value_dt: Date,
+    cds_contracts: dict,
+    libor_curve,
+    recovery_rates: float | dict = STANDARD_RECOVERY_RATE,
+    max_workers: int | None = 1,
+):
+    """Bootstrap a GeneralCDSCurve for each name from its calibration
+    contracts, keyed as in cds_contracts. The builds run in this process
+    unless max_workers is more than 1, or None for one process per CPU, in
+    which case they are fanned out across a process pool. The contracts and
+    the Ibor curve must then be picklable, which curves wrapping QuantLib
+    objects are not. The returned curves share libor_curve."""
+
+    names = list(cds_contracts.keys())
+
+    if isinstance(recovery_rates, dict):
+        recoveries = [recovery_rates[name] for name in names]
+    else:
+        recoveries = [recovery_rates] * len(names)
+
+    tasks = [
+        (value_dt, cds_contracts[name], libor_curve, recovery)
+        for name, recovery in zip(names, recoveries)
+    ]
+
+    if max_workers == 1 or len(tasks) <= 1:
+        curves = [_build_issuer_curve(task) for task in tasks]
+    else:
+        try:
+            pickle.dumps((libor_curve, cds_contracts))
+        except (TypeError, pickle.PicklingError) as e:
+            raise FinError(
+                "Curves can only be built in a process pool from picklable "
+                "contracts and Ibor curve, use max_workers=1: " + str(e)
+            ) from e
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            curves = list(executor.map(_build_issuer_curve, tasks))
+
+    # the workers return copies of the Ibor curve
+    for curve in curves:
+        curve.libor_curve = libor_curve
+
+    return dict(zip(names, curves))
+
+
+###############################################################################
+
+
+class CDSPortfolio:
+    """A book of GeneralCDS contracts sharing a valuation date and an Ibor
+    curve, each valued on the issuer curve of its name.
+
+    The value of a running coupon contract with a DAILY_GRID protection leg
+    is linear in the survival probabilities on a grid of times that depends
+    only on the Ibor curve. The grids of all contracts are computed once,
+    from one table of daily discount factors, and stacked into flat arrays
+    together with the contract and curve of each grid point. Valuing the
+    book then takes one vectorised survival lookup per issuer curve and one
+    weighted sum per leg, however many contracts there are."""
+
+    def __init__(
+        self,
+        value_dt: Date,
+        libor_curve,
+        cds_contracts: list,
+        curve_ids: list,
+        recovery_rates: float | list = STANDARD_RECOVERY_RATE,
+    ):
+        """Create the portfolio from the contracts, the key of the issuer
+        curve of each contract and the contract recovery rates, which may
+        be one float or one per contract."""
+
+        num_contracts = len(cds_contracts)
+
+        if num_contracts == 0:
+            raise FinError("No CDS contracts have been supplied.")
+
+        if len(curve_ids) != num_contracts:
+            raise FinError("Need one curve id per CDS contract.")
+
+        if value_dt != libor_curve.value_dt:
+            raise FinError("Ibor curve does not have the portfolio value date.")
+
+        recovery_rates = np.broadcast_to(
+            np.asarray(recovery_rates, dtype=float), (num_contracts,)
+        )
+
+        self.value_dt = value_dt
+        self.libor_curve = libor_curve
+        self.cds_contracts = list(cds_contracts)
+        self.curve_ids = list(curve_ids)
+        self.recovery_rates = recovery_rates.copy()
+
+        self.notionals = np.array([cds.notional for cds in cds_contracts])
+        self.running_cpns = np.array([cds.running_cpn for cds in cds_contracts])
+        self.maturity_dts = [cds.maturity_dt for cds in cds_contracts]
+        self.long_prots = np.array(
+            [1.0 if cds.long_protect else -1.0 for cds in cds_contracts]
+        )
+        self.accrued_interests = np.array(
+            [cds.accrued_interest() for cds in cds_contracts]
+        )
+
+        self._stack_grids()
+
+    ###########################################################################
+
+    def _stack_grids(self):
+        """Compute the protection and premium grids of every contract and
+        stack them into flat arrays. Contracts that appear more than once,
+        as an index against each of its constituents, are gridded once."""
+
+        # an issuer curve without contracts anchors the grids to value_dt
+        # and the Ibor curve
+        anchor_curve = GeneralCDSCurve(self.value_dt, [], self.libor_curve, 0.0)
+        day_dfs = _daily_dfs(self.libor_curve, self.value_dt, self.cds_contracts)
+
+        grids = {}
+        prot_times, prot_weights, prot_index = [], [], []
+        prem_times, prem_weights, prem_index = [], [], []
+        accrual_factors_pcd_to_now = np.zeros(len(self.cds_contracts))
+
+        for i, cds in enumerate(self.cds_contracts):
+
+            if not isinstance(cds, GeneralCDS):
+                raise FinError("CDSPortfolio needs GeneralCDS contracts.")
+
+            if cds.upfront_payment_flag:
+                raise FinError("CDSPortfolio needs running coupon contracts.")
+
+            if cds.pl_type != ProtLegTypes.DAILY_GRID:
+                raise FinError("CDSPortfolio needs DAILY_GRID protection legs.")
+
+            if id(cds) not in grids:
+                grids[id(cds)] = (
+                    cds._prot_leg_grid(self.value_dt, anchor_curve, day_dfs),
+                    cds._premium_grid(self.value_dt, anchor_curve, True, day_dfs),
+                )
+
+            (p_times, p_weights), (r_times, r_weights, accrual) = grids[id(cds)]
+
+            prot_times.append(p_times)
+            prot_weights.append(p_weights)
+            prot_index.append(np.full(len(p_times), i))
+            prem_times.append(r_times)
+            prem_weights.append(r_weights)
+            prem_index.append(np.full(len(r_times), i))
+            accrual_factors_pcd_to_now[i] = accrual
+
+        self._prot_times = np.concatenate(prot_times)
+        self._prot_weights = np.concatenate(prot_weights)
+        self._prot_index = np.concatenate(prot_index)
+        self._prem_times = np.concatenate(prem_times)
+        self._prem_weights = np.concatenate(prem_weights)
+        self._prem_index = np.concatenate(prem_index)
+        self._accrual_factors_pcd_to_now = accrual_factors_pcd_to_now
+
+        # positions of the grid points of the contracts of each curve
+        curve_keys = self._curve_keys()
+        contract_curves = np.array([curve_keys.index(key) for key in self.curve_ids])
+        self._prot_by_curve = [
+            np.flatnonzero(contract_curves[self._prot_index] == k)
+            for k in range(len(curve_keys))
+        ]
+        self._prem_by_curve = [
+            np.flatnonzero(contract_curves[self._prem_index] == k)
+            for k in range(len(curve_keys))
+        ]
+
+    ###########################################################################
+
+    def _curve_keys(self):
+        """Distinct curve ids in order of first appearance."""
+
+        return list(dict.fromkeys(self.curve_ids))
+
+    ###########################################################################
+
+    def _survival_probs(self, issuer_curves, times, by_curve):
+        """Survival probabilities at stacked grid times, looked up once per
+        issuer curve."""
+
+        q = np.empty(len(times))
+
+        for key, positions in zip(self._curve_keys(), by_curve):
+
+            if key not in issuer_curves:
+                raise FinError("No issuer curve for curve id " + str(key))
+
+            curve = issuer_curves[key]
+
+            if curve.value_dt != self.value_dt:
+                raise FinError(
+                    "Issuer curve " + str(key) + " does not have the portfolio value date."
+                )
+
+            q[positions] = curve.survival_prob_t(times[positions])
+
+        return q
+
+    ###########################################################################
+
+    def _unit_legs(self, issuer_curves):
+        """Protection leg value per unit of loss and notional and dirty
+        risky PV01 of every contract."""
+
+        num_contracts = len(self.cds_contracts)
+
+        q_prot = self._survival_probs(
+            issuer_curves, self._prot_times, self._prot_by_curve
+        )
+        q_prem = self._survival_probs(
+            issuer_curves, self._prem_times, self._prem_by_curve
+        )
+
+        unit_prot_pv = np.bincount(
+            self._prot_index,
+            weights=self._prot_weights * q_prot,
+            minlength=num_contracts,
+        )
+
+        dirty_rpv01 = np.bincount(
+            self._prem_index,
+            weights=self._prem_weights * q_prem,
+            minlength=num_contracts,
+        )
+
+        return unit_prot_pv, dirty_rpv01
+
+    ###########################################################################
+
+    def value(self, issuer_curves: dict):
+        """Value all contracts on the issuer curves keyed by curve id.
+        Returns a dictionary of arrays with one entry per contract holding
+        the dirty and clean PVs, the protection leg PV, the clean risky
+        PV01 and the par spread."""
+
+        unit_prot_pv, dirty_rpv01 = self._unit_legs(issuer_curves)
+
+        prot_pv = unit_prot_pv * (1.0 - self.recovery_rates) * self.notionals
+        clean_rpv01 = dirty_rpv01 - self._accrual_factors_pcd_to_now
+
+        premium_scale = self.running_cpns * self.notionals
+
+        dirty_pv = self.long_prots * (prot_pv - premium_scale * dirty_rpv01)
+        clean_pv = self.long_prots * (prot_pv - premium_scale * clean_rpv01)
+
+        return {
+            "dirty_pv": dirty_pv,
+            "clean_pv": clean_pv,
+            "prot_pv": prot_pv,
+            "clean_rpv01": clean_rpv01,
+            "par_spread": prot_pv / clean_rpv01 / self.notionals,
+        }
+
+    ###########################################################################
+
+    def _curve_recovery_sensitivities(self, issuer_curves):
+        """Sensitivities of the dirty PVs to the recovery rates of the issuer
+        curves at fixed contract recovery rates. The bootstrap gives the
+        sensitivities of the pillar hazard rates to the curve recovery rate,
+        which integrate to those of the cumulative hazard at each grid time
+        and so of each survival probability. Curves without calibration
+        contracts do not depend on a recovery rate. Curves that are not
+        bootstrapped from contracts, such as a QLCreditCurve, have no such
+        sensitivities and raise an error."""
+
+        num_contracts = len(self.cds_contracts)
+        sensitivities = np.zeros(num_contracts)
+
+        prot_scale = (
+            self.long_prots * (1.0 - self.recovery_rates) * self.notionals
+        )
+        premium_scale = -self.long_prots * self.running_cpns * self.notionals
+
+        for key, prot_positions, prem_positions in zip(
+            self._curve_keys(), self._prot_by_curve, self._prem_by_curve
+        ):
+            curve = issuer_curves[key]
+
+            if not hasattr(curve, "cds_contracts"):
+                raise FinError(
+                    "Recovery sensitivities need issuer curves bootstrapped "
+                    "from CDS contracts, curve " + str(key) + " is not."
+                )
+
+            if len(curve.cds_contracts) == 0:
+                continue
+
+            hazard_sensitivities = np.concatenate(
+                ([0.0], curve.recovery_jacobian())
+            )
+
+            prot_index = self._prot_index[prot_positions]
+            prem_index = self._prem_index[prem_positions]
+
+            index = np.concatenate((prot_index, prem_index))
+            times = np.concatenate(
+                (self._prot_times[prot_positions], self._prem_times[prem_positions])
+            )
+            weights = np.concatenate(
+                (
+                    self._prot_weights[prot_positions] * prot_scale[prot_index],
+                    self._prem_weights[prem_positions] * premium_scale[prem_index],
+                )
+            )
+
+            cum_hazard_sensitivities = _cumulative_hazard(
+                times, curve._times, hazard_sensitivities
+            )
+
+            sensitivities += np.bincount(
+                index,
+                weights=-weights
+                * curve.survival_prob_t(times)
+                * cum_hazard_sensitivities,
+                minlength=num_contracts,
+            )
+
+        return sensitivities
+
+    ###########################################################################
+
+    def default_sensitivities(
+        self, issuer_curves: dict, recovery_bump: float = 0.01
+    ):
+        """Jump to default and recovery sensitivities of all contracts on
+        the issuer curves keyed by curve id, without revaluing any contract
+        or rebuilding any curve.
+
+        The jump to default is the change in value on an immediate default,
+        when the protection buyer receives the settlement amount of one
+        less the contract recovery rate times the notional and pays the
+        premium accrued since the previous coupon date, as in
+        GeneralCDS.accrued_interest, less the dirty PV.
+        The recovery01 is the change in dirty PV when the contract recovery
+        rate and the recovery rate of its issuer curve are both raised by
+        recovery_bump, to first order. Returns a dictionary of arrays with
+        one entry per contract holding the jump to default, the settlement
+        amount and the accrued premium, signed as received by the holder,
+        and the recovery01."""
+
+        unit_prot_pv, dirty_rpv01 = self._unit_legs(issuer_curves)
+
+        premium_scale = self.running_cpns * self.notionals
+        settlement = (1.0 - self.recovery_rates) * self.notionals
+
+        # the accrued premium is undiscounted and signed as received
+        accrued = self.accrued_interests
+
+        dirty_pv = self.long_prots * (
+            unit_prot_pv * settlement - premium_scale * dirty_rpv01
+        )
+
+        jump_to_default = self.long_prots * settlement + accrued - dirty_pv
+
+        # the contract recovery rate scales the protection leg only
+        contract_sensitivities = -self.long_prots * unit_prot_pv * self.notionals
+        curve_sensitivities = self._curve_recovery_sensitivities(issuer_curves)
+
+        return {
+            "jump_to_default": jump_to_default,
+            "settlement": self.long_prots * settlement,
+            "accrued": accrued,
+            "recovery01": (contract_sensitivities + curve_sensitivities)
+            * recovery_bump,
+        }
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("VALUE DATE", self.value_dt)
+        s += label_to_string("NUM CONTRACTS", len(self.cds_contracts))
+        s += label_to_string("NUM CURVES", len(self._curve_keys()))
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        print(self)
+
+
+###############################################################################
+
+
+def cds_index_intrinsic(
+    value_dt: Date,
+    index_cds: GeneralCDS,
+    libor_curve,
+    constituent_curves: dict,
+    weights: dict = None,
+    recovery_rates: float | dict = STANDARD_RECOVERY_RATE,
+):
+    """Intrinsic value of a CDS index, the weighted value of the index
+    contract written on each constituent curve, valued in one pass as a
+    CDSPortfolio. Constituents are equally weighted unless weights keyed
+    like constituent_curves are given. The intrinsic spread is the weighted
+    protection leg value over the weighted clean risky PV01."""
+
+    names = list(constituent_curves.keys())
+
+    if len(names) == 0:
+        raise FinError("No constituent curves have been supplied.")
+
+    if weights is None:
+        name_weights = np.full(len(names), 1.0 / len(names))
+    else:
+        name_weights = np.array([weights[name] for name in names])
+        name_weights = name_weights / np.sum(name_weights)
+
+    if isinstance(recovery_rates, dict):
+        recoveries = [recovery_rates[name] for name in names]
+    else:
+        recoveries = recovery_rates
+
+    portfolio = CDSPortfolio(
+        value_dt,
+        libor_curve,
+        [index_cds] * len(names),
+        names,
+        recoveries,
+    )
+
+    values = portfolio.value(constituent_curves)
+
+    prot_pv = np.dot(name_weights, values["prot_pv"])
+    clean_rpv01 = np.dot(name_weights, values["clean_rpv01"])
+
+    return {
+        "dirty_pv": float(np.dot(name_weights, values["dirty_pv"])),
+        "clean_pv": float(np.dot(name_weights, values["clean_pv"])),
+        "intrinsic_spread": float(prot_pv / clean_rpv01 / index_cds.notional),
+    }
+
+
+###############################################################################
+
+
+def cds_index_basis(
+    value_dt: Date,
+    index_cds: GeneralCDS,
+    index_curve,
+    constituent_curves: dict,
+    weights: dict = None,
+    index_recovery_rate: float = STANDARD_RECOVERY_RATE,
+    recovery_rates: float | dict = STANDARD_RECOVERY_RATE,
+):
+    """Basis between a CDS index traded on its own index curve and its
+    intrinsic value from the constituent curves. Returns the index and the
+    intrinsic spreads and values and their differences, index less
+    intrinsic."""
+
+    index_value = index_cds.value(value_dt, index_curve, index_recovery_rate)
+    index_spread = index_cds.par_spread(
+        value_dt, index_curve, index_recovery_rate
+    )
+
+    intrinsic = cds_index_intrinsic(
+        value_dt,
+        index_cds,
+        index_curve.libor_curve,
+        constituent_curves,
+        weights,
+        recovery_rates,
+    )
+
+    return {
+        "index_spread": index_spread,
+        "intrinsic_spread": intrinsic["intrinsic_spread"],
+        "spread_basis": index_spread - intrinsic["intrinsic_spread"],
+        "index_clean_pv": index_value["clean_pv"],
+        "intrinsic_clean_pv": intrinsic["clean_pv"],
+        "pv_basis": index_value["clean_pv"] - intrinsic["clean_pv"],
+    }
+
+
+###############################################################################
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from enum import Enum
+
+import numpy as np
+
+from ...utils.date import Date
+from ...utils.day_count import DayCountTypes
+from ...utils.error import FinError
+from .general_cds import STANDARD_RECOVERY_RATE, GeneralCDS
+from .general_cds_curve import GeneralCDSCurve, _daily_dfs
+
+
+###############################################################################
+
+
+class CDSQuoteTypes(Enum):
+    SPREAD = 0  # quoted or par spread, the coupon of a contract at par
+    UPFRONT = 1  # clean upfront paid by the protection buyer per notional
+    CLEAN_PRICE = 2  # 100 less the upfront in percent
+
+
+###############################################################################
+
+
+def _maturity_key(maturity_dt_or_tenor):
+    """Hashable key of a maturity date or tenor."""
+
+    if isinstance(maturity_dt_or_tenor, Date):
+        return maturity_dt_or_tenor.excel_dt
+
+    return maturity_dt_or_tenor
+
+
+###############################################################################
+
+
+def convert_cds_quotes(
+    value_dt: Date,
+    maturity_dts_or_tenors: list,
+    coupons: float | np.ndarray,
+    quotes: float | np.ndarray,
+    libor_curve,
+    quote_type: CDSQuoteTypes = CDSQuoteTypes.SPREAD,
+    recovery_rates: float | np.ndarray = STANDARD_RECOVERY_RATE,
+    settle_dt: Date = None,
+    tol: float = 1e-12,
+    max_iter: int = 50,
+):
+    """Convert CDS quotes between quoted spreads, upfronts and clean prices
+    under the flat hazard rate convention. Each quote is for a contract
+    with the GeneralCDS standard terms stepping in on value_dt, maturing on
+    the given date or tenor and paying the given fixed coupon.
+
+    A spread quote is matched by the flat hazard rate at which a contract
+    paying the spread prices at par, and an upfront or price quote by the
+    flat hazard rate at which the contract paying its coupon is worth the
+    upfront. The contract value is linear in the survival probabilities on
+    a grid that depends on the maturity and the Ibor curve only, so the
+    grid of each distinct maturity is computed once from a shared table of
+    daily discount factors and the hazard rates of all quotes on it are
+    solved together by a vectorised Newton iteration.
+
+    Returns a dictionary of arrays with one entry per quote holding the flat
+    hazard rates, the quoted spreads, the clean upfronts and the accrued
+    premium per unit notional paid by the protection buyer, the clean
+    prices and, if a settlement date is given, the cash settlement amounts
+    per unit notional."""
+
+    if not isinstance(quote_type, CDSQuoteTypes):
+        raise FinError("Unknown quote type " + str(quote_type))
+
+    if value_dt != libor_curve.value_dt:
+        raise FinError("Ibor curve does not have the value date.")
+
+    maturities = list(maturity_dts_or_tenors)
+    num_quotes = len(maturities)
+
+    if num_quotes == 0:
+        raise FinError("No quotes have been supplied.")
+
+    coupons = np.broadcast_to(np.asarray(coupons, dtype=float), (num_quotes,))
+    quotes = np.broadcast_to(np.asarray(quotes, dtype=float), (num_quotes,))
+    recovery_rates = np.broadcast_to(
+        np.asarray(recovery_rates, dtype=float), (num_quotes,)
+    )
+
+    # one contract per distinct maturity carries the grids of its quotes
+    contracts = {}
+    groups = {}
+
+    for i, maturity in enumerate(maturities):
+        key = _maturity_key(maturity)
+        if key not in contracts:
+            contracts[key] = GeneralCDS(value_dt, maturity, 0.0, notional=1.0)
+        cds = contracts[key]
+        groups.setdefault(cds.maturity_dt.excel_dt, (cds, []))[1].append(i)
+
+    anchor_curve = GeneralCDSCurve(value_dt, [], libor_curve, 0.0)
+    day_dfs = _daily_dfs(
+        libor_curve, value_dt, [cds for cds, _ in groups.values()]
+    )
+
+    # the contract paying the quoted spread is at par, the one paying the
+    # coupon is worth the clean upfront
+    if quote_type == CDSQuoteTypes.SPREAD:
+        target_cpns = quotes
+        target_upfronts = np.zeros(num_quotes)
+    elif quote_type == CDSQuoteTypes.UPFRONT:
+        target_cpns = coupons
+        target_upfronts = quotes
+    else:
+        target_cpns = coupons
+        target_upfronts = 1.0 - quotes / 100.0
+
+    hazard_rates = np.zeros(num_quotes)
+    prot_pvs = np.zeros(num_quotes)
+    dirty_rpv01s = np.zeros(num_quotes)
+    accrual_factors_pcd_to_now = np.zeros(num_quotes)
+
+    for cds, members in groups.values():
+        members = np.array(members)
+
+        prot_times, prot_weights = cds._prot_leg_grid(
+            value_dt, anchor_curve, day_dfs
+        )
+        premium_times, premium_weights, accrual_factor = cds._premium_grid(
+            value_dt, anchor_curve, True, day_dfs
+        )
+
+        # stacked grid with one weight column per leg
+        times = np.concatenate((prot_times, premium_times))
+        weights = np.zeros((len(times), 2))
+        weights[: len(prot_times), 0] = prot_weights
+        weights[len(prot_times):, 1] = premium_weights
+        time_weights = -times[:, None] * weights
+
+        loss = 1.0 - recovery_rates[members]
+        cpns = target_cpns[members]
+        upfronts = target_upfronts[members]
+
+        # credit triangle start with the upfront spread over the tenor
+        tenor = max(times[-1], 1.0 / 360.0)
+        h = np.maximum((cpns + upfronts / tenor) / loss, 1e-6)
+
+        for _ in range(max_iter):
+            survival = np.exp(-np.outer(h, times))
+            legs = survival @ weights
+            legs_deriv = survival @ time_weights
+
+            pv = loss * legs[:, 0] - cpns * (legs[:, 1] - accrual_factor)
+            pv_deriv = loss * legs_deriv[:, 0] - cpns * legs_deriv[:, 1]
+            pv -= upfronts
+
+            h -= pv / pv_deriv
+
+            if np.max(np.abs(pv)) < tol:
+                break
+        else:
+            raise FinError("Flat hazard rates did not converge.")
+
+        survival = np.exp(-np.outer(h, times))
+        legs = survival @ weights
+
+        hazard_rates[members] = h
+        prot_pvs[members] = loss * legs[:, 0]
+        dirty_rpv01s[members] = legs[:, 1]
+        accrual_factors_pcd_to_now[members] = accrual_factor
+
+    clean_rpv01s = dirty_rpv01s - accrual_factors_pcd_to_now
+    upfronts = prot_pvs - coupons * clean_rpv01s
+    accrued = coupons * accrual_factors_pcd_to_now
+
+    result = {
+        "hazard_rate": hazard_rates,
+        "quoted_spread": prot_pvs / clean_rpv01s,
+        "upfront": upfronts,
+        "accrued": accrued,
+        "clean_price": 100.0 * (1.0 - upfronts),
+    }
+
+    if settle_dt is not None:
+        df = libor_curve.df(settle_dt, dc_type=DayCountTypes.ACT_365F)
+        result["cash_settlement"] = (upfronts - accrued) / df
+
+    return result
+
+
+###############################################################################
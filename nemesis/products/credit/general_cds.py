@@ -1,4 +1,3 @@
-from copy import deepcopy
 from math import exp, log
 
 import numpy as np
@@ -19,6 +18,7 @@ from ...market.curves.interpolator import InterpTypes, _uinterpolate
 
 from ...utils.helpers import check_argument_types
 
+from .general_cds_curve import _num_grid_days
 from .ql_cds_curve import QLCreditCurve
 
 STANDARD_RECOVERY_RATE = 0.40
@@ -32,6 +32,10 @@ class AccCouponPayTypes(Enum):
     DEFAULT = 0
     PERIOD_END = 1
 
+class ProtLegTypes(Enum):
+    DAILY_GRID = 0  # devlib day by day sum, default paid at the day end
+    EXACT = 1  # ISDA style integral over hazard and discount segments
+
 
 class GeneralCDS:
     """A class which manages a Credit Default Swap. It performs schedule
@@ -53,7 +57,8 @@ class GeneralCDS:
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
         ac_type: AccCouponTypes = AccCouponTypes.TO_DEFAULT,
-        acp_type: AccCouponPayTypes = AccCouponPayTypes.DEFAULT
+        acp_type: AccCouponPayTypes = AccCouponPayTypes.DEFAULT,
+        pl_type: ProtLegTypes = ProtLegTypes.DAILY_GRID
     ):
         """Create a CDS from the step-in date, maturity date and cpn"""
 
@@ -86,6 +91,7 @@ class GeneralCDS:
         self.bd_type = bd_type
         self.ac_type = ac_type
         self.acp_type = acp_type
+        self.pl_type = pl_type
 
         self.upfront_payment_flag = upfront_amount != ZERO
         self._generate_adjusted_cds_payment_dts()
@@ -256,37 +262,19 @@ class GeneralCDS:
         bump=0.0001  # 1 basis point
     ):
         """Calculation of the change in the value of the CDS contract for a
-        one basis point change in the level of the CDS curve."""
-
-        if issuer_curve._from_ql:
-
-            ql_credit_curve_up = issuer_curve.ql_cds_curve.tweak_parallel(bump)
-            credit_curve_up = QLCreditCurve(value_dt, ql_credit_curve_up)
-            ql_credit_curve_down = issuer_curve.ql_cds_curve.tweak_parallel(-bump)
-            credit_curve_down = QLCreditCurve(value_dt, ql_credit_curve_down)
-
-        else:
+        one basis point change in the level of the CDS curve. On a curve
+        bootstrapped by GeneralCDSCurve this is the parallel total of the
+        bucketed CS01."""
 
-            v0 = self.value(
-                value_dt,
-                issuer_curve,
-                contract_recovery_rate
-            )
-
-            # we create a deep copy to avoid state issues
-            bumpedIssuerCurve = deepcopy(issuer_curve)
-            for cds in bumpedIssuerCurve.cds_contracts:
-                cds.running_cpn += bump
-
-            bumpedIssuerCurve._build_curve()
-
-            v1 = self.value(
-                value_dt,
-                bumpedIssuerCurve,
-                contract_recovery_rate
-            )
+        if not getattr(issuer_curve, "_from_ql", False):
+            return self.bucketed_credit_dv01(
+                value_dt, issuer_curve, contract_recovery_rate, bump
+            )["parallel_cs01"]
 
-            credit_dv01 = v1["dirty_pv"] - v0["dirty_pv"]
+        ql_credit_curve_up = issuer_curve.ql_cds_curve.tweak_parallel(bump)
+        credit_curve_up = QLCreditCurve(value_dt, ql_credit_curve_up)
+        ql_credit_curve_down = issuer_curve.ql_cds_curve.tweak_parallel(-bump)
+        credit_curve_down = QLCreditCurve(value_dt, ql_credit_curve_down)
 
         npv_up = self.value(value_dt, credit_curve_up)
         npv_down = self.value(value_dt, credit_curve_down)
@@ -301,73 +289,65 @@ class GeneralCDS:
 
     ###########################################################################
 
-    def interest_dv01(
+    def bucketed_credit_dv01(
         self,
-        value_dt: Date,
+        value_dt,
         issuer_curve,
-        contract_recovery_rate,
+        contract_recovery_rate=STANDARD_RECOVERY_RATE,
         bump=0.0001  # 1 basis point
     ):
-        """Calculation of the interest DV01 based on a simple bump of
-        the discount factors and reconstruction of the CDS curve."""
-
-        if issuer_curve._from_ql:
-        
-            ql_credit_curve_up = issuer_curve.ql_cds_curve.tweak_parallel(bump)
-            credit_curve_up = QLCreditCurve(value_dt, ql_credit_curve_up)
-            ql_credit_curve_down = issuer_curve.ql_cds_curve.tweak_parallel(-bump)
-            credit_curve_down = QLCreditCurve(value_dt, ql_credit_curve_down)
-
-            # ql_discount_curve_up = issuer_curve.libor_curve.ql_curve.tweak_parallel(bump)
-            ql_credit_curve_up = issuer_curve.ql_cds_curve.tweak_discount(bump)
-            credit_curve_up = QLCreditCurve(value_dt, ql_credit_curve_up)
-            ql_credit_curve_down = issuer_curve.ql_cds_curve.tweak_discount(-bump)
-            credit_curve_down = QLCreditCurve(value_dt, ql_credit_curve_down)
+        """First order change in the value of the CDS contract for a bump to
+        the running coupon of each calibration contract of a GeneralCDSCurve,
+        and their sum for a parallel bump. The value is differentiated in
+        the pillar hazard rates on its survival grid and chained with the
+        quote Jacobian of the bootstrap, so no curve is copied or rebuilt.
+        Returns the pillar dates, the bucketed CS01 and the parallel CS01."""
+
+        grid = self._clean_pv_grid(
+            value_dt, issuer_curve, contract_recovery_rate
+        )
 
-        else:
-        
-            v0 = self.value(
-                value_dt,
-                issuer_curve,
-                contract_recovery_rate
+        if grid is None:
+            raise FinError(
+                "Bucketed CS01 needs a running coupon contract with a DAILY_GRID protection leg"
             )
 
-            # we create a deep copy to avoid state issues
-            new_issuer_curve = deepcopy(issuer_curve)
-
-            for depo in new_issuer_curve.libor_curve.used_deposits:
-
-                depo.deposit_rate += bump
+        times, weights, _ = grid
 
-            for fra in new_issuer_curve.libor_curve.used_fras:
+        pv_hazard = issuer_curve._hazard_sensitivities(times, weights)
+        cs01 = pv_hazard @ issuer_curve.quote_jacobian() * bump
 
-                fra.fra_rate += bump
+        return {
+            "pillar_dts": [cds.maturity_dt for cds in issuer_curve.cds_contracts],
+            "cs01": cs01,
+            "parallel_cs01": float(np.sum(cs01)),
+        }
 
-            for swap in new_issuer_curve.libor_curve.used_swaps:
-
-                cpn = swap.fixed_leg.cpn
-                swap.fixed_leg.cpn = cpn + bump
+    ###########################################################################
 
-                # Need to regenerate fixed leg payments with bumped cpn
-                # I could call swap.fixed_leg.generate_payments() but it is
-                # overkill as it has to do all the schedule generation which is
-                # not needed as the dates are unchanged
-                num_payments = len(swap.fixed_leg.payments)
-                for i in range(0, num_payments):
-                    old_pmt = swap.fixed_leg.payments[i]
-                    swap.fixed_leg.payments[i] = old_pmt * (cpn + bump) / cpn
+    def interest_dv01(
+        self,
+        value_dt: Date,
+        issuer_curve,
+        contract_recovery_rate,
+        bump=0.0001  # 1 basis point
+    ):
+        """Calculation of the change in the value of the CDS contract for a
+        one basis point change in the quotes of the Ibor curve. On a curve
+        bootstrapped by GeneralCDSCurve this is the parallel total of the
+        bucketed IR01."""
 
-            new_issuer_curve.libor_curve._build_curve()
-            new_issuer_curve._build_curve()
+        if not getattr(issuer_curve, "_from_ql", False):
+            return self.bucketed_interest_dv01(
+                value_dt, issuer_curve, contract_recovery_rate, bump
+            )["parallel_ir01"]
 
-            v1 = self.value(
-                value_dt,
-                new_issuer_curve,
-                contract_recovery_rate
-            )
+        # ql_discount_curve_up = issuer_curve.libor_curve.ql_curve.tweak_parallel(bump)
+        ql_credit_curve_up = issuer_curve.ql_cds_curve.tweak_discount(bump)
+        credit_curve_up = QLCreditCurve(value_dt, ql_credit_curve_up)
+        ql_credit_curve_down = issuer_curve.ql_cds_curve.tweak_discount(-bump)
+        credit_curve_down = QLCreditCurve(value_dt, ql_credit_curve_down)
 
-            interest_dv01 = v1["dirty_pv"] - v0["dirty_pv"]
-        
         npv_up = self.value(value_dt, credit_curve_up)
         npv_down = self.value(value_dt, credit_curve_down)
 
@@ -381,6 +361,56 @@ class GeneralCDS:
 
     ###########################################################################
 
+    def bucketed_interest_dv01(
+        self,
+        value_dt,
+        issuer_curve,
+        contract_recovery_rate=STANDARD_RECOVERY_RATE,
+        bump=0.0001  # 1 basis point
+    ):
+        """First order change in the dirty value of the CDS contract for a
+        bump to each quote of the Ibor curve of a GeneralCDSCurve, with the
+        issuer curve recalibrated to its CDS quotes, and their sum for a
+        parallel bump. At fixed hazard rates the value is linear in the
+        discount factors of its grid, so its sensitivity to every Ibor quote
+        comes from one grid built on the discount factor Jacobian of the
+        Ibor curve. The recalibration adds the hazard rate sensitivities
+        chained with the Ibor Jacobian of the bootstrap. No curve is copied
+        or rebuilt once the Ibor curve has its quote Jacobian. Returns the
+        Ibor pillar dates, the bucketed IR01 and the parallel IR01."""
+
+        grid = self._clean_pv_grid(
+            value_dt, issuer_curve, contract_recovery_rate
+        )
+
+        if grid is None:
+            raise FinError(
+                "Bucketed IR01 needs a running coupon contract with a DAILY_GRID protection leg"
+            )
+
+        times, weights, _ = grid
+
+        num_days = _num_grid_days(issuer_curve.value_dt, [self])
+        day_df_jacobian = issuer_curve._day_df_jacobian(num_days)
+
+        ibor_times, ibor_weights, _ = self._clean_pv_grid(
+            value_dt, issuer_curve, contract_recovery_rate, day_df_jacobian
+        )
+
+        # the dirty value is the grid sum without the accrued constant
+        pv_ibor = issuer_curve.survival_prob_t(ibor_times) @ ibor_weights
+        pv_hazard = issuer_curve._hazard_sensitivities(times, weights)
+
+        ir01 = (pv_ibor + pv_hazard @ issuer_curve.ibor_jacobian()) * bump
+
+        return {
+            "pillar_dts": issuer_curve.libor_curve.pillar_dts[1:],
+            "ir01": ir01,
+            "parallel_ir01": float(np.sum(ir01)),
+        }
+
+    ###########################################################################
+
     def cash_settlement_amount(
         self,
         value_dt,
@@ -398,7 +428,7 @@ class GeneralCDS:
         )
 
         libor_curve = issuer_curve.libor_curve
-        df = libor_curve.df(settle_dt, day_count=DayCountTypes.ACT_365F)
+        df = libor_curve.df(settle_dt, dc_type=DayCountTypes.ACT_365F)
         v = v / df
         return v
 
@@ -468,47 +498,132 @@ class GeneralCDS:
         self,
         value_dt,
         issuer_curve,
-        contract_recovery_rate=STANDARD_RECOVERY_RATE
+        contract_recovery_rate=STANDARD_RECOVERY_RATE,
+        pl_type: ProtLegTypes = None
     ):
-        """Calculates the protection leg PV using devlib's exact day-by-day method.
-        
-        This is a separate method to avoid breaking curve construction while
-        providing exact devlib compatibility for final valuations.
-        """
-        
-        # Calculate the number of days for the protection period
+        """Calculates the protection leg PV. The DAILY_GRID method reproduces
+        devlib's day-by-day sum, in which a default during a day is paid at
+        the end of that day, as one vectorised calculation. The EXACT method
+        integrates the default payment continuously. The type defaults to
+        the one of the contract."""
+
+        if pl_type is None:
+            pl_type = self.pl_type
+
+        if pl_type == ProtLegTypes.DAILY_GRID:
+            prot_pv = self._prot_leg_daily_grid(value_dt, issuer_curve)
+        elif pl_type == ProtLegTypes.EXACT:
+            prot_pv = self._prot_leg_exact(value_dt, issuer_curve)
+        else:
+            raise FinError("Unknown ProtLegTypes:" + str(pl_type))
+
+        return prot_pv * (1.0 - contract_recovery_rate) * self.notional
+
+    ###########################################################################
+
+    def _prot_leg_daily_grid(self, value_dt, issuer_curve):
+        """Sum over the days from step in to maturity of the probability of
+        default during the day times the discount factor to the day end.
+        Survival times are ACT/360 and discount times ACT/365F from the
+        valuation date, as in devlib."""
+
+        times, weights = self._prot_leg_grid(value_dt, issuer_curve)
+
+        if len(times) == 0:
+            return 0.0
+
+        return float(np.sum(weights * issuer_curve.survival_prob_t(times)))
+
+    ###########################################################################
+
+    def _prot_leg_grid(self, value_dt, issuer_curve, day_dfs=None):
+        """Survival times and weights of the day grid of the protection leg
+        such that its value per unit of loss is the sum of the weights times
+        the survival probabilities. A day boundary carries the discount
+        factor to its day end less the discount factor to itself. Only the
+        Ibor curve of the issuer curve is read."""
+
+        anchor_days = int(value_dt - issuer_curve.value_dt)
         step_in_days = int(self.step_in_dt - value_dt)
         maturity_days = int(self.maturity_dt - value_dt)
-        
-        prot_pv = 0.0
-        
-        # Day-by-day calculation exactly like devlib
-        for day in range(step_in_days, maturity_days):
-            # Convert day to Date objects for curve lookups
-            date_start = value_dt.add_days(day)
-            date_end = value_dt.add_days(day + 1)
-            
-            # Ensure we don't exceed maturity
-            if date_end > self.maturity_dt:
-                date_end = self.maturity_dt
-            
-            # Get survival probabilities at day boundaries
-            s_start = issuer_curve.survival_prob(date_start)
-            s_end = issuer_curve.survival_prob(date_end)
-            
-            # Get discount factor for payment at day end
-            libor_curve = issuer_curve.libor_curve
-            df_end = libor_curve.df(date_end, day_count=DayCountTypes.ACT_365F)
-            
-            # Calculate daily default probability
-            default_prob = s_start - s_end
-            
-            # Daily protection leg contribution
-            # if default_prob > 0 and df_end > 0:
-            daily_contribution = default_prob * df_end * (1.0 - contract_recovery_rate)
-            prot_pv += daily_contribution
-        
-        return prot_pv * self.notional
+
+        if maturity_days <= step_in_days:
+            return np.zeros(0), np.zeros((0,) + np.shape(day_dfs)[1:])
+
+        days = np.arange(step_in_days, maturity_days + 1, dtype=float)
+        days += anchor_days
+
+        z = self._day_dfs(issuer_curve, days[1:], day_dfs)
+
+        weights = np.concatenate((z, np.zeros_like(z[:1])))
+        weights[1:] -= z
+
+        return days / 360.0, weights
+
+    ###########################################################################
+
+    def _day_dfs(self, issuer_curve, days, day_dfs=None):
+        """ACT/365F discount factors to whole numbers of days after the
+        issuer curve anchor date, read from the table day_dfs if given. The
+        table may carry a second axis, such as the Jacobian of the discount
+        factors to the Ibor quotes, and the grids built from it then carry
+        the same axis in their weights."""
+
+        if day_dfs is None:
+            return issuer_curve.libor_curve.df_t(days / 365.0)
+
+        return day_dfs[days.astype(np.int64)]
+
+    ###########################################################################
+
+    def _prot_leg_exact(self, value_dt, issuer_curve):
+        """Integral of the discount factor against the default density from
+        step in to maturity. The protection period is cut at the hazard and
+        discount curve pillars so that on each segment the hazard rate is
+        flat and the discount factor is taken as log-linear, which is exact
+        for flat forward discount curves, and each segment integrates in
+        closed form as in the ISDA standard model."""
+
+        anchor_days = float(value_dt - issuer_curve.value_dt)
+        step_in_days = float(self.step_in_dt - value_dt) + anchor_days
+        maturity_days = float(self.maturity_dt - value_dt) + anchor_days
+
+        if maturity_days <= step_in_days:
+            return 0.0
+
+        libor_curve = issuer_curve.libor_curve
+
+        # pillar times of both curves converted to days from the anchor date
+        # on the time axes the curves are read on below
+        pillar_days = np.concatenate(
+            (
+                np.asarray(issuer_curve._times, dtype=float) * 360.0,
+                np.asarray(libor_curve._times, dtype=float) * 365.0,
+            )
+        )
+        inside = (pillar_days > step_in_days) & (pillar_days < maturity_days)
+        days = np.unique(
+            np.concatenate(([step_in_days, maturity_days], pillar_days[inside]))
+        )
+
+        q = issuer_curve.survival_prob_t(days / 360.0)
+        z = libor_curve.df_t(days / 365.0)
+        zq = z * q
+
+        hazard = np.log(q[:-1] / q[1:])
+        fwd = np.log(z[:-1] / z[1:])
+        total = hazard + fwd
+
+        small = np.abs(total) < 1e-10
+        safe_total = np.where(small, 1.0, total)
+
+        segment_pvs = np.where(
+            small,
+            hazard * zq[:-1] * (1.0 - 0.5 * total),
+            hazard / safe_total * (zq[:-1] - zq[1:]),
+        )
+
+        return float(np.sum(segment_pvs))
 
     ###########################################################################
 
@@ -516,12 +631,54 @@ class GeneralCDS:
         """The risky_pv01 is the present value of a risky one dollar paid on
         the premium leg of a CDS contract."""
 
+        if self.upfront_payment_flag:
+            libor_curve = issuer_curve.libor_curve
+            return self.upfront_amount * libor_curve.df(self.upfront_payment_dt, dc_type=DayCountTypes.ACT_365F)
+
+        times, weights, accrual_factor_pcd_to_now = self._premium_grid(
+            value_dt, issuer_curve, coupon_accrued
+        )
+
+        full_rpv01 = float(np.sum(weights * issuer_curve.survival_prob_t(times)))
+        clean_rpv01 = full_rpv01 - accrual_factor_pcd_to_now
+
+        return {"dirty_rpv01": full_rpv01, "clean_rpv01": clean_rpv01}
+
+    ###########################################################################
+
+    def _premium_grid(
+        self, value_dt, issuer_curve, coupon_accrued=True, day_dfs=None
+    ):
+        """Survival times and weights such that the full risky PV01 is the
+        sum of the weights times the survival probabilities, together with
+        the discounted accrual from the previous coupon date to step in.
+        The coupons carry their discounted accrual factors and the coupon
+        accrued at default carries a day grid per period. Only the Ibor
+        curve of the issuer curve is read."""
+
         day_count = DayCount(self.dc_type)
-        libor_curve = issuer_curve.libor_curve
         year_fracs = self.accrual_factors
-
-        if self.upfront_payment_flag:
-            return self.upfront_amount * libor_curve.df(self.upfront_payment_dt, day_count=DayCountTypes.ACT_365F)
+        anchor_dt = issuer_curve.value_dt
+
+        times = []
+        weights = []
+
+        def add_coupon(survival_dt, payment_dt, accrual_factor):
+            payment_days = np.array([float(payment_dt - anchor_dt)])
+            z = self._day_dfs(issuer_curve, payment_days, day_dfs)[0]
+            times.append(np.array([(survival_dt - anchor_dt) / 360.0]))
+            weights.append(np.array([z * accrual_factor]))
+            return z
+
+        def add_accrual_on_default(start_dt, end_dt, accrual_dt, sign):
+            start_times, end_times, accrual_weights = (
+                self._accrual_on_default_grid(
+                    value_dt, issuer_curve, start_dt, end_dt, accrual_dt,
+                    day_dfs,
+                )
+            )
+            times.extend([start_times, end_times])
+            weights.extend([sign * accrual_weights, -sign * accrual_weights])
 
         if not self.coupon_pay_front:
             pcd = self.accrual_start_dts[0]
@@ -529,63 +686,25 @@ class GeneralCDS:
             eff = self.step_in_dt
             cpd = self.payment_dts[0]
 
-            q1 = issuer_curve.survival_prob(ncd)
-            z1 = libor_curve.df(cpd, day_count=DayCountTypes.ACT_365F)
+            z1 = add_coupon(ncd, cpd, year_fracs[0])
 
             accrual_factor_pcd_to_now = day_count.year_frac(pcd, eff.add_days(1))[0] * z1
-
-            full_rpv01 = q1 * z1 * year_fracs[0]
         else:
             pcd = self.accrual_start_dts[1]
             ncd = self.accrual_end_dts[0]
             accrual_factor_pcd_to_now = 0.0
 
-            q1 = issuer_curve.survival_prob(pcd)
-            z1 = libor_curve.df(pcd, day_count=DayCountTypes.ACT_365F)
-
-            full_rpv01 = q1 * z1 * year_fracs[1]
+            add_coupon(pcd, pcd, year_fracs[1])
 
         if coupon_accrued:
             if self.coupon_pay_front and (self.ac_type == AccCouponTypes.TO_PERIOD_END):
-                full_rpv01 += 0.0
+                pass
             elif (not self.coupon_pay_front) and (self.ac_type == AccCouponTypes.ZERO):
-                full_rpv01 += 0.0
+                pass
+            elif not self.coupon_pay_front:
+                add_accrual_on_default(self.step_in_dt, ncd, pcd, 1.0)
             else:
-                first_period_accrual_pv = 0.0
-                step_in_days = int(self.step_in_dt - value_dt)
-                first_period_end_days = int(ncd - value_dt)
-
-                for day in range(step_in_days, first_period_end_days):
-
-                    date_start = value_dt.add_days(day)
-                    date_end = value_dt.add_days(day + 1)
-                    
-                    # Ensure we don't exceed maturity
-                    if date_end > self.maturity_dt:
-                        date_end = self.maturity_dt
-                    
-                    # Get survival probabilities at day boundaries
-                    s_start = issuer_curve.survival_prob(date_start)
-                    s_end = issuer_curve.survival_prob(date_end)
-                    
-                    # Get discount factor for payment at day end
-                    libor_curve = issuer_curve.libor_curve
-                    df_end = libor_curve.df(date_end, day_count=DayCountTypes.ACT_365F)
-                    
-                    # Calculate daily default probability
-                    default_prob = s_start - s_end
-
-                    if not self.coupon_pay_front:
-                        daily_contribution = default_prob * df_end * day_count.year_frac(pcd, date_end)[0]
-                    else:
-                        daily_contribution = default_prob * df_end * day_count.year_frac(date_end, ncd.add_days(1))[0]
-
-                    first_period_accrual_pv += daily_contribution
-
-                if not self.coupon_pay_front:
-                    full_rpv01 += first_period_accrual_pv
-                else:
-                    full_rpv01 -= first_period_accrual_pv
+                add_accrual_on_default(self.step_in_dt, ncd, ncd.add_days(1), -1.0)
 
         # For the rest of the periods
         for it in range(1, len(self.payment_dts)):
@@ -595,108 +714,141 @@ class GeneralCDS:
                 ncd = self.accrual_end_dts[it]
                 cpd = self.payment_dts[it]
 
-                q2 = issuer_curve.survival_prob(ncd)
-                z2 = libor_curve.df(cpd, day_count=DayCountTypes.ACT_365F)
-
-                accrual_factor = year_fracs[it]
+                # full cpn is paid at the end of the current period if
+                # survives to payment date
+                add_coupon(ncd, cpd, year_fracs[it])
             else:
                 pcd = self.accrual_start_dts[it+1]
                 ncd = self.accrual_end_dts[it]
                 ppcd = self.accrual_end_dts[it-1]
 
-                q2 = issuer_curve.survival_prob(pcd)
-                z2 = libor_curve.df(pcd, day_count=DayCountTypes.ACT_365F)
-
-                accrual_factor = year_fracs[it+1]
-
-            # full cpn is paid at the end of the current period if survives to
-            # payment date
-            full_rpv01 += q2 * z2 * accrual_factor
-
-            #######################################################################
+                add_coupon(pcd, pcd, year_fracs[it+1])
 
             if coupon_accrued:
 
                 if self.coupon_pay_front and (self.ac_type == AccCouponTypes.TO_PERIOD_END):
-                    full_rpv01 += 0.0
+                    pass
                 elif (not self.coupon_pay_front) and (self.ac_type == AccCouponTypes.ZERO):
-                    full_rpv01 += 0.0
+                    pass
+                elif not self.coupon_pay_front:
+                    add_accrual_on_default(pcd, ncd, pcd, 1.0)
                 else:
-                    period_accrual_pv = 0.0
-                    if not self.coupon_pay_front:
-                        period_end_days = int(ncd - pcd)
-                    else:
-                        period_end_days = int(ncd - ppcd)
-                    
-                    for day in range(0, period_end_days):
-                        # Convert day to Date objects for curve lookups
-                        if not self.coupon_pay_front:
-                            date_start = pcd.add_days(day)
-                            date_end = pcd.add_days(day + 1)
-                        else:
-                            date_start = ppcd.add_days(day)
-                            date_end = ppcd.add_days(day + 1)
-                        
-                        # Ensure we don't exceed maturity
-                        if date_end > self.maturity_dt:
-                            date_end = self.maturity_dt
-                        
-                        # Get survival probabilities at day boundaries
-                        s_start = issuer_curve.survival_prob(date_start)
-                        s_end = issuer_curve.survival_prob(date_end)
-                        
-                        # Get discount factor for payment at day end
-                        libor_curve = issuer_curve.libor_curve
-                        df_end = libor_curve.df(date_end, day_count=DayCountTypes.ACT_365F)
-                        
-                        # Calculate daily default probability
-                        default_prob = s_start - s_end
-
-                        if not self.coupon_pay_front:
-                            daily_contribution = default_prob * df_end * day_count.year_frac(pcd, date_end)[0]
-                        else:
-                            daily_contribution = default_prob * df_end * day_count.year_frac(date_end, ncd.add_days(1))[0]
-
-                        period_accrual_pv += daily_contribution
-
-                    if not self.coupon_pay_front:
-                        full_rpv01 += period_accrual_pv
-                    else:
-                        full_rpv01 -= period_accrual_pv
-
-            q1 = q2
-        
+                    add_accrual_on_default(ppcd, ncd, ncd.add_days(1), -1.0)
+
         # For the last period
         if coupon_accrued and self.coupon_pay_front and (self.ac_type == AccCouponTypes.TO_DEFAULT):
             pcd = self.accrual_end_dts[-2]
             ncd = self.accrual_end_dts[-1]
-            period_end_days = int(ncd - pcd)
-            period_accrual_pv = 0.0
-
-            for day in range(0, period_end_days):
-                # Convert day to Date objects for curve lookups
-                date_start = pcd.add_days(day)
-                date_end = pcd.add_days(day + 1)
-                
-                # Get survival probabilities at day boundaries
-                s_start = issuer_curve.survival_prob(date_start)
-                s_end = issuer_curve.survival_prob(date_end)
-                
-                # Get discount factor for payment at day end
-                libor_curve = issuer_curve.libor_curve
-                df_end = libor_curve.df(date_end, day_count=DayCountTypes.ACT_365F)
-                
-                # Calculate daily default probability
-                default_prob = s_start - s_end
-
-                daily_contribution = default_prob * df_end * day_count.year_frac(date_end, ncd.add_days(1))[0]
-                period_accrual_pv += daily_contribution
-            
-            full_rpv01 -= period_accrual_pv
 
-        clean_rpv01 = full_rpv01 - accrual_factor_pcd_to_now
+            add_accrual_on_default(pcd, ncd, ncd.add_days(1), -1.0)
 
-        return {"dirty_rpv01": full_rpv01, "clean_rpv01": clean_rpv01}
+        return (
+            np.concatenate(times),
+            np.concatenate(weights),
+            accrual_factor_pcd_to_now,
+        )
+
+    ###########################################################################
+
+    def _accrual_on_default_grid(
+        self, value_dt, issuer_curve, start_dt, end_dt, accrual_dt,
+        day_dfs=None
+    ):
+        """Day grid for the premium accrued at default for defaults on the
+        days from start_dt to end_dt, paid at the end of the day of default.
+        The accrual runs from accrual_dt to the day end when accrual_dt is
+        before the period and from the day end to accrual_dt when it is
+        after, as for coupons paid in advance. Returns the survival times
+        at the day starts and ends and the discounted accrual factors, so
+        that the value is the sum of the weights times the survival
+        probability differences over the days."""
+
+        anchor_days = int(value_dt - issuer_curve.value_dt)
+        start_days = int(start_dt - value_dt)
+        end_days = int(end_dt - value_dt)
+        maturity_days = int(self.maturity_dt - value_dt)
+
+        if end_days <= start_days:
+            return (
+                np.zeros(0),
+                np.zeros(0),
+                np.zeros((0,) + np.shape(day_dfs)[1:]),
+            )
+
+        day_starts = np.arange(start_days, end_days, dtype=float)
+        day_ends = np.minimum(day_starts + 1.0, maturity_days)
+
+        z_end = self._day_dfs(issuer_curve, day_ends + anchor_days, day_dfs)
+
+        accrual_days = float(accrual_dt - value_dt)
+        accrue_from = accrual_dt <= start_dt
+
+        if self.dc_type in (DayCountTypes.ACT_360, DayCountTypes.ACT_365F):
+            den = 360.0 if self.dc_type == DayCountTypes.ACT_360 else 365.0
+            if accrue_from:
+                accrual_factors = (day_ends - accrual_days) / den
+            else:
+                accrual_factors = (accrual_days - day_ends) / den
+        else:
+            day_count = DayCount(self.dc_type)
+            accrual_factors = np.empty(len(day_ends))
+            for i, day_end in enumerate(day_ends):
+                date_end = value_dt.add_days(int(day_end))
+                if accrue_from:
+                    accrual_factors[i] = day_count.year_frac(accrual_dt, date_end)[0]
+                else:
+                    accrual_factors[i] = day_count.year_frac(date_end, accrual_dt)[0]
+
+        return (
+            (day_starts + anchor_days) / 360.0,
+            (day_ends + anchor_days) / 360.0,
+            (z_end.T * accrual_factors).T,
+        )
+
+    ###########################################################################
+
+    def _clean_pv_grid(
+        self,
+        value_dt,
+        issuer_curve,
+        contract_recovery_rate=STANDARD_RECOVERY_RATE,
+        day_dfs=None
+    ):
+        """Survival times, weights and a constant such that the clean PV is
+        the constant plus the sum of the weights times the survival
+        probabilities. The clean PV is linear in the survival probabilities
+        for a running coupon contract with a DAILY_GRID protection leg, so
+        the grid depends on the Ibor curve only and can be reused while the
+        issuer curve changes, as in a bootstrap. Returns None for other
+        contracts. The discount factors may be read from a table day_dfs of
+        discount factors to whole days after the issuer curve anchor date,
+        which can be shared by all the contracts of a bootstrap."""
+
+        if self.upfront_payment_flag or self.pl_type != ProtLegTypes.DAILY_GRID:
+            return None
+
+        if self.long_protect:
+            long_prot = +1
+        else:
+            long_prot = -1
+
+        prot_times, prot_weights = self._prot_leg_grid(
+            value_dt, issuer_curve, day_dfs
+        )
+        prot_scale = (1.0 - contract_recovery_rate) * self.notional
+
+        premium_times, premium_weights, accrual_factor_pcd_to_now = (
+            self._premium_grid(value_dt, issuer_curve, True, day_dfs)
+        )
+        premium_scale = self.running_cpn * self.notional
+
+        times = np.concatenate((prot_times, premium_times))
+        weights = long_prot * np.concatenate(
+            (prot_weights * prot_scale, -premium_weights * premium_scale)
+        )
+        constant = long_prot * premium_scale * accrual_factor_pcd_to_now
+
+        return times, weights, constant
 
     ###########################################################################
 
@@ -751,7 +903,7 @@ class GeneralCDS:
             if dt > value_dt:
                 acc_factor = self.accrual_factors[it]
                 flow = self.flows[it]
-                z = issuer_curve.libor_curve.df(dt, day_count=DayCountTypes.ACT_365F)
+                z = issuer_curve.libor_curve.df(dt, dc_type=DayCountTypes.ACT_365F)
                 q = issuer_curve.survival_prob(dt)
                 print(
                     "%15s %10.6f %12.2f %12.6f %12.6f %12.2f"
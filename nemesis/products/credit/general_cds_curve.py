@@ -37,6 +37,108 @@ def f(h, *args):
 ###############################################################################
 
 
+def _clean_pv_from_grid(h, *args):
+    """Clean PV of a CDS from its cached survival grid when the hazard rate
+    beyond the previous pillar is h. The cumulative hazard at each grid time
+    is the fixed part up to the previous pillar plus h times the time past
+    it."""
+
+    weights, fixed_cum_hazards, tail_times, constant = args
+    return constant + np.dot(weights, np.exp(-fixed_cum_hazards - h * tail_times))
+
+
+###############################################################################
+
+
+def _clean_pv_from_grid_deriv(h, *args):
+    """Analytic derivative of _clean_pv_from_grid with respect to h."""
+
+    weights, fixed_cum_hazards, tail_times, _ = args
+    return -np.dot(
+        weights * tail_times, np.exp(-fixed_cum_hazards - h * tail_times)
+    )
+
+
+###############################################################################
+
+
+def _num_grid_days(value_dt, cds_contracts):
+    """Number of days from value_dt to the last maturity or payment date of
+    the contracts, both included."""
+
+    last_dt = max(
+        max(cds.maturity_dt, cds.payment_dts[-1]) for cds in cds_contracts
+    )
+
+    return int(last_dt - value_dt) + 1
+
+
+###############################################################################
+
+
+def _daily_dfs(libor_curve, value_dt, cds_contracts):
+    """ACT/365F discount factors to every day from value_dt to the last
+    maturity or payment date of the contracts, indexed by day."""
+
+    num_days = _num_grid_days(value_dt, cds_contracts)
+
+    return libor_curve.df_t(np.arange(num_days) / 365.0)
+
+
+###############################################################################
+
+
+def _pillar_cum_hazards(times, hazards):
+    """Integral of a backward flat hazard rate curve from time zero to each
+    of its pillar times."""
+
+    return np.concatenate(([0.0], np.cumsum(hazards[1:] * np.diff(times))))
+
+
+###############################################################################
+
+
+def _cumulative_hazard(t, times, hazards, cum_hazards=None):
+    """Integral of a backward flat hazard rate curve from time zero to each
+    time in t. hazards[k] applies on (times[k-1], times[k]] and the last
+    hazard is extrapolated flat. The pillar integrals may be passed in when
+    they have been precomputed. Only those before the last pillar are read
+    so they stay valid while the last hazard is being solved for."""
+
+    if cum_hazards is None:
+        cum_hazards = _pillar_cum_hazards(times, hazards)
+
+    num_points = len(times)
+
+    if np.ndim(t) == 0:
+        t = float(t)
+
+        if t < 0.0:
+            raise FinError("Survival Date before curve anchor date")
+
+        index = min(int(np.searchsorted(times, t)), num_points - 1)
+        if index == 0:
+            return hazards[0] * t
+        return cum_hazards[index - 1] + hazards[index] * (t - times[index - 1])
+
+    t = np.asarray(t, dtype=float)
+
+    if np.any(t < 0.0):
+        raise FinError("Survival Date before curve anchor date")
+
+    index = np.minimum(np.searchsorted(times, t), num_points - 1)
+    prev = np.maximum(index - 1, 0)
+
+    return np.where(
+        index == 0,
+        hazards[0] * t,
+        cum_hazards[prev] + hazards[index] * (t - times[prev]),
+    )
+
+
+###############################################################################
+
+
 class GeneralCDSCurve:
     """Generate a survival probability curve implied by the value of CDS
     contracts given a Ibor curve and an assumed recovery rate. The recovery
@@ -71,6 +173,12 @@ class GeneralCDSCurve:
 
         self._times = []
         self._values = []
+        self._cum_hazards = []
+        self._calibration_grids = []
+        self._quote_jacobian = None
+        self._pv_hazard = None
+        self._ibor_jacobian = None
+        self._recovery_jacobian = None
 
         if len(self.cds_contracts) > 0:
             self._build_curve()
@@ -107,20 +215,50 @@ class GeneralCDSCurve:
     
     ###########################################################################
 
-    def hazard_rate(self, dt):
-        """Extract the hazard rate to date dt. This function
-        supports vectorisation."""
+    def _times_from_dts(self, dt):
+        """Convert a date, a list of dates or times to ACT/360 years from
+        the curve anchor date."""
 
         if isinstance(dt, Date):
-            t = (dt - self.value_dt) / 360
+            return (dt - self.value_dt) / 360.0
         elif isinstance(dt, list):
-            t = np.array(dt)
+            if len(dt) > 0 and isinstance(dt[0], Date):
+                serials = np.array([d.excel_dt for d in dt], dtype=float)
+                return (serials - self.value_dt.excel_dt) / 360.0
+            return np.array(dt, dtype=float)
+        elif isinstance(dt, (float, int, np.ndarray)):
+            return dt
         else:
-            t = dt
+            raise FinError("Unknown time type")
+
+    ###########################################################################
+
+    def _update_cum_hazards(self):
+        """Precompute the integrated hazard at the pillars. This must be
+        called whenever the pillar times or hazard rates change."""
 
-        if np.any(t < 0.0):
+        self._cum_hazards = _pillar_cum_hazards(self._times, self._values)
+
+    ###########################################################################
+
+    def hazard_rate(self, dt):
+        """Extract the hazard rate to date dt. This function
+        supports vectorisation over lists of dates and arrays of times."""
+
+        t = self._times_from_dts(dt)
+
+        if np.any(np.asarray(t) < 0.0):
             raise FinError("Survival Date before curve anchor date")
 
+        if self.interp_method == InterpTypes.BACKWARD_FLAT_HAZARD_RATES:
+            index = np.minimum(
+                np.searchsorted(self._times, t), len(self._times) - 1
+            )
+            hs = self._values[index]
+            if isinstance(t, np.ndarray):
+                return hs
+            return float(hs)
+
         if isinstance(t, np.ndarray):
             n = len(t)
             qs = np.zeros(n)
@@ -129,43 +267,31 @@ class GeneralCDSCurve:
                     t[i], self._times, self._values, self.interp_method.value
                 )
             return qs
-        elif isinstance(t, float):
+        else:
             h = _uinterpolate(
-                t, self._times, self._values, self.interp_method.value
+                float(t), self._times, self._values, self.interp_method.value
             )
             return h
-        else:
-            raise FinError("Unknown time type")
 
     ###########################################################################
 
     def survival_prob(self, dt):
         """Extract the survival probability to date dt. This function
-        supports vectorisation."""
+        supports vectorisation over lists of dates and arrays of times."""
 
-        if isinstance(dt, Date):
-            t = (dt - self.value_dt) / 360.0
-        elif isinstance(dt, list):
-            t = np.array(dt)
-        else:
-            t = dt
+        return self.survival_prob_t(self._times_from_dts(dt))
 
-        if np.any(t < 0.0):
-            raise FinError("Survival Date before curve anchor date")
-
-        interp_xs = self._times.copy()
-        interp_ys = self._values.copy()
+    ###########################################################################
 
-        index = np.searchsorted(interp_xs, t)
-        if index == len(interp_xs):
-            index -= 1
-        integration_xs = interp_xs[: index + 1]
-        integration_xs[index] = t
-        integration_xs = [integration_xs[0].tolist()] + np.diff(integration_xs).tolist()
-        integration_ys = interp_ys[: index + 1]
-        integration = np.dot(integration_xs, integration_ys)
+    def survival_prob_t(self, t):
+        """Survival probabilities to a time or a vector of times in years of
+        ACT/360 from the curve anchor date."""
 
-        return np.exp(-integration)
+        return np.exp(
+            -_cumulative_hazard(
+                t, self._times, self._values, self._cum_hazards
+            )
+        )
 
     ###########################################################################
 
@@ -187,7 +313,13 @@ class GeneralCDSCurve:
     ###########################################################################
 
     def _build_curve(self):
-        """Construct the CDS survival curve from a set of CDS contracts"""
+        """Construct the CDS survival curve from a set of CDS contracts. The
+        clean PV of a running coupon contract with a DAILY_GRID protection
+        leg is linear in the survival probabilities on a grid that depends
+        only on the Ibor curve, so the grid of each contract is computed
+        once from a shared table of daily discount factors and each hazard
+        rate is solved by Newton with the analytic derivative. Other
+        contracts are revalued in full at each step."""
 
         self._validate(self.cds_contracts)
         num_times = len(self.cds_contracts)
@@ -196,33 +328,234 @@ class GeneralCDSCurve:
         self._times = np.array([0.0])
         self._values = np.array([0.0])
 
-        for i in range(0, num_times):
+        # one table of discount factors to each day serves all contracts
+        day_dfs = _daily_dfs(self.libor_curve, self.value_dt, self.cds_contracts)
 
-            maturity_dt = self.cds_contracts[i].maturity_dt
+        self._calibration_grids = []
+        self._quote_jacobian = None
+        self._pv_hazard = None
+        self._ibor_jacobian = None
+        self._recovery_jacobian = None
 
-            argtuple = (
-                self,
-                self.value_dt,
-                self.cds_contracts[i],
-                self.recovery_rate,
-            )
+        for i in range(0, num_times):
+
+            cds = self.cds_contracts[i]
+            maturity_dt = cds.maturity_dt
 
             t_mat = (maturity_dt - self.value_dt) / 360.0
+            t_prev = self._times[i]
             h = self._values[i]
 
             self._times = np.append(self._times, t_mat)
             self._values = np.append(self._values, h)
+            self._update_cum_hazards()
+
+            grid = cds._clean_pv_grid(
+                self.value_dt, self, self.recovery_rate, day_dfs
+            )
+            self._calibration_grids.append(grid)
+
+            if grid is None:
+                argtuple = (
+                    self,
+                    self.value_dt,
+                    cds,
+                    self.recovery_rate,
+                )
+
+                optimize.newton(
+                    f,
+                    x0=h,
+                    fprime=None,
+                    args=argtuple,
+                    tol=1e-7,
+                    maxiter=50,
+                    fprime2=None,
+                )
+                continue
+
+            times, weights, constant = grid
 
-            optimize.newton(
-                f,
+            # the survival grid splits into the part fixed by the previous
+            # pillars and the time spent beyond them at the new hazard
+            fixed_cum_hazards = _cumulative_hazard(
+                np.minimum(times, t_prev),
+                self._times,
+                self._values,
+                self._cum_hazards,
+            )
+            tail_times = np.maximum(times - t_prev, 0.0)
+
+            argtuple = (weights, fixed_cum_hazards, tail_times, constant)
+
+            self._values[i + 1] = optimize.newton(
+                _clean_pv_from_grid,
                 x0=h,
-                fprime=None,
+                fprime=_clean_pv_from_grid_deriv,
                 args=argtuple,
-                tol=1e-7,
+                tol=1e-10,
                 maxiter=50,
                 fprime2=None,
             )
 
+        self._update_cum_hazards()
+
+    ###########################################################################
+
+    def _hazard_sensitivities(self, times, weights):
+        """Derivatives of the sum of the weights times the survival
+        probabilities at the times with respect to the hazard rate of each
+        pillar. The hazard of a pillar acts on the time spent in its period
+        and that of the last pillar also on the time after it."""
+
+        times = np.asarray(times, dtype=float)
+        q = self.survival_prob_t(times)
+
+        starts = self._times[:-1]
+        lengths = np.diff(self._times)
+        lengths[-1] = np.inf
+
+        exposures = np.clip(times[:, None] - starts[None, :], 0.0, lengths)
+
+        return -(weights * q) @ exposures
+
+    ###########################################################################
+
+    def _calibration_hazard_sensitivities(self):
+        """Sensitivities of the clean values of the calibration contracts to
+        the pillar hazard rates, with one row per contract. They are taken
+        from the grids kept by the bootstrap and cached until the curve is
+        rebuilt."""
+
+        if self._pv_hazard is not None:
+            return self._pv_hazard
+
+        num_contracts = len(self.cds_contracts)
+
+        if num_contracts == 0 or any(
+            grid is None for grid in self._calibration_grids
+        ):
+            raise FinError(
+                "Curve Jacobians need running coupon contracts with DAILY_GRID protection legs"
+            )
+
+        self._pv_hazard = np.zeros((num_contracts, num_contracts))
+
+        for i in range(num_contracts):
+            times, weights, _ = self._calibration_grids[i]
+            self._pv_hazard[i] = self._hazard_sensitivities(times, weights)
+
+        return self._pv_hazard
+
+    ###########################################################################
+
+    def quote_jacobian(self):
+        """Jacobian of the pillar hazard rates to the running coupons of the
+        calibration contracts, with one row per pillar and one column per
+        contract. Each contract prices to zero on the curve, so by implicit
+        differentiation of the bootstrap the Jacobian is minus the inverse
+        of the sensitivities of the contract values to the hazard rates
+        times the sensitivities of the contract values to their coupons.
+        It is computed from the grids kept by the bootstrap and is cached
+        until the curve is rebuilt."""
+
+        if self._quote_jacobian is not None:
+            return self._quote_jacobian
+
+        pv_hazard = self._calibration_hazard_sensitivities()
+        pv_quote = np.zeros(len(self.cds_contracts))
+
+        for i, cds in enumerate(self.cds_contracts):
+
+            if cds.long_protect:
+                long_prot = +1
+            else:
+                long_prot = -1
+
+            clean_rpv01 = cds.risky_pv01(self.value_dt, self)["clean_rpv01"]
+            pv_quote[i] = -long_prot * cds.notional * clean_rpv01
+
+        self._quote_jacobian = -np.linalg.solve(pv_hazard, np.diag(pv_quote))
+
+        return self._quote_jacobian
+
+    ###########################################################################
+
+    def _day_df_jacobian(self, num_days=0):
+        """Jacobian of the ACT/365F discount factors to each day from the
+        curve date to the quotes of the Ibor curve, with one row per day.
+        The table covers the calibration contracts and at least num_days
+        days, so contracts valued on the curve share it with the bootstrap
+        and the Ibor curve can return it from its memo."""
+
+        if not hasattr(self.libor_curve, "df_quote_jacobian"):
+            raise FinError("Ibor curve does not have a quote Jacobian.")
+
+        num_days = max(
+            num_days, _num_grid_days(self.value_dt, self.cds_contracts)
+        )
+
+        return self.libor_curve.df_quote_jacobian(np.arange(num_days) / 365.0)
+
+    ###########################################################################
+
+    def ibor_jacobian(self):
+        """Jacobian of the pillar hazard rates to the quotes of the Ibor
+        curve, with one row per pillar and one column per Ibor quote. The
+        clean value of a calibration contract is linear in the discount
+        factors of its grid at fixed hazard rates, so its sensitivity to
+        each Ibor quote is its value on the grid built from the discount
+        factor Jacobian. The bootstrap is then differentiated implicitly as
+        for the quote Jacobian. It is cached until the curve is rebuilt."""
+
+        if self._ibor_jacobian is not None:
+            return self._ibor_jacobian
+
+        pv_hazard = self._calibration_hazard_sensitivities()
+        day_df_jacobian = self._day_df_jacobian()
+
+        pv_ibor = np.zeros((len(self.cds_contracts), day_df_jacobian.shape[1]))
+
+        for i, cds in enumerate(self.cds_contracts):
+            times, weights, constant = cds._clean_pv_grid(
+                self.value_dt, self, self.recovery_rate, day_df_jacobian
+            )
+            pv_ibor[i] = constant + self.survival_prob_t(times) @ weights
+
+        self._ibor_jacobian = -np.linalg.solve(pv_hazard, pv_ibor)
+
+        return self._ibor_jacobian
+
+    ###########################################################################
+
+    def recovery_jacobian(self):
+        """Sensitivities of the pillar hazard rates to the recovery rate of
+        the curve, one per pillar. The clean value of a calibration contract
+        falls with the recovery rate by its protection leg value per unit of
+        loss, and the bootstrap is differentiated implicitly as for the
+        quote Jacobian. It is cached until the curve is rebuilt."""
+
+        if self._recovery_jacobian is not None:
+            return self._recovery_jacobian
+
+        pv_hazard = self._calibration_hazard_sensitivities()
+        pv_recovery = np.zeros(len(self.cds_contracts))
+
+        for i, cds in enumerate(self.cds_contracts):
+
+            if cds.long_protect:
+                long_prot = +1
+            else:
+                long_prot = -1
+
+            times, weights = cds._prot_leg_grid(self.value_dt, self)
+            prot_pv = np.sum(weights * self.survival_prob_t(times))
+            pv_recovery[i] = -long_prot * cds.notional * prot_pv
+
+        self._recovery_jacobian = -np.linalg.solve(pv_hazard, pv_recovery)
+
+        return self._recovery_jacobian
+
     ###########################################################################
 
     def fwd(self, dt):
@@ -282,12 +615,12 @@ class GeneralCDSCurve:
         
         if dts:
             pillar_dts = [dt.datetime() for dt in dts]
-            hazard_rate = np.array([self.hazard_rate(dt) for dt in dts])
-            survival_prob = np.array([self.survival_prob(dt) for dt in dts])
+            hazard_rate = self.hazard_rate(list(dts))
+            survival_prob = self.survival_prob(list(dts))
         else:
             pillar_dts = [self.value_dt.datetime()] + [cds.maturity_dt.datetime() for cds in self.cds_contracts]
             hazard_rate = self._values
-            survival_prob = np.array([self.survival_prob(t) for t in self._times])
+            survival_prob = self.survival_prob(self._times)
         
         if formatted:
             hazard_rate, survival_prob = hazard_rate.round(6), survival_prob.round(6)
@@ -12,6 +12,7 @@ from ...utils.global_vars import g_days_in_year
 from ...utils.ql_helper import ql_date_to_date
 from ...market.curves.interpolator import _uinterpolate, InterpTypes, Interpolator
 from ...market.curves.discount_curve import DiscountCurve
+from .general_cds_curve import _cumulative_hazard
 
 
 ###############################################################################
@@ -190,6 +191,14 @@ class QLCreditCurve(DiscountCurve):
 
     ###########################################################################
 
+    def survival_prob_t(self, t):
+        """Survival probabilities to a time or a vector of times in years of
+        ACT/360 from the curve anchor date."""
+
+        return np.exp(-_cumulative_hazard(t, self._times, self._hazard_rates))
+
+    ###########################################################################
+
     def __repr__(self):
         """Print out the details of the QuantLib curve."""
 
@@ -2,8 +2,7 @@ import copy
 import numpy as np
 import pandas as pd
 from scipy import optimize
-from scipy.interpolate import interp1d
-from scipy.stats import norm
+from scipy.special import ndtr
 
 from ...market.curves.discount_curve import DiscountCurve
 from ...market.curves.forward_curve import ForwardCurve
@@ -34,7 +33,11 @@ class SigmaSolver:
         df_f: float,
         strike: float,
         forward: float,
-        vol_data: pd.DataFrame,
+        expiry_times: np.ndarray,
+        smile_deltas: np.ndarray,
+        smile_variances: np.ndarray,
+        smile_slopes: np.ndarray,
+        smile_sizes: np.ndarray,
         max_retries: int = 100,
         tol: float = 1e-4
     ):
@@ -49,8 +52,16 @@ class SigmaSolver:
             Option strike price
         forward : float
             Forward FX rate
-        vol_data : pd.DataFrame
-            Volatility data with T as index and delta as columns
+        expiry_times : np.ndarray
+            Sorted tenor times in years
+        smile_deltas : np.ndarray
+            Deltas of each tenor smile, one row per tenor, padded with inf
+        smile_variances : np.ndarray
+            Cumulative variances (sigma^2 * t) at the smile deltas
+        smile_slopes : np.ndarray
+            Slopes of the cumulative variance between consecutive deltas
+        smile_sizes : np.ndarray
+            Number of quoted deltas of each tenor smile
         max_retries : int
             Maximum number of iterations
         tol : float
@@ -60,19 +71,47 @@ class SigmaSolver:
         self.df_f = df_f
         self.strike = strike
         self.forward = forward
-        self.vol_data = vol_data
 
         self.max_retries = max_retries
         self.tol = tol
 
-        # Pre-compute delta interpolation functions for each tenor
-        self.interp_delta_funcs = {}
-        for t in self.vol_data.index:
-            smile = self.vol_data.loc[t, :].dropna(axis=0)
-            # Store cumulative variance (sigma^2 * t) for variance interpolation
-            self.interp_delta_funcs[t] = interp1d(
-                smile.index, smile ** 2 * t, fill_value="extrapolate"
-            )
+        self.smile_deltas = smile_deltas
+        self.smile_variances = smile_variances
+        self.smile_slopes = smile_slopes
+        self.smile_sizes = smile_sizes
+
+        # The time bracket does not depend on sigma, so the linear
+        # extrapolating interpolation in time reduces to the two tenors
+        # around T and their weights
+        num_times = len(expiry_times)
+        if num_times == 1:
+            self.time_rows = np.array([0, 0])
+            self.time_weights = np.array([1.0, 0.0])
+        else:
+            hi = min(max(int(np.searchsorted(expiry_times, T)), 1), num_times - 1)
+            lo = hi - 1
+            weight = (T - expiry_times[lo]) / (expiry_times[hi] - expiry_times[lo])
+            self.time_rows = np.array([lo, hi])
+            self.time_weights = np.array([1.0 - weight, weight])
+
+    ###########################################################################
+
+    def _interp_cumulative_var(self, delta: float) -> np.ndarray:
+        """
+        Interpolate cumulative variance linearly in delta on the smiles of
+        the two bracketing tenors, extrapolating linearly beyond the end
+        deltas.
+        """
+        rows = self.time_rows
+        deltas = self.smile_deltas[rows]
+
+        segments = np.sum(deltas < delta, axis=1) - 1
+        segments = np.clip(segments, 0, np.maximum(self.smile_sizes[rows] - 2, 0))
+
+        return (
+            self.smile_slopes[rows, segments] * (delta - deltas[[0, 1], segments])
+            + self.smile_variances[rows, segments]
+        )
 
     ###########################################################################
 
@@ -93,22 +132,12 @@ class SigmaSolver:
         # Calculate d1 and delta using Black-Scholes
         d1 = (np.log(self.forward / self.strike) + 0.5 * sigma ** 2 * self.T) / \
              (sigma * np.sqrt(self.T))
-        delta = self.df_f * norm.cdf(d1)
+        delta = self.df_f * ndtr(d1)
 
-        # Interpolate cumulative variance at each tenor using delta
-        ts = self.vol_data.index
-        interp_cumulative_var = pd.Series(data=[np.nan] * len(ts), index=ts)
-
-        for t in ts:
-            interp_cumulative_var[t] = self.interp_delta_funcs[t](delta)
-
-        # Interpolate in time dimension
-        interp_func = interp1d(
-            interp_cumulative_var.index,
-            interp_cumulative_var,
-            fill_value="extrapolate"
-        )
-        interp_sigma_sq_t = interp_func(self.T)
+        # Interpolate cumulative variance at the bracketing tenors using
+        # delta, then in time dimension
+        interp_cumulative_var = self._interp_cumulative_var(delta)
+        interp_sigma_sq_t = np.dot(self.time_weights, interp_cumulative_var)
 
         # Convert cumulative variance back to volatility
         if interp_sigma_sq_t < 0:
@@ -229,6 +258,9 @@ class FXVolSurface(VolSurface):
         # Transform RR/BF data to Call/Put volatilities
         self.vol_data = self._build_vol_data()
 
+        # Precompute the smile and ATM term structure interpolation arrays
+        self._build_interpolators()
+
     ###########################################################################
 
     def _build_vol_data(self) -> pd.DataFrame:
@@ -329,6 +361,43 @@ class FXVolSurface(VolSurface):
 
     ###########################################################################
 
+    def _build_interpolators(self):
+        """
+        Build the delta-space smile of each tenor and the ATM term structure
+        once as flat arrays. Each smile holds its quoted deltas, padded with
+        inf to a common width, the cumulative variances (sigma^2 * t) at
+        them and the slopes between consecutive deltas.
+        """
+        expiry_times = np.array(self.vol_data.index, dtype=float)
+        all_deltas = np.array(self.vol_data.columns, dtype=float)
+        vols = self.vol_data.to_numpy(dtype=float)
+
+        num_times, num_deltas = vols.shape
+        smile_deltas = np.full((num_times, num_deltas), np.inf)
+        smile_variances = np.zeros((num_times, num_deltas))
+        smile_slopes = np.zeros((num_times, num_deltas))
+        smile_sizes = np.zeros(num_times, dtype=int)
+
+        for i, t in enumerate(expiry_times):
+            quoted = ~np.isnan(vols[i])
+            size = int(np.sum(quoted))
+            deltas = all_deltas[quoted]
+            variances = vols[i, quoted] ** 2 * t
+
+            smile_deltas[i, :size] = deltas
+            smile_variances[i, :size] = variances
+            smile_slopes[i, : size - 1] = np.diff(variances) / np.diff(deltas)
+            smile_sizes[i] = size
+
+        self._expiry_times = expiry_times
+        self._smile_deltas = smile_deltas
+        self._smile_variances = smile_variances
+        self._smile_slopes = smile_slopes
+        self._smile_sizes = smile_sizes
+        self._atm_vols = self.vol_data[0.5].to_numpy(dtype=float)
+
+    ###########################################################################
+
     def _get_atm_term_sigma(self, t: float) -> float:
         """
         Get ATM volatility for a given time by interpolation.
@@ -343,9 +412,16 @@ class FXVolSurface(VolSurface):
         float
             ATM volatility
         """
-        atm_vol = self.vol_data[0.5].copy()
-        interp_t_func = interp1d(atm_vol.index, atm_vol, fill_value="extrapolate")
-        atm_term_sigma = interp_t_func(t)
+        times = self._expiry_times
+        atm_vols = self._atm_vols
+
+        if len(times) == 1:
+            atm_term_sigma = atm_vols[0]
+        else:
+            hi = min(max(int(np.searchsorted(times, t)), 1), len(times) - 1)
+            lo = hi - 1
+            slope = (atm_vols[hi] - atm_vols[lo]) / (times[hi] - times[lo])
+            atm_term_sigma = slope * (t - times[lo]) + atm_vols[lo]
 
         if atm_term_sigma < 0:
             atm_term_sigma = 1e-4
@@ -383,7 +459,17 @@ class FXVolSurface(VolSurface):
         sigma = self._get_atm_term_sigma(T)
 
         # Solve for volatility
-        solver = SigmaSolver(T, df_f, strike, forward, self.vol_data)
+        solver = SigmaSolver(
+            T,
+            df_f,
+            strike,
+            forward,
+            self._expiry_times,
+            self._smile_deltas,
+            self._smile_variances,
+            self._smile_slopes,
+            self._smile_sizes,
+        )
         sigma = solver.solve_sigma(sigma)
 
         return float(sigma) + self._vol_bump
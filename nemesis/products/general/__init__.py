@@ -1 +1,2 @@
-from .trs import *
\ No newline at end of file
+from .cashflow_ladder import *
+from .trs import *
@@ -0,0 +1,629 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import numpy as np
+
+from ...market.curves.discount_curve import DiscountCurve
+from ...market.indices.interest_rate_index import FixingSource
+from ...utils.date import Date
+from ...utils.date_helper import get_year_fraction
+from ...utils.day_count import DayCount
+from ...utils.error import FinError
+from ...utils.fx_helper import get_trs_fx_spot
+from ...utils.global_types import SwapTypes
+from ...utils.global_vars import g_days_in_year
+from ...utils.helpers import label_to_string
+from ..fx.fx_forward import FXForward
+from ..rates.ir_swap import InterestRateSwap
+from ..rates.xccy_swap import FixedFixedXCcySwap
+from .trs.asset_leg import CrossBorderAssetLeg
+from .trs.funding_leg import CrossBorderFixedFundingLeg
+from .trs.trs import CrossBorderTRS, TotalReturnSwap
+
+
+###############################################################################
+
+
+class CashflowLadder:
+    """Streaming projector of the future cashflows of a book of trades.
+
+    Trades are registered together with the market data they are valued on.
+    Nothing is projected until the ladder is iterated, and then the trades
+    are projected one at a time into columnar batches of at most batch_size
+    rows, so memory is bounded by the batch size rather than the book size.
+    Each batch is a dict of numpy arrays with the columns
+
+        trade_id, leg, payment_serial, currency, amount, df
+
+    where payment_serial is the Excel serial of the payment date (as in
+    Date.excel_dt), amount is the signed projected cashflow in the leg
+    currency (positive when received) and df the discount factor from the
+    value date to the payment date. Only cashflows paid after the value
+    date are included.
+
+    TRS flows are projected over the full unpaid periods. Asset prices
+    grow from the latest price along the asset curve, so the price return
+    of a period that has not reset is projected from forward prices, and
+    funding and spread accruals run to the period end."""
+
+    COLUMNS = ("trade_id", "leg", "payment_serial", "currency", "amount", "df")
+
+    def __init__(self, value_dt: Date):
+        self.value_dt = value_dt
+        self._entries = []
+
+    ###########################################################################
+
+    def __len__(self):
+        return len(self._entries)
+
+    ###########################################################################
+
+    def add_swap(
+        self,
+        trade_id: str,
+        swap: InterestRateSwap,
+        ccy: str,
+        discount_curve: DiscountCurve,
+        projection_curve: DiscountCurve | None = None,
+        fixing_source: FixingSource | None = None,
+    ):
+        """Register a fixed-vs-floating interest rate swap. The projection
+        curve defaults to the discount curve."""
+
+        if projection_curve is None:
+            projection_curve = discount_curve
+
+        self._entries.append(
+            (
+                self._swap_chunks,
+                trade_id,
+                (swap, ccy, discount_curve, projection_curve, fixing_source),
+            )
+        )
+
+    ###########################################################################
+
+    def add_xccy_swap(
+        self,
+        trade_id: str,
+        swap: FixedFixedXCcySwap,
+        discount_curve_1: DiscountCurve,
+        discount_curve_2: DiscountCurve,
+    ):
+        """Register a fixed-fixed cross currency swap with the discount
+        curves of its two leg currencies."""
+
+        self._entries.append(
+            (
+                self._xccy_swap_chunks,
+                trade_id,
+                (swap, discount_curve_1, discount_curve_2),
+            )
+        )
+
+    ###########################################################################
+
+    def add_fx_forward(
+        self,
+        trade_id: str,
+        fx_forward: FXForward,
+        domestic_curve: DiscountCurve,
+        foreign_curve: DiscountCurve,
+    ):
+        """Register an FX forward. The owner receives the foreign notional
+        and pays the domestic notional on the delivery date."""
+
+        self._entries.append(
+            (
+                self._fx_forward_chunks,
+                trade_id,
+                (fx_forward, domestic_curve, foreign_curve),
+            )
+        )
+
+    ###########################################################################
+
+    def add_trs(
+        self,
+        trade_id: str,
+        trs: TotalReturnSwap | CrossBorderTRS,
+        latest_asset_price: float,
+        discount_curve: DiscountCurve,
+        ccy: str | None = None,
+        fx_spot: float | None = None,
+        asset_curve: DiscountCurve | None = None,
+    ):
+        """Register a total return swap with the discount curve of its
+        payment currency. Forward asset prices are the latest price over
+        the discount factors of the asset curve, which defaults to the
+        discount curve. Cross border TRS are reported in their settlement
+        currency and need the FX spot, which is used for FX fixings that
+        are still to come. Other TRS need the currency of their legs."""
+
+        if isinstance(trs, CrossBorderTRS):
+            if fx_spot is None:
+                raise FinError("FX spot is required for a cross border TRS")
+            if ccy is None:
+                ccy = trs.settle_ccy
+        elif ccy is None:
+            raise FinError("Currency is required for a TRS")
+
+        if asset_curve is None:
+            asset_curve = discount_curve
+
+        self._entries.append(
+            (
+                self._trs_chunks,
+                trade_id,
+                (trs, latest_asset_price, discount_curve, asset_curve, ccy, fx_spot),
+            )
+        )
+
+    ###########################################################################
+
+    def batches(self, batch_size: int = 100000) -> Iterator[dict]:
+        """Yield the cashflows of all registered trades as dicts of column
+        arrays with at most batch_size rows each."""
+
+        if batch_size < 1:
+            raise FinError("Batch size must be positive.")
+
+        buffer = []
+        num_buffered = 0
+
+        for project_chunks, trade_id, market in self._entries:
+            for chunk in project_chunks(trade_id, *market):
+                buffer.append(chunk)
+                num_buffered += len(chunk["amount"])
+
+                while num_buffered >= batch_size:
+                    batch = _concat_chunks(buffer)
+                    yield {k: v[:batch_size] for k, v in batch.items()}
+
+                    rest = {k: v[batch_size:] for k, v in batch.items()}
+                    num_buffered = len(rest["amount"])
+                    buffer = [rest] if num_buffered > 0 else []
+
+        if num_buffered > 0:
+            yield _concat_chunks(buffer)
+
+    ###########################################################################
+
+    def record_batches(self, batch_size: int = 100000):
+        """Yield the cashflows as pyarrow RecordBatches. Needs pyarrow."""
+
+        import pyarrow as pa
+
+        schema = self.arrow_schema()
+
+        for batch in self.batches(batch_size):
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(batch[name], type=schema.field(name).type)
+                 for name in self.COLUMNS],
+                schema=schema,
+            )
+
+    ###########################################################################
+
+    def arrow_schema(self):
+        """The pyarrow schema of the record batches. Needs pyarrow."""
+
+        import pyarrow as pa
+
+        return pa.schema(
+            [
+                ("trade_id", pa.string()),
+                ("leg", pa.string()),
+                ("payment_serial", pa.int64()),
+                ("currency", pa.string()),
+                ("amount", pa.float64()),
+                ("df", pa.float64()),
+            ]
+        )
+
+    ###########################################################################
+
+    def write_parquet(self, path: str, batch_size: int = 100000) -> int:
+        """Stream the cashflows into a Parquet file one batch at a time and
+        return the number of rows written. Needs pyarrow."""
+
+        import pyarrow.parquet as pq
+
+        num_rows = 0
+
+        with pq.ParquetWriter(path, self.arrow_schema()) as writer:
+            for record_batch in self.record_batches(batch_size):
+                writer.write_batch(record_batch)
+                num_rows += record_batch.num_rows
+
+        return num_rows
+
+    ###########################################################################
+
+    def _swap_chunks(
+        self,
+        trade_id,
+        swap,
+        ccy,
+        discount_curve,
+        projection_curve,
+        fixing_source,
+    ):
+        value_dt = self.value_dt
+
+        fixed_leg = swap.fixed_leg
+        payment_dfs, i_live = fixed_leg._payment_dfs(value_dt, discount_curve)
+        amounts = fixed_leg._year_fracs * (fixed_leg.notional * fixed_leg.cpn)
+        amounts[-1] += fixed_leg.principal * fixed_leg.notional
+
+        yield _chunk(
+            trade_id,
+            "FIXED",
+            fixed_leg._payment_serials[i_live:],
+            ccy,
+            _leg_sign(fixed_leg) * amounts[i_live:],
+            payment_dfs[i_live:],
+        )
+
+        float_leg = swap.float_leg
+        i_live = np.searchsorted(
+            float_leg._payment_serials, value_dt.excel_dt, side="right"
+        )
+
+        if i_live == len(float_leg.payment_dts):
+            return
+
+        rates = float_leg.rate_rule.period_rates(
+            float_leg,
+            value_dt,
+            i_live,
+            projection_curve=projection_curve,
+            fixing_source=fixing_source,
+        )
+        amounts = rates * float_leg._year_fracs[i_live:] * float_leg.notional
+        amounts[-1] += float_leg.principal * float_leg.notional
+        payment_dfs = discount_curve.df(
+            float_leg.payment_dts[i_live:]
+        ) / discount_curve.df(value_dt)
+
+        yield _chunk(
+            trade_id,
+            "FLOAT",
+            float_leg._payment_serials[i_live:],
+            ccy,
+            _leg_sign(float_leg) * amounts,
+            payment_dfs,
+        )
+
+    ###########################################################################
+
+    def _xccy_swap_chunks(
+        self,
+        trade_id,
+        swap,
+        discount_curve_1,
+        discount_curve_2,
+    ):
+        value_dt = self.value_dt
+
+        for leg_name, leg, discount_curve in (
+            ("FIXED_1", swap.fixed_leg_1, discount_curve_1),
+            ("FIXED_2", swap.fixed_leg_2, discount_curve_2),
+        ):
+            payment_dfs, i_live = leg._payment_dfs(value_dt, discount_curve)
+            amounts = leg._year_fracs * (leg.notional * leg.cpn)
+            serials = leg._payment_serials
+
+            if leg.is_final_notional_ex:
+                amounts[-1] += leg.principal * leg.notional
+
+            amounts = amounts[i_live:]
+            serials = serials[i_live:]
+            payment_dfs = payment_dfs[i_live:]
+
+            # the initial exchange goes the other way to the coupons
+            if leg.is_init_notional_ex and leg.effective_dt > value_dt:
+                df_settle = discount_curve.df(leg.effective_dt) / discount_curve.df(value_dt)
+                amounts = np.concatenate(([-leg.principal * leg.notional], amounts))
+                serials = np.concatenate(([leg.effective_dt.excel_dt], serials))
+                payment_dfs = np.concatenate(([df_settle], payment_dfs))
+
+            yield _chunk(
+                trade_id,
+                leg_name,
+                serials,
+                leg.ccy,
+                _leg_sign(leg) * amounts,
+                payment_dfs,
+            )
+
+    ###########################################################################
+
+    def _fx_forward_chunks(
+        self,
+        trade_id,
+        fx_forward,
+        domestic_curve,
+        foreign_curve,
+    ):
+        value_dt = self.value_dt
+        delivery_dt = fx_forward.delivery_dt
+
+        if delivery_dt <= value_dt:
+            return
+
+        if fx_forward.notional_currency == fx_forward.for_name:
+            notional_for = fx_forward.notional
+            notional_dom = fx_forward.notional * fx_forward.strike_fx_rate
+        else:
+            notional_for = fx_forward.notional / fx_forward.strike_fx_rate
+            notional_dom = fx_forward.notional
+
+        # Forward and discounting as in FXForward.forward and value, so the
+        # foreign amount is worth the forward rate in domestic on the
+        # domestic discount factor, here expressed at the spot rate
+        fwd_fx_rate = fx_forward.forward(value_dt, domestic_curve, foreign_curve)
+        t = max((fx_forward.expiry_dt - value_dt) / g_days_in_year, 1e-10)
+        dom_df = domestic_curve.df_t(t)
+        for_df = fwd_fx_rate * dom_df / fx_forward.spot_fx_rate
+
+        serials = np.array([delivery_dt.excel_dt])
+
+        yield _chunk(
+            trade_id,
+            "FX_FOREIGN",
+            serials,
+            fx_forward.for_name,
+            np.array([notional_for]),
+            np.array([for_df]),
+        )
+
+        yield _chunk(
+            trade_id,
+            "FX_DOMESTIC",
+            serials,
+            fx_forward.dom_name,
+            np.array([-notional_dom]),
+            np.array([dom_df]),
+        )
+
+    ###########################################################################
+
+    def _trs_chunks(
+        self,
+        trade_id,
+        trs,
+        latest_asset_price,
+        discount_curve,
+        asset_curve,
+        ccy,
+        fx_spot,
+    ):
+        value_dt = self.value_dt
+        df_value = discount_curve.df(value_dt)
+
+        asset_leg = trs.asset_leg
+        payment_dts, amounts = _asset_leg_projection(
+            asset_leg, value_dt, latest_asset_price, asset_curve, fx_spot
+        )
+
+        yield _projected_chunk(
+            trade_id,
+            "TOTAL_RETURN_ASSET",
+            payment_dts,
+            _leg_sign(asset_leg) * amounts,
+            ccy,
+            discount_curve,
+            df_value,
+        )
+
+        for key, funding_leg in trs.funding_legs.items():
+            payment_dts, amounts = _funding_leg_projection(
+                funding_leg, value_dt, fx_spot
+            )
+
+            yield _projected_chunk(
+                trade_id,
+                "TOTAL_RETURN_FUNDING_" + str(key),
+                payment_dts,
+                _leg_sign(funding_leg) * amounts,
+                ccy,
+                discount_curve,
+                df_value,
+            )
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("VALUE DATE", self.value_dt)
+        s += label_to_string("NUM TRADES", len(self._entries))
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        print(self)
+
+
+###############################################################################
+
+
+def _leg_sign(leg) -> float:
+    return -1.0 if leg.leg_type == SwapTypes.PAY else 1.0
+
+
+###############################################################################
+
+
+def _chunk(trade_id, leg_name, serials, ccy, amounts, dfs) -> dict:
+    """Columns of the cashflows of one leg."""
+
+    num_flows = len(amounts)
+
+    return {
+        "trade_id": np.full(num_flows, trade_id, dtype=object),
+        "leg": np.full(num_flows, leg_name, dtype=object),
+        "payment_serial": np.asarray(serials, dtype=np.int64),
+        "currency": np.full(num_flows, ccy, dtype=object),
+        "amount": np.asarray(amounts, dtype=np.float64),
+        "df": np.asarray(dfs, dtype=np.float64),
+    }
+
+
+###############################################################################
+
+
+def _projected_chunk(
+    trade_id, leg_name, payment_dts, amounts, ccy, discount_curve, df_value
+) -> dict:
+    """Columns of projected TRS flows discounted on the discount curve."""
+
+    if len(payment_dts) == 0:
+        dfs = np.zeros(0)
+    else:
+        dfs = np.atleast_1d(discount_curve.df(payment_dts)) / df_value
+
+    return _chunk(
+        trade_id,
+        leg_name,
+        [dt.excel_dt for dt in payment_dts],
+        ccy,
+        amounts,
+        dfs,
+    )
+
+
+###############################################################################
+
+
+def _asset_leg_projection(asset_leg, value_dt, latest_asset_price, asset_curve, fx_spot):
+    """Payment dates and projected payments of the unpaid periods of a TRS
+    asset leg, unsigned. Prices at resets on or before the value date are
+    read as AssetLeg.value reads them, later ones are forward prices."""
+
+    df_value = asset_curve.df(value_dt)
+    last_reset_dts = [asset_leg.start_dt] + asset_leg.reset_dts[:-1]
+    payment_dts = []
+    amounts = []
+
+    for i_pmnt, (last_reset_dt, reset_dt, payment_dt) in enumerate(
+        zip(last_reset_dts, asset_leg.reset_dts, asset_leg.payment_dts)
+    ):
+        if payment_dt <= value_dt:
+            continue
+
+        if last_reset_dt <= value_dt:
+            last_asset_price, current_asset_price = asset_leg._get_asset_price(
+                i_pmnt,
+                last_reset_dt,
+                reset_dt,
+                value_dt,
+                asset_leg.initial_asset_price,
+                latest_asset_price,
+                asset_leg.asset_prices,
+            )
+        else:
+            last_asset_price = (
+                latest_asset_price * df_value / asset_curve.df(last_reset_dt)
+            )
+
+        if reset_dt > value_dt:
+            current_asset_price = latest_asset_price * df_value / asset_curve.df(reset_dt)
+
+        if asset_leg.is_fixed_qty:
+            qty = asset_leg.quantity
+        else:
+            qty = asset_leg.quantity * asset_leg.initial_asset_price / last_asset_price
+
+        if asset_leg.spread_notional_reset:
+            spread_notional = asset_leg.quantity * last_asset_price
+        else:
+            spread_notional = asset_leg.quantity * asset_leg.initial_asset_price
+
+        spread_period = DayCount(asset_leg.spread_dc_type).year_frac(
+            last_reset_dt, reset_dt
+        )[0]
+
+        amount = (
+            qty * (current_asset_price - last_asset_price)
+            + spread_notional * asset_leg.spread * spread_period
+        )
+
+        if isinstance(asset_leg, CrossBorderAssetLeg):
+            amount *= get_trs_fx_spot(
+                asset_leg.asset_ccy,
+                asset_leg.ccy_pair,
+                value_dt,
+                asset_leg.fx_fixing_dts[i_pmnt],
+                asset_leg.fx_fixing,
+                fx_spot,
+            )
+
+        payment_dts.append(payment_dt)
+        amounts.append(amount)
+
+    return payment_dts, np.array(amounts)
+
+
+###############################################################################
+
+
+def _funding_leg_projection(funding_leg, value_dt, fx_spot):
+    """Payment dates and full period coupons of the unpaid periods of a TRS
+    funding leg, unsigned."""
+
+    payment_dts = []
+    amounts = []
+
+    for i_pmnt, (notional, start_dt, end_dt, payment_dt) in enumerate(
+        zip(
+            funding_leg.notionals,
+            funding_leg.start_dts,
+            funding_leg.end_dts,
+            funding_leg.payment_dts,
+        )
+    ):
+        if payment_dt <= value_dt:
+            continue
+
+        amount = (
+            notional
+            * funding_leg.fixed_rate
+            * get_year_fraction(funding_leg.dc_type, start_dt, end_dt)
+        )
+
+        if isinstance(funding_leg, CrossBorderFixedFundingLeg):
+            amount *= get_trs_fx_spot(
+                funding_leg.funding_ccy,
+                funding_leg.ccy_pair,
+                value_dt,
+                funding_leg.fx_fixing_dts[i_pmnt],
+                funding_leg.fx_fixing,
+                fx_spot,
+            )
+
+        payment_dts.append(payment_dt)
+        amounts.append(amount)
+
+    return payment_dts, np.array(amounts)
+
+
+###############################################################################
+
+
+def _concat_chunks(chunks: list) -> dict:
+    if len(chunks) == 1:
+        return chunks[0]
+
+    return {
+        name: np.concatenate([chunk[name] for chunk in chunks])
+        for name in CashflowLadder.COLUMNS
+    }
+
+
+###############################################################################
+
+__all__ = ["CashflowLadder"]
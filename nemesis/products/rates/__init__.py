@@ -1,9 +1,13 @@
+from .basis_swap import *
 from .curve_builder import *
 from .deposit import *
 from .fra import *
 from .ir_curve import *
 from .ir_future import *
 from .ir_swap import *
+from .multi_curve import *
 from .ql_curve import *
 from .swap_fixed_leg import *
 from .swap_float_leg import *
+from .swap_portfolio import *
+from .swap_rate_surface import *
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from ...market.curves.discount_curve import DiscountCurve
+from ...market.indices.interest_rate_index import (
+    FixingSource,
+    InterestRateIndex,
+)
+from ...utils.calendar import (
+    BusDayAdjustTypes,
+    Calendar,
+    CalendarTypes,
+    DateGenRuleTypes,
+)
+from ...utils.date import Date
+from ...utils.day_count import DayCountTypes
+from ...utils.error import FinError
+from ...utils.frequency import FrequencyTypes
+from ...utils.global_types import SwapTypes
+from ...utils.helpers import label_to_string
+from ...utils.math import ONE_MILLION
+from .swap_float_leg import FloatRateConvention, SwapFloatLeg
+
+
+###############################################################################
+
+
+class InterestRateBasisSwap:
+    """Class for managing floating-vs-floating single currency basis swaps,
+    such as 3M vs 6M BBSW or IBOR vs OIS. Each leg has its own index and
+    schedule and is projected from its own curve, while both legs are
+    discounted on the same curve.
+
+    The basis spread is quoted on leg 1 and is held in the spread of its
+    float rate convention."""
+
+    def __init__(
+        self,
+        effective_dt: Date,
+        term_dt_or_tenor: Date | str,
+        leg_type_1: SwapTypes,
+        rate_index_1: InterestRateIndex,
+        freq_type_1: FrequencyTypes,
+        dc_type_1: DayCountTypes,
+        rate_index_2: InterestRateIndex,
+        freq_type_2: FrequencyTypes,
+        dc_type_2: DayCountTypes,
+        float_convention_1: FloatRateConvention | None = None,
+        float_convention_2: FloatRateConvention | None = None,
+        notional: float = ONE_MILLION,
+        payment_lag: int = 0,
+        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
+        dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
+        end_of_month: bool = False,
+    ):
+        """Create a basis swap. Leg 2 has the opposite direction to leg 1."""
+
+        if rate_index_1 is None or rate_index_2 is None:
+            raise FinError("rate_index is required on both legs")
+
+        if isinstance(term_dt_or_tenor, Date):
+            self.termination_dt = term_dt_or_tenor
+        else:
+            self.termination_dt = effective_dt.add_tenor(term_dt_or_tenor)
+
+        calendar = Calendar(cal_type)
+        self.maturity_dt = calendar.adjust(self.termination_dt, bd_type)
+
+        if effective_dt > self.maturity_dt:
+            raise FinError("Effective date after maturity date")
+
+        self.effective_dt = effective_dt
+        self.notional = notional
+
+        if leg_type_1 == SwapTypes.PAY:
+            leg_type_2 = SwapTypes.RECEIVE
+        else:
+            leg_type_2 = SwapTypes.PAY
+
+        principal = 0.0
+
+        self.float_leg_1 = SwapFloatLeg(
+            effective_dt,
+            self.termination_dt,
+            leg_type_1,
+            freq_type_1,
+            dc_type_1,
+            rate_index_1,
+            float_convention_1,
+            notional,
+            principal,
+            payment_lag,
+            cal_type,
+            bd_type,
+            dg_type,
+            end_of_month,
+        )
+
+        self.float_leg_2 = SwapFloatLeg(
+            effective_dt,
+            self.termination_dt,
+            leg_type_2,
+            freq_type_2,
+            dc_type_2,
+            rate_index_2,
+            float_convention_2,
+            notional,
+            principal,
+            payment_lag,
+            cal_type,
+            bd_type,
+            dg_type,
+            end_of_month,
+        )
+
+    ###########################################################################
+
+    @property
+    def spread(self) -> float:
+        """Basis spread paid on leg 1."""
+        return self.float_leg_1.float_convention.spread
+
+    ###########################################################################
+
+    @property
+    def bootstrap_pillar_dt(self) -> Date:
+        return max(
+            self.float_leg_1.bootstrap_pillar_dt,
+            self.float_leg_2.bootstrap_pillar_dt,
+        )
+
+    ###########################################################################
+
+    def value(
+        self,
+        value_dt: Date,
+        discount_curve: DiscountCurve,
+        projection_curve_1: DiscountCurve | None = None,
+        projection_curve_2: DiscountCurve | None = None,
+        fixing_source: FixingSource | None = None,
+        pv_only: bool = True,
+    ):
+        """Value the basis swap.
+
+        Args:
+            discount_curve: Curve for discounting both legs.
+            projection_curve_1: Curve projecting the leg 1 index. Falls back
+                to discount_curve.
+            projection_curve_2: Curve projecting the leg 2 index. Falls back
+                to discount_curve.
+            fixing_source: Source for historical fixings.
+        """
+
+        if discount_curve is None:
+            raise FinError("Discount curve is None")
+        if projection_curve_1 is None:
+            projection_curve_1 = discount_curve
+        if projection_curve_2 is None:
+            projection_curve_2 = discount_curve
+
+        leg_value_1 = self.float_leg_1.value(
+            value_dt,
+            discount_curve,
+            projection_curve=projection_curve_1,
+            fixing_source=fixing_source,
+            pv_only=pv_only,
+        )
+
+        leg_value_2 = self.float_leg_2.value(
+            value_dt,
+            discount_curve,
+            projection_curve=projection_curve_2,
+            fixing_source=fixing_source,
+            pv_only=pv_only,
+        )
+
+        if pv_only:
+            return leg_value_1 + leg_value_2
+        else:
+            import pandas as pd
+            value = leg_value_1[0] + leg_value_2[0]
+            cashflow_report = pd.concat(
+                [leg_value_1[1], leg_value_2[1]], ignore_index=True
+            )
+            return value, cashflow_report
+
+    ###########################################################################
+
+    def print_payments(self):
+        self.float_leg_1.print_payments()
+        self.float_leg_2.print_payments()
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += self.float_leg_1.__repr__()
+        s += "\n"
+        s += self.float_leg_2.__repr__()
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        print(self)
+
+
+###############################################################################
@@ -17,9 +17,11 @@ from ...utils.day_count import DayCountTypes
 from ...utils.frequency import FrequencyTypes
 from ...utils.global_types import CompoundingTypes, SwapTypes
 from ...utils.math import ONE_MILLION
+from .basis_swap import InterestRateBasisSwap
 from .deposit import InterestRateDeposit
 from .ir_curve import InterestRateCurve
 from .ir_swap import InterestRateSwap
+from .multi_curve import CurveSpec, MultiCurveCalibrator
 from .swap_float_leg import FloatRateConvention, ResetCompoundedFloatRateConvention
 
 
@@ -68,6 +70,58 @@ class SwapConvention:
 ###############################################################################
 
 
+def _build_deposits(
+    settle_dt: Date,
+    conv: DepositConvention,
+    deposit_df: pd.DataFrame,
+) -> list[InterestRateDeposit]:
+    """Deposits settling on settle_dt, one per row of a Tenor/Rate frame."""
+    return [
+        InterestRateDeposit(
+            effective_dt=settle_dt,
+            maturity_dt_or_tenor=row["Tenor"],
+            deposit_rate=row["Rate"],
+            dc_type=conv.dc_type,
+            notional=conv.notional,
+            cal_type=conv.cal_type,
+            bd_type=conv.bd_type,
+        )
+        for _, row in deposit_df.iterrows()
+    ]
+
+
+def _build_swaps(
+    settle_dt: Date,
+    conv: SwapConvention,
+    swap_df: pd.DataFrame,
+) -> list[InterestRateSwap]:
+    """Swaps starting on settle_dt, one per row of a Tenor/Rate frame."""
+    return [
+        InterestRateSwap(
+            effective_dt=settle_dt,
+            term_dt_or_tenor=row["Tenor"],
+            fixed_leg_type=conv.fixed_leg_type,
+            fixed_cpn=row["Rate"],
+            fixed_freq_type=conv.fixed_freq_type,
+            fixed_dc_type=conv.fixed_dc_type,
+            float_freq_type=conv.float_freq_type,
+            float_dc_type=conv.float_dc_type,
+            rate_index=conv.rate_index,
+            float_convention=conv.float_convention,
+            notional=conv.notional,
+            payment_lag=conv.payment_lag,
+            cal_type=conv.cal_type,
+            bd_type=conv.bd_type,
+            dg_type=conv.dg_type,
+            end_of_month=conv.end_of_month,
+        )
+        for _, row in swap_df.iterrows()
+    ]
+
+
+###############################################################################
+
+
 @dataclass(kw_only=True)
 class CurveBuildConfig:
     """Full configuration for building an :class:`InterestRateCurve`.
@@ -138,45 +192,12 @@ class CurveBuildConfig:
         # ----- deposits -------------------------------------------------------
         deposits: list[InterestRateDeposit] = []
         if self.deposit_convention is not None and deposit_df is not None:
-            dc = self.deposit_convention
-            deposits = [
-                InterestRateDeposit(
-                    effective_dt=settle_dt,
-                    maturity_dt_or_tenor=row["Tenor"],
-                    deposit_rate=row["Rate"],
-                    dc_type=dc.dc_type,
-                    notional=dc.notional,
-                    cal_type=dc.cal_type,
-                    bd_type=dc.bd_type,
-                )
-                for _, row in deposit_df.iterrows()
-            ]
+            deposits = _build_deposits(settle_dt, self.deposit_convention, deposit_df)
 
         # ----- swaps ----------------------------------------------------------
         swaps: list[InterestRateSwap] = []
         for conv in self.swap_conventions:
-            group_df = swap_df.iloc[conv.row_range]
-            for _, row in group_df.iterrows():
-                swaps.append(
-                    InterestRateSwap(
-                        effective_dt=settle_dt,
-                        term_dt_or_tenor=row["Tenor"],
-                        fixed_leg_type=conv.fixed_leg_type,
-                        fixed_cpn=row["Rate"],
-                        fixed_freq_type=conv.fixed_freq_type,
-                        fixed_dc_type=conv.fixed_dc_type,
-                        float_freq_type=conv.float_freq_type,
-                        float_dc_type=conv.float_dc_type,
-                        rate_index=conv.rate_index,
-                        float_convention=conv.float_convention,
-                        notional=conv.notional,
-                        payment_lag=conv.payment_lag,
-                        cal_type=conv.cal_type,
-                        bd_type=conv.bd_type,
-                        dg_type=conv.dg_type,
-                        end_of_month=conv.end_of_month,
-                    )
-                )
+            swaps += _build_swaps(settle_dt, conv, swap_df.iloc[conv.row_range])
 
         return InterestRateCurve(
             value_dt,
@@ -355,3 +376,158 @@ class BBSW3MConfig(CurveBuildConfig):
             dc_type=DayCountTypes.ACT_365F,
             currency="AUD",
         )
+
+
+class BBSW3M6MConfig:
+    """Joint calibration of the AUD BBSW 3M and BBSW 6M curves from the
+    market data of the ``bbsw3m_curve_basis_data`` workbooks.
+
+    Conventions
+    -----------
+    - Calendar: AUSTRALIA, settlement T+1 business day, end-of-month
+    - BBSW 3M curve: 3M deposit and the short swaps, quarterly fixed ACT/365F
+      vs 3M BBSW, plus the 3M/6M basis swaps, 3M BBSW + basis vs 6M BBSW
+    - BBSW 6M curve: the long swaps, semi-annual fixed ACT/365F vs 6M BBSW
+    - Discounting on the BBSW 3M curve, as in BBSW3MConfig
+
+    The 6M curve has no pillar before the first long swap so its zero rate is
+    flat up to that tenor.
+    The curves are solved together by :class:`MultiCurveCalibrator` since the
+    long end of the 3M curve is only known through the basis to 6M.
+    """
+
+    def __init__(self, notional: float = ONE_MILLION):
+        self.index_3m = InterestRateIndex(
+            cal_type=CalendarTypes.AUSTRALIA,
+            fixing_lag=1,
+            spot_lag=1,
+            tenor="3M",
+        )
+        self.index_6m = InterestRateIndex(
+            cal_type=CalendarTypes.AUSTRALIA,
+            fixing_lag=1,
+            spot_lag=1,
+            tenor="6M",
+        )
+        _shared = dict(
+            fixed_leg_type=SwapTypes.PAY,
+            fixed_dc_type=DayCountTypes.ACT_365F,
+            float_dc_type=DayCountTypes.ACT_365F,
+            cal_type=CalendarTypes.AUSTRALIA,
+            bd_type=BusDayAdjustTypes.MODIFIED_FOLLOWING,
+            dg_type=DateGenRuleTypes.BACKWARD,
+            float_convention=FloatRateConvention(multiplier=1.0, spread=0.0),
+            notional=notional,
+            end_of_month=True,
+        )
+        self.short_swap_convention = SwapConvention(
+            **_shared,
+            rate_index=self.index_3m,
+            fixed_freq_type=FrequencyTypes.QUARTERLY,
+            float_freq_type=FrequencyTypes.QUARTERLY,
+        )
+        self.long_swap_convention = SwapConvention(
+            **_shared,
+            rate_index=self.index_6m,
+            fixed_freq_type=FrequencyTypes.SEMI_ANNUAL,
+            float_freq_type=FrequencyTypes.SEMI_ANNUAL,
+        )
+        self.deposit_convention = DepositConvention(
+            dc_type=DayCountTypes.ACT_365F,
+            cal_type=CalendarTypes.AUSTRALIA,
+            bd_type=BusDayAdjustTypes.MODIFIED_FOLLOWING,
+            notional=notional,
+        )
+        self.settle_lag = 1
+        self.cal_type = CalendarTypes.AUSTRALIA
+        self.interp_type = InterpTypes.LINEAR_ZERO_RATES
+        self.dc_type = DayCountTypes.ACT_365F
+        self.currency = "AUD"
+
+    # ------------------------------------------------------------------
+
+    def build(
+        self,
+        value_dt: Date,
+        data_path: str | None = None,
+        *,
+        deposit_df: pd.DataFrame | None = None,
+        short_swap_df: pd.DataFrame | None = None,
+        long_swap_df: pd.DataFrame | None = None,
+        basis_df: pd.DataFrame | None = None,
+    ) -> MultiCurveCalibrator:
+        """Calibrate the ``"BBSW3M"`` and ``"BBSW6M"`` curves.
+
+        Either supply ``data_path`` pointing to an Excel workbook with
+        ``"deposit"``, ``"short_swap"``, ``"long_swap"`` and ``"basis"``
+        sheets, or pass the DataFrames directly. All of them must have
+        ``"Tenor"`` and ``"Rate"`` columns, the basis rate being the spread
+        on the 3M leg.
+        """
+        if data_path is not None:
+            deposit_df = pd.read_excel(data_path, sheet_name="deposit")
+            short_swap_df = pd.read_excel(data_path, sheet_name="short_swap")
+            long_swap_df = pd.read_excel(data_path, sheet_name="long_swap")
+            basis_df = pd.read_excel(data_path, sheet_name="basis")
+
+        if short_swap_df is None or long_swap_df is None or basis_df is None:
+            raise ValueError(
+                "short_swap_df, long_swap_df and basis_df must be provided "
+                "if data_path is None"
+            )
+
+        cal = Calendar(self.cal_type)
+        settle_dt = cal.add_business_days(value_dt, self.settle_lag)
+
+        deposits: list[InterestRateDeposit] = []
+        if deposit_df is not None:
+            deposits = _build_deposits(settle_dt, self.deposit_convention, deposit_df)
+
+        short_swaps = _build_swaps(settle_dt, self.short_swap_convention, short_swap_df)
+        long_swaps = _build_swaps(settle_dt, self.long_swap_convention, long_swap_df)
+
+        conv_3m = self.short_swap_convention
+        conv_6m = self.long_swap_convention
+        basis_swaps = [
+            InterestRateBasisSwap(
+                effective_dt=settle_dt,
+                term_dt_or_tenor=row["Tenor"],
+                leg_type_1=SwapTypes.RECEIVE,
+                rate_index_1=self.index_3m,
+                freq_type_1=conv_3m.float_freq_type,
+                dc_type_1=conv_3m.float_dc_type,
+                rate_index_2=self.index_6m,
+                freq_type_2=conv_6m.float_freq_type,
+                dc_type_2=conv_6m.float_dc_type,
+                float_convention_1=FloatRateConvention(
+                    multiplier=1.0, spread=row["Rate"]
+                ),
+                float_convention_2=FloatRateConvention(multiplier=1.0, spread=0.0),
+                notional=conv_3m.notional,
+                cal_type=conv_3m.cal_type,
+                bd_type=conv_3m.bd_type,
+                dg_type=conv_3m.dg_type,
+                end_of_month=conv_3m.end_of_month,
+            )
+            for _, row in basis_df.iterrows()
+        ]
+
+        return MultiCurveCalibrator(
+            value_dt,
+            [
+                CurveSpec(
+                    name="BBSW3M",
+                    instruments=deposits + short_swaps + basis_swaps,
+                    rate_index=self.index_3m,
+                    interp_type=self.interp_type,
+                ),
+                CurveSpec(
+                    name="BBSW6M",
+                    instruments=long_swaps,
+                    rate_index=self.index_6m,
+                    interp_type=self.interp_type,
+                ),
+            ],
+            discount_curve_name="BBSW3M",
+            dc_type=self.dc_type,
+        )
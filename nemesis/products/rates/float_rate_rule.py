@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -29,6 +30,10 @@ class FloatRateRule:
     def bootstrap_pillar_dt(self, leg: SwapFloatLeg) -> Date:
         return leg.payment_dts[-1]
 
+    def build_period_cache(self, leg: SwapFloatLeg) -> dict | None:
+        """Per-period data the rule keeps on the leg. Plain rates need none."""
+        return None
+
     def period_rate(
         self,
         leg: SwapFloatLeg,
@@ -49,6 +54,40 @@ class FloatRateRule:
             fixing_source,
         ) + self.convention.spread
 
+    def period_rates(
+        self,
+        leg: SwapFloatLeg,
+        value_dt: Date,
+        first_period: int = 0,
+        projection_curve: DiscountCurve | None = None,
+        fixing_source: FixingSource | None = None,
+    ) -> np.ndarray:
+        """Full coupon rates of the leg periods from first_period onwards,
+        projected in one batch through the index."""
+        return leg.rate_index.period_rates(
+            value_dt,
+            leg.reset_dts[first_period:],
+            leg.start_accrued_dts[first_period:],
+            leg.end_accrued_dts[first_period:],
+            projection_curve,
+            self.convention.multiplier,
+            fixing_source,
+            fixing_dts=leg.fixing_dts[first_period:],
+        ) + self.convention.spread
+
+
+@dataclass(frozen=True)
+class _SubPeriods:
+    """Dates and accrual fractions of the reset sub-periods of one accrual
+    period. These only depend on the leg so are built once per leg."""
+
+    schedule_dts: list[Date]
+    fixing_dts: list[Date]
+    rate_start_dts: list[Date]
+    rate_end_dts: list[Date]
+    index_year_fracs: np.ndarray
+    dcfs: np.ndarray
+
 
 class ResetCompoundedFloatRateRule(FloatRateRule):
     def __init__(self, convention: ResetCompoundedFloatRateConvention):
@@ -58,13 +97,23 @@ class ResetCompoundedFloatRateRule(FloatRateRule):
     def reset_convention(self) -> ResetCompoundedFloatRateConvention:
         return self.convention
 
+    def build_period_cache(self, leg: SwapFloatLeg) -> dict:
+        """Sub-periods of every accrual period of the leg keyed by the
+        serials of the period start and end dates."""
+        return {
+            (start_dt.excel_dt, end_dt.excel_dt): self._build_sub_periods(
+                leg, start_dt, end_dt
+            )
+            for start_dt, end_dt in zip(leg.start_accrued_dts, leg.end_accrued_dts)
+        }
+
     def bootstrap_pillar_dt(self, leg: SwapFloatLeg) -> Date:
         if self.reset_convention.reset_dg_type != DateGenRuleTypes.FORWARD_OVERSHOOT:
             return super().bootstrap_pillar_dt(leg)
 
         last_start = leg.start_accrued_dts[-1]
         last_end = leg.end_accrued_dts[-1]
-        sub_dts = self._build_sub_period_schedule(leg, last_start, last_end)
+        sub_dts = self._sub_periods(leg, last_start, last_end).schedule_dts
         return sub_dts[-1]
 
     def period_rate(
@@ -91,6 +140,47 @@ class ResetCompoundedFloatRateRule(FloatRateRule):
 
         return self._compound(sub_rates, sub_dcfs)
 
+    def period_rates(
+        self,
+        leg: SwapFloatLeg,
+        value_dt: Date,
+        first_period: int = 0,
+        projection_curve: DiscountCurve | None = None,
+        fixing_source: FixingSource | None = None,
+    ) -> np.ndarray:
+        """Full coupon rates of the leg periods from first_period onwards.
+        The sub-period rates of all periods are projected in one batch and
+        then compounded period by period."""
+        subs = [
+            self._sub_periods(leg, leg.start_accrued_dts[i], leg.end_accrued_dts[i])
+            for i in range(first_period, len(leg.payment_dts))
+        ]
+
+        sub_rates = leg.rate_index.period_rates(
+            value_dt,
+            [dt for sub in subs for dt in sub.schedule_dts[:-1]],
+            [dt for sub in subs for dt in sub.rate_start_dts],
+            [dt for sub in subs for dt in sub.rate_end_dts],
+            projection_curve,
+            self.convention.multiplier,
+            fixing_source,
+            fixing_dts=[dt for sub in subs for dt in sub.fixing_dts],
+            year_fracs=np.concatenate([sub.index_year_fracs for sub in subs]),
+        )
+
+        rates = np.zeros(len(subs))
+        i_sub = 0
+        for i, sub in enumerate(subs):
+            num_subs = len(sub.dcfs)
+            period_sub_rates = sub_rates[i_sub:i_sub + num_subs]
+            if num_subs == 1:
+                rates[i] = period_sub_rates[0] + self.convention.spread
+            else:
+                rates[i] = self._compound(period_sub_rates, sub.dcfs)
+            i_sub += num_subs
+
+        return rates
+
     def _build_sub_period_schedule(
         self,
         leg: SwapFloatLeg,
@@ -109,45 +199,92 @@ class ResetCompoundedFloatRateRule(FloatRateRule):
         )
         return sch.adjusted_dts
 
-    def _compute_sub_period_rates(
+    def _build_sub_periods(
         self,
         leg: SwapFloatLeg,
-        value_dt: Date,
         start_dt: Date,
         end_dt: Date,
-        projection_curve: DiscountCurve | None = None,
-        fixing_source: FixingSource | None = None,
-    ) -> tuple[np.ndarray, np.ndarray]:
-        """Compute index-driven rates and dcfs for each sub-period."""
+    ) -> _SubPeriods:
+        """Build the sub-period fixing and index dates and the accrual
+        fractions of one accrual period."""
 
         sub_dts = self._build_sub_period_schedule(leg, start_dt, end_dt)
+        rate_index = leg.rate_index
         day_counter = DayCount(leg.dc_type)
-        sub_rates = []
+        fixing_dts = []
+        rate_start_dts = []
+        rate_end_dts = []
+        index_year_fracs = []
         sub_dcfs = []
 
         for j in range(len(sub_dts) - 1):
             reset_dt = sub_dts[j]
-            fixing_dt = leg.rate_index.calendar.add_business_days(
-                reset_dt, -leg.rate_index.fixing_lag
+            fixing_dt = rate_index.calendar.add_business_days(
+                reset_dt, -rate_index.fixing_lag
             )
-            rate_start_dt = fixing_dt.add_days(leg.rate_index.spot_lag)
-            rate_end_dt = rate_start_dt.add_tenor(leg.rate_index.tenor)
+            rate_start_dt = fixing_dt.add_days(rate_index.spot_lag)
+            rate_end_dt = rate_start_dt.add_tenor(rate_index.tenor)
             weight_end_dt = min(sub_dts[j + 1], end_dt)
-            dcf = day_counter.year_frac(reset_dt, weight_end_dt)[0]
-            sub_rates.append(
-                leg.rate_index.period_rate(
-                    value_dt,
-                    reset_dt,
-                    rate_start_dt,
-                    rate_end_dt,
-                    projection_curve,
-                    self.convention.multiplier,
-                    fixing_source,
-                )
+
+            fixing_dts.append(fixing_dt)
+            rate_start_dts.append(rate_start_dt)
+            rate_end_dts.append(rate_end_dt)
+            index_year_fracs.append(
+                rate_index.day_count.year_frac(rate_start_dt, rate_end_dt)[0]
             )
-            sub_dcfs.append(dcf)
+            sub_dcfs.append(day_counter.year_frac(reset_dt, weight_end_dt)[0])
+
+        return _SubPeriods(
+            schedule_dts=sub_dts,
+            fixing_dts=fixing_dts,
+            rate_start_dts=rate_start_dts,
+            rate_end_dts=rate_end_dts,
+            index_year_fracs=np.array(index_year_fracs),
+            dcfs=np.array(sub_dcfs),
+        )
+
+    def _sub_periods(
+        self,
+        leg: SwapFloatLeg,
+        start_dt: Date,
+        end_dt: Date,
+    ) -> _SubPeriods:
+        """Sub-periods of an accrual period from the leg cache, built on the
+        fly for periods that are not one of the leg's own."""
+
+        cache = getattr(leg, "_rate_rule_cache", None)
+        if cache is not None:
+            sub = cache.get((start_dt.excel_dt, end_dt.excel_dt))
+            if sub is not None:
+                return sub
+
+        return self._build_sub_periods(leg, start_dt, end_dt)
+
+    def _compute_sub_period_rates(
+        self,
+        leg: SwapFloatLeg,
+        value_dt: Date,
+        start_dt: Date,
+        end_dt: Date,
+        projection_curve: DiscountCurve | None = None,
+        fixing_source: FixingSource | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Compute index-driven rates and dcfs for each sub-period."""
+
+        sub = self._sub_periods(leg, start_dt, end_dt)
+        sub_rates = leg.rate_index.period_rates(
+            value_dt,
+            sub.schedule_dts[:-1],
+            sub.rate_start_dts,
+            sub.rate_end_dts,
+            projection_curve,
+            self.convention.multiplier,
+            fixing_source,
+            fixing_dts=sub.fixing_dts,
+            year_fracs=sub.index_year_fracs,
+        )
 
-        return np.array(sub_rates), np.array(sub_dcfs)
+        return sub_rates, sub.dcfs
 
     def _compound(self, sub_rates: np.ndarray, sub_dcfs: np.ndarray) -> float:
         """Apply compounding to sub-period rates and return full coupon rate."""
@@ -175,3 +312,38 @@ class ResetCompoundedFloatRateRule(FloatRateRule):
             return np.mean(sub_rates) + spread
 
         raise FinError(f"Unsupported compounding type: {compounding_type}")
+
+    def compound_periods(
+        self,
+        sub_rates: np.ndarray,
+        sub_dcfs: np.ndarray,
+        offsets: np.ndarray,
+    ) -> np.ndarray:
+        """Full coupon rates of many periods whose sub-periods are stored
+        one after the other, each period starting at its offset. This is
+        _compound applied to every period at once, with single sub-period
+        periods taking their rate plus spread as in period_rates."""
+
+        compounding_type = self.reset_convention.compounding_type
+        spread = self.convention.spread
+        num_subs = np.diff(np.append(offsets, len(sub_rates)))
+        total_dcfs = np.add.reduceat(sub_dcfs, offsets)
+
+        if compounding_type == CompoundingTypes.EXCLUDE_SPREAD:
+            growths = np.multiply.reduceat(sub_rates * sub_dcfs + 1.0, offsets)
+            rates = (growths - 1.0) / total_dcfs + spread
+        elif compounding_type == CompoundingTypes.INCLUDE_SPREAD:
+            growths = np.multiply.reduceat(
+                (sub_rates + spread) * sub_dcfs + 1.0, offsets
+            )
+            rates = (growths - 1.0) / total_dcfs
+        elif compounding_type == CompoundingTypes.SIMPLE:
+            rates = np.add.reduceat(sub_rates * sub_dcfs, offsets) / total_dcfs + spread
+        elif compounding_type == CompoundingTypes.AVERAGE:
+            rates = np.add.reduceat(sub_rates, offsets) / num_subs + spread
+        else:
+            raise FinError(f"Unsupported compounding type: {compounding_type}")
+
+        single = num_subs == 1
+        rates[single] = sub_rates[offsets[single]] + spread
+        return rates
@@ -169,6 +169,9 @@ class InterestRateCurve(DiscountCurve):
     def _build_curve(self):
         """Build curve based on interpolation."""
 
+        self._quote_jacobian = None
+        self._df_quote_jacobian_memo = None
+
         self._build_curve_using_1d_solver()
         # self._build_curve_linear_swap_rate_interpolation()
 
@@ -593,6 +596,116 @@ class InterestRateCurve(DiscountCurve):
 
     ###############################################################################
 
+    def _quote(self, index):
+        """The quote of a calibration instrument, counting the deposits, then
+        the FRAs and then the swaps, which is also the order of the pillars
+        after time zero."""
+
+        num_depos = len(self.used_deposits)
+        num_fras = len(self.used_fras)
+
+        if index < num_depos:
+            return self.used_deposits[index].deposit_rate
+        elif index < num_depos + num_fras:
+            return self.used_fras[index - num_depos].fra_rate
+        else:
+            return self.used_swaps[index - num_depos - num_fras].fixed_leg.cpn
+
+    ###############################################################################
+
+    def _set_quote(self, index, quote):
+        """Set the quote of a calibration instrument in place. The curve
+        must be rebuilt to reflect it."""
+
+        num_depos = len(self.used_deposits)
+        num_fras = len(self.used_fras)
+
+        if index < num_depos:
+            self.used_deposits[index].deposit_rate = quote
+        elif index < num_depos + num_fras:
+            self.used_fras[index - num_depos].fra_rate = quote
+        else:
+            # the leg is valued from its coupon, the payments are only reported
+            self.used_swaps[index - num_depos - num_fras].fixed_leg.cpn = quote
+
+    ###############################################################################
+
+    def quote_jacobian(self, bump: float = 0.0001):
+        """Jacobian of the pillar discount factors to the quotes of the
+        deposits, FRAs and swaps, with one row per pillar, time zero
+        included, and one column per instrument. Each quote is bumped up and
+        down in turn and the curve rebuilt in place, after which the curve
+        is rebuilt from the original quotes. It is cached until the curve is
+        rebuilt."""
+
+        if self._quote_jacobian is not None:
+            return self._quote_jacobian
+
+        num_quotes = len(self._times) - 1
+        jacobian = np.zeros((len(self._times), num_quotes))
+
+        try:
+            for k in range(num_quotes):
+                quote = self._quote(k)
+
+                bumped_dfs = []
+                try:
+                    for shift in (bump, -bump):
+                        self._set_quote(k, quote + shift)
+                        self._build_curve()
+                        bumped_dfs.append(np.array(self._dfs))
+                finally:
+                    self._set_quote(k, quote)
+
+                jacobian[:, k] = (bumped_dfs[0] - bumped_dfs[1]) / (2.0 * bump)
+        finally:
+            self._build_curve()
+
+        self._quote_jacobian = jacobian
+
+        return self._quote_jacobian
+
+    ###############################################################################
+
+    def df_quote_jacobian(self, t: np.ndarray, bump: float = 0.0001):
+        """Jacobian of the discount factors at the times t to the quotes of
+        the calibration instruments, with one row per time and one column
+        per instrument. The pillar Jacobian is carried to the times through
+        the interpolation by moving the pillar discount factors along each
+        of its columns. The last result is kept as it is typically asked
+        for repeatedly on the same grid."""
+
+        t = np.asarray(t, dtype=float)
+
+        if self._df_quote_jacobian_memo is not None:
+            memo_t, memo_jacobian = self._df_quote_jacobian_memo
+            if np.array_equal(memo_t, t):
+                return memo_jacobian
+
+        pillar_jacobian = self.quote_jacobian()
+        dfs = self._dfs
+
+        jacobian = np.zeros((len(t), pillar_jacobian.shape[1]))
+
+        try:
+            for k in range(pillar_jacobian.shape[1]):
+                bumped_dfs = []
+                for shift in (bump, -bump):
+                    self._dfs = dfs + shift * pillar_jacobian[:, k]
+                    self._interpolator.fit(self._times, self._dfs)
+                    bumped_dfs.append(self.df_t(t))
+
+                jacobian[:, k] = (bumped_dfs[0] - bumped_dfs[1]) / (2.0 * bump)
+        finally:
+            self._dfs = dfs
+            self._interpolator.fit(self._times, self._dfs)
+
+        self._df_quote_jacobian_memo = (t.copy(), jacobian)
+
+        return jacobian
+
+    ###############################################################################
+
     # def overnight_rate(self,
     #                   settle_dt: Date,
     #                   start_dt: Date,
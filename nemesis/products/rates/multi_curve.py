@@ -0,0 +1,696 @@
+from __future__ import annotations
+
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+from ...market.curves.discount_curve import DiscountCurve
+from ...market.curves.interpolator import InterpTypes
+from ...market.indices.interest_rate_index import (
+    FixingSource,
+    InterestRateIndex,
+    OvernightIndex,
+)
+from ...utils.date import Date
+from ...utils.day_count import DayCountTypes
+from ...utils.error import FinError
+from ...utils.global_types import CompoundingTypes, SwapTypes
+from ...utils.helpers import label_to_string, times_from_dates
+from .basis_swap import InterestRateBasisSwap
+from .deposit import InterestRateDeposit
+from .float_rate_rule import FloatRateRule, ResetCompoundedFloatRateRule
+from .ir_swap import InterestRateSwap
+
+
+MULTI_CURVE_TOL = 1e-10
+
+
+###############################################################################
+
+
+@dataclass(kw_only=True)
+class CurveSpec:
+    """One curve of a multi-curve calibration.
+
+    Each instrument adds a pillar to this curve at its maturity, or at the
+    float leg bootstrap pillar date for swaps. Float legs whose index equals
+    rate_index are projected from this curve. The discount curve of a
+    calibration also has a rate_index if its own index, for example the
+    overnight index of an OIS curve, appears in the instruments."""
+
+    name: Hashable
+    instruments: list
+    rate_index: InterestRateIndex | None = None
+    interp_type: InterpTypes = InterpTypes.LINEAR_ZERO_RATES
+
+
+###############################################################################
+
+
+class _NodeSet:
+    """Distinct dates at which one curve is read, with the day count used for
+    the time from the valuation date as in DiscountCurve.df."""
+
+    def __init__(self, dc_type: DayCountTypes):
+        self.dc_type = dc_type
+        self.index = {}
+        self.dts = []
+        self.dc_types = []
+
+    def add(self, dt: Date, dc_type: DayCountTypes | None) -> int:
+        dc_type = dc_type or self.dc_type
+        key = (dt.excel_dt, dc_type)
+        node = self.index.get(key)
+        if node is None:
+            node = len(self.dts)
+            self.index[key] = node
+            self.dts.append(dt)
+            self.dc_types.append(dc_type)
+        return node
+
+    def times(self, value_dt: Date) -> np.ndarray:
+        times = np.zeros(len(self.dts))
+        for dc_type in set(self.dc_types):
+            idx = [i for i, dc in enumerate(self.dc_types) if dc == dc_type]
+            times[idx] = times_from_dates(
+                [self.dts[i] for i in idx], value_dt, dc_type
+            )
+        return times
+
+
+###############################################################################
+
+
+class MultiCurveCalibrator:
+    """Calibrates a discount curve and one or more projection curves jointly
+    to deposits, fixed-vs-floating swaps and basis swaps.
+
+    The unknowns are the log discount factors at the pillars of all curves.
+    Each curve reads its log discount factor at any time as a fixed linear
+    combination of its pillar values, exactly as the linear zero rate and flat
+    forward interpolation schemes of DiscountCurve do, so these weights are
+    computed once from the instrument dates. Every instrument is flattened
+    into discount flows and index sub-periods on the node times. A Newton
+    step then prices all instruments and their sensitivities to the node log
+    discount factors in a few vectorised passes over the flows, and maps them
+    onto the pillars with the sparse interpolation weights.
+
+    The resulting Jacobian is block structured. Rows of an instrument have
+    entries only in the columns of the curves it references, and the pricing
+    cost of a step grows with the number of flows rather than with the number
+    of curves times the number of instruments. It is kept after calibration
+    for risk."""
+
+    def __init__(
+        self,
+        value_dt: Date,
+        curve_specs: list[CurveSpec],
+        discount_curve_name: Hashable,
+        dc_type: DayCountTypes = DayCountTypes.ACT_365F,
+        fixing_source: FixingSource | None = None,
+        tol: float = MULTI_CURVE_TOL,
+        max_iter: int = 50,
+    ):
+        """Calibrate the curves. Instruments must start on or after value_dt.
+        Periods that fixed before value_dt take their rates from the fixing
+        source."""
+
+        self.value_dt = value_dt
+        self.curve_specs = list(curve_specs)
+        self.discount_curve_name = discount_curve_name
+        self.dc_type = dc_type
+        self.fixing_source = fixing_source
+        self.tol = tol
+        self.max_iter = max_iter
+
+        self._validate_inputs()
+        self._build_pillars()
+        self._build_flows()
+        self._build_interpolation_weights()
+        self._solve()
+
+    ###########################################################################
+
+    def __getitem__(self, name: Hashable) -> DiscountCurve:
+        return self.curves[name]
+
+    ###########################################################################
+
+    def _validate_inputs(self):
+
+        if len(self.curve_specs) == 0:
+            raise FinError("Need at least one curve to calibrate")
+
+        names = [spec.name for spec in self.curve_specs]
+        if len(set(names)) != len(names):
+            raise FinError("Curve names must be unique")
+
+        if self.discount_curve_name not in names:
+            raise FinError("Discount curve is not one of the calibrated curves")
+
+        for spec in self.curve_specs:
+            if spec.interp_type not in (
+                InterpTypes.LINEAR_ZERO_RATES,
+                InterpTypes.FLAT_FWD_RATES,
+            ):
+                raise FinError(
+                    "Multi-curve calibration supports LINEAR_ZERO_RATES and "
+                    "FLAT_FWD_RATES interpolation only"
+                )
+
+            if len(spec.instruments) == 0:
+                raise FinError(f"Curve {spec.name} has no instruments")
+
+            for inst in spec.instruments:
+                if not isinstance(
+                    inst,
+                    (InterestRateDeposit, InterestRateSwap, InterestRateBasisSwap),
+                ):
+                    raise FinError(
+                        "Unsupported calibration instrument " + type(inst).__name__
+                    )
+
+                if inst.effective_dt < self.value_dt:
+                    raise FinError("Calibration instrument starts before value date")
+
+        indices = [
+            spec.rate_index for spec in self.curve_specs if spec.rate_index is not None
+        ]
+        for i, rate_index in enumerate(indices):
+            if rate_index in indices[i + 1:]:
+                raise FinError("Two curves project the same index")
+
+    ###########################################################################
+
+    def _build_pillars(self):
+        """Order the instruments of each curve by pillar date. Row i of the
+        calibration equations is the instrument that sets pillar i."""
+
+        self.instruments = []
+        self.pillar_dts = {}
+        self._curve_pos = {}
+        self._pillar_times = []
+        self._col_offsets = [0]
+
+        for pos, spec in enumerate(self.curve_specs):
+            pillar_dts = [self._pillar_dt(inst) for inst in spec.instruments]
+            pillar_times = np.array(
+                times_from_dates(pillar_dts, self.value_dt, self.dc_type)
+            )
+
+            order = np.argsort(pillar_times, kind="stable")
+            pillar_times = pillar_times[order]
+
+            if pillar_times[0] <= 0.0 or np.any(np.diff(pillar_times) <= 0.0):
+                raise FinError(
+                    f"Instruments of curve {spec.name} must have distinct "
+                    "pillar dates after the value date"
+                )
+
+            self.instruments += [spec.instruments[i] for i in order]
+            self.pillar_dts[spec.name] = [pillar_dts[i] for i in order]
+            self._curve_pos[spec.name] = pos
+            self._pillar_times.append(np.concatenate(([0.0], pillar_times)))
+            self._col_offsets.append(self._col_offsets[-1] + len(order))
+
+        self._row_curves = np.concatenate(
+            [
+                np.full(len(spec.instruments), pos)
+                for pos, spec in enumerate(self.curve_specs)
+            ]
+        )
+
+    ###########################################################################
+
+    @staticmethod
+    def _pillar_dt(inst) -> Date:
+
+        if isinstance(inst, InterestRateDeposit):
+            return inst.maturity_dt
+
+        if isinstance(inst, InterestRateSwap):
+            return inst.float_leg.bootstrap_pillar_dt
+
+        return inst.bootstrap_pillar_dt
+
+    ###########################################################################
+
+    def _projection_pos(self, rate_index: InterestRateIndex) -> int:
+
+        for pos, spec in enumerate(self.curve_specs):
+            if spec.rate_index is not None and spec.rate_index == rate_index:
+                return pos
+
+        raise FinError("No calibrated curve projects the index of a float leg")
+
+    ###########################################################################
+
+    def _build_flows(self):
+        """Flatten the instruments into deposit terms, discounted fixed flows
+        and float periods with their index sub-periods."""
+
+        self._node_sets = [_NodeSet(self.dc_type) for _ in self.curve_specs]
+        disc_pos = self._curve_pos[self.discount_curve_name]
+
+        self._deposits = {"row": [], "start": [], "end": [], "const": []}
+        self._fixed = {"row": [], "node": [], "amount": []}
+        self._periods = {
+            "row": [], "node": [], "factor": [], "spread": [],
+            "scale": [], "compound": [], "num_subs": [],
+        }
+        self._subs = {
+            "start": [], "end": [], "multiplier": [], "year_frac": [],
+            "dcf": [], "weight": [], "spread": [], "fixed_rate": [],
+        }
+
+        for row, inst in enumerate(self.instruments):
+            if isinstance(inst, InterestRateDeposit):
+                nodes = self._node_sets[self._row_curves[row]]
+                self._deposits["row"].append(row)
+                self._deposits["start"].append((self._row_curves[row], nodes.add(inst.effective_dt, None)))
+                self._deposits["end"].append((self._row_curves[row], nodes.add(inst.maturity_dt, None)))
+                self._deposits["const"].append(
+                    np.log(1.0 + inst.deposit_rate * inst.accrual_factor)
+                )
+            elif isinstance(inst, InterestRateSwap):
+                self._add_fixed_leg(row, inst.fixed_leg, inst.notional, disc_pos)
+                self._add_float_leg(row, inst.float_leg, inst.notional, disc_pos)
+            else:
+                self._add_float_leg(row, inst.float_leg_1, inst.notional, disc_pos)
+                self._add_float_leg(row, inst.float_leg_2, inst.notional, disc_pos)
+
+    ###########################################################################
+
+    def _add_fixed_leg(self, row: int, leg, notional: float, disc_pos: int):
+
+        sign = -1.0 if leg.leg_type == SwapTypes.PAY else 1.0
+        nodes = self._node_sets[disc_pos]
+
+        for payment_dt, year_frac in zip(leg.payment_dts, leg.year_fracs):
+            if payment_dt <= self.value_dt:
+                continue
+            self._fixed["row"].append(row)
+            self._fixed["node"].append((disc_pos, nodes.add(payment_dt, leg.dc_type)))
+            self._fixed["amount"].append(
+                sign * year_frac * leg.cpn * leg.notional / notional
+            )
+
+    ###########################################################################
+
+    def _add_float_leg(self, row: int, leg, notional: float, disc_pos: int):
+
+        sign = -1.0 if leg.leg_type == SwapTypes.PAY else 1.0
+        proj_pos = self._projection_pos(leg.rate_index)
+        rate_index = leg.rate_index
+        rule = leg.rate_rule
+        convention = rule.convention
+
+        if type(rule) not in (FloatRateRule, ResetCompoundedFloatRateRule):
+            raise FinError("Unsupported float rate rule " + type(rule).__name__)
+
+        for i, payment_dt in enumerate(leg.payment_dts):
+            if payment_dt <= self.value_dt:
+                continue
+
+            start_dt = leg.start_accrued_dts[i]
+            end_dt = leg.end_accrued_dts[i]
+
+            if type(rule) is FloatRateRule:
+                fixing_dts = [leg.fixing_dts[i]]
+                rate_start_dts = [start_dt]
+                rate_end_dts = [end_dt]
+                year_fracs = [rate_index.day_count.year_frac(start_dt, end_dt)[0]]
+                dcfs = np.ones(1)
+            else:
+                sub = rule._sub_periods(leg, start_dt, end_dt)
+                fixing_dts = sub.fixing_dts
+                rate_start_dts = sub.rate_start_dts
+                rate_end_dts = sub.rate_end_dts
+                year_fracs = sub.index_year_fracs
+                dcfs = sub.dcfs
+
+            num_subs = len(fixing_dts)
+            compounding_type = None
+            if type(rule) is ResetCompoundedFloatRateRule and num_subs > 1:
+                compounding_type = rule.reset_convention.compounding_type
+
+            # A period rate is either a weighted sum of its sub-period rates
+            # or a compounded product of them, plus the spread outside
+            if compounding_type in (
+                CompoundingTypes.EXCLUDE_SPREAD,
+                CompoundingTypes.INCLUDE_SPREAD,
+            ):
+                compound = True
+                weights = np.zeros(num_subs)
+            elif compounding_type == CompoundingTypes.AVERAGE:
+                compound = False
+                weights = np.full(num_subs, 1.0 / num_subs)
+            elif compounding_type is None or compounding_type == CompoundingTypes.SIMPLE:
+                compound = False
+                weights = dcfs / np.sum(dcfs)
+            else:
+                raise FinError(f"Unsupported compounding type: {compounding_type}")
+
+            if compounding_type == CompoundingTypes.INCLUDE_SPREAD:
+                inner_spread = convention.spread
+                outer_spread = 0.0
+            else:
+                inner_spread = 0.0
+                outer_spread = convention.spread
+
+            self._periods["row"].append(row)
+            self._periods["node"].append(
+                (disc_pos, self._node_sets[disc_pos].add(payment_dt, None))
+            )
+            self._periods["factor"].append(
+                sign * leg.year_fracs[i] * leg.notional / notional
+            )
+            self._periods["spread"].append(outer_spread)
+            self._periods["scale"].append(np.sum(dcfs))
+            self._periods["compound"].append(compound)
+            self._periods["num_subs"].append(num_subs)
+
+            nodes = self._node_sets[proj_pos]
+            for j in range(num_subs):
+                self._subs["start"].append(
+                    (proj_pos, nodes.add(rate_start_dts[j], rate_index.dc_type))
+                )
+                self._subs["end"].append(
+                    (proj_pos, nodes.add(rate_end_dts[j], rate_index.dc_type))
+                )
+                self._subs["multiplier"].append(convention.multiplier)
+                self._subs["year_frac"].append(year_fracs[j])
+                self._subs["dcf"].append(dcfs[j])
+                self._subs["weight"].append(weights[j])
+                self._subs["spread"].append(inner_spread)
+                self._subs["fixed_rate"].append(
+                    self._fixed_rate(rate_index, fixing_dts[j], rate_start_dts[j])
+                )
+
+    ###########################################################################
+
+    def _fixed_rate(
+        self, rate_index: InterestRateIndex, fixing_dt: Date, start_dt: Date
+    ) -> float:
+        """Index rate of a sub-period that has already fixed, NaN for rates
+        projected from the curve, following InterestRateIndex.period_rate."""
+
+        if isinstance(rate_index, OvernightIndex):
+            if start_dt <= self.value_dt:
+                raise FinError("Calibration instrument has an in-progress OIS period")
+            return np.nan
+
+        if fixing_dt >= self.value_dt:
+            return np.nan
+
+        if self.fixing_source is None:
+            raise FinError("Require fixing data source")
+
+        fixing = self.fixing_source.get_fixing(fixing_dt, self.value_dt)
+        if fixing is None:
+            raise FinError("Missing fixing for a historical period")
+
+        return fixing
+
+    ###########################################################################
+
+    def _build_interpolation_weights(self):
+        """Sparse map from the pillar log discount factors of all curves to
+        the log discount factors at all nodes, and the flow arrays indexed by
+        global node."""
+
+        node_offsets = [0]
+        blocks = []
+
+        for pos, spec in enumerate(self.curve_specs):
+            node_times = self._node_sets[pos].times(self.value_dt)
+            blocks.append(
+                _log_df_weights(
+                    node_times, self._pillar_times[pos], spec.interp_type
+                )
+            )
+            node_offsets.append(node_offsets[-1] + len(node_times))
+
+        self._weights = sparse.block_diag(blocks, format="csr")
+        self._num_nodes = node_offsets[-1]
+
+        def nodes(pairs):
+            return np.array(
+                [node_offsets[pos] + node for pos, node in pairs], dtype=np.int64
+            )
+
+        self._dep_rows = np.array(self._deposits["row"], dtype=np.int64)
+        self._dep_start = nodes(self._deposits["start"])
+        self._dep_end = nodes(self._deposits["end"])
+        self._dep_const = np.array(self._deposits["const"])
+
+        self._fixed_rows = np.array(self._fixed["row"], dtype=np.int64)
+        self._fixed_nodes = nodes(self._fixed["node"])
+        self._fixed_amounts = np.array(self._fixed["amount"])
+
+        self._period_rows = np.array(self._periods["row"], dtype=np.int64)
+        self._period_nodes = nodes(self._periods["node"])
+        self._period_factors = np.array(self._periods["factor"])
+        self._period_spreads = np.array(self._periods["spread"])
+        self._period_scales = np.array(self._periods["scale"])
+        self._period_compound = np.array(self._periods["compound"], dtype=bool)
+
+        num_subs = np.array(self._periods["num_subs"], dtype=np.int64)
+        self._sub_offsets = np.concatenate(([0], np.cumsum(num_subs)[:-1]))
+        self._sub_periods = np.repeat(np.arange(len(num_subs)), num_subs)
+
+        self._sub_starts = nodes(self._subs["start"])
+        self._sub_ends = nodes(self._subs["end"])
+        self._sub_multipliers = np.array(self._subs["multiplier"])
+        self._sub_year_fracs = np.array(self._subs["year_frac"])
+        self._sub_dcfs = np.array(self._subs["dcf"])
+        self._sub_weights = np.array(self._subs["weight"])
+        self._sub_spreads = np.array(self._subs["spread"])
+        self._sub_fixed_rates = np.array(self._subs["fixed_rate"])
+        self._sub_is_fixed = ~np.isnan(self._sub_fixed_rates)
+
+        del self._deposits, self._fixed, self._periods, self._subs
+
+    ###########################################################################
+
+    def _residuals(self, x: np.ndarray):
+        """Instrument values per unit notional, and deposit log discount
+        factor mismatches, with their Jacobian to the pillar log discount
+        factors."""
+
+        num_rows = len(self.instruments)
+        log_dfs = self._weights @ x
+        dfs = np.exp(log_dfs)
+
+        # Deposits: log df(end) - log df(start) + log(1 + r * tau)
+        res = np.zeros(num_rows)
+        res[self._dep_rows] = (
+            log_dfs[self._dep_end] - log_dfs[self._dep_start] + self._dep_const
+        )
+
+        grad_rows = [self._dep_rows, self._dep_rows]
+        grad_cols = [self._dep_end, self._dep_start]
+        grad_vals = [np.ones(len(self._dep_rows)), -np.ones(len(self._dep_rows))]
+
+        # Fixed flows
+        fixed_pvs = self._fixed_amounts * dfs[self._fixed_nodes]
+        res += np.bincount(self._fixed_rows, fixed_pvs, minlength=num_rows)
+
+        grad_rows.append(self._fixed_rows)
+        grad_cols.append(self._fixed_nodes)
+        grad_vals.append(fixed_pvs)
+
+        # Index sub-period rates and their sensitivity to the start node
+        ratios = np.exp(log_dfs[self._sub_starts] - log_dfs[self._sub_ends])
+        scaled = self._sub_multipliers / self._sub_year_fracs
+        sub_rates = np.where(
+            self._sub_is_fixed, self._sub_fixed_rates, scaled * (ratios - 1.0)
+        )
+        d_rate = np.where(self._sub_is_fixed, 0.0, scaled * ratios)
+
+        # Period rates and their sensitivity to the sub-period rates
+        growth_terms = 1.0 + (sub_rates + self._sub_spreads) * self._sub_dcfs
+        growth = np.exp(np.add.reduceat(np.log(growth_terms), self._sub_offsets))
+        compounded = (growth - 1.0) / self._period_scales
+        averaged = np.add.reduceat(sub_rates * self._sub_weights, self._sub_offsets)
+
+        period_rates = (
+            np.where(self._period_compound, compounded, averaged)
+            + self._period_spreads
+        )
+
+        sub_compound = self._period_compound[self._sub_periods]
+        d_period_rate = np.where(
+            sub_compound,
+            (growth / self._period_scales)[self._sub_periods]
+            * self._sub_dcfs / growth_terms,
+            self._sub_weights,
+        )
+
+        # Float flows
+        payment_dfs = dfs[self._period_nodes]
+        float_pvs = self._period_factors * period_rates * payment_dfs
+        res += np.bincount(self._period_rows, float_pvs, minlength=num_rows)
+
+        grad_rows.append(self._period_rows)
+        grad_cols.append(self._period_nodes)
+        grad_vals.append(float_pvs)
+
+        d_sub = (
+            (self._period_factors * payment_dfs)[self._sub_periods]
+            * d_period_rate
+            * d_rate
+        )
+        sub_rows = self._period_rows[self._sub_periods]
+
+        grad_rows += [sub_rows, sub_rows]
+        grad_cols += [self._sub_starts, self._sub_ends]
+        grad_vals += [d_sub, -d_sub]
+
+        grad = sparse.csr_matrix(
+            (
+                np.concatenate(grad_vals),
+                (np.concatenate(grad_rows), np.concatenate(grad_cols)),
+            ),
+            shape=(num_rows, self._num_nodes),
+        )
+
+        jacobian = (grad @ self._weights).toarray()
+
+        return res, jacobian
+
+    ###########################################################################
+
+    def _solve(self):
+        """Newton iteration on the pillar log discount factors of all curves
+        from flat curves."""
+
+        x = np.zeros(self._col_offsets[-1])
+        num_iter = 0
+
+        for _ in range(self.max_iter + 1):
+            res, jacobian = self._residuals(x)
+            if np.max(np.abs(res)) < self.tol:
+                break
+            x -= np.linalg.solve(jacobian, res)
+            num_iter += 1
+        else:
+            raise FinError("Multi-curve calibration did not converge")
+
+        self.num_iterations = num_iter
+        self.residuals = res
+        self.jacobian = jacobian
+
+        self.curves = {}
+        self.curve_slices = {}
+        for pos, spec in enumerate(self.curve_specs):
+            cols = slice(self._col_offsets[pos], self._col_offsets[pos + 1])
+            self.curve_slices[spec.name] = cols
+            self.curves[spec.name] = DiscountCurve(
+                self.value_dt,
+                self.pillar_dts[spec.name],
+                np.exp(x[cols]),
+                spec.interp_type,
+                self.dc_type,
+            )
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("VALUE DATE", self.value_dt)
+        s += label_to_string("DISCOUNT CURVE", self.discount_curve_name)
+        for spec in self.curve_specs:
+            s += label_to_string(
+                "CURVE " + str(spec.name), len(self.pillar_dts[spec.name])
+            )
+        s += label_to_string("NUM ITERATIONS", self.num_iterations)
+        s += label_to_string("MAX RESIDUAL", np.max(np.abs(self.residuals)))
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        print(self)
+
+
+###############################################################################
+
+
+def _log_df_weights(
+    times: np.ndarray, pillar_times: np.ndarray, interp_type: InterpTypes
+) -> sparse.csr_matrix:
+    """Weights w such that log df(times) = w @ log df(pillar_times[1:]) under
+    the interpolation of DiscountCurve.df_t, including its extrapolation
+    beyond the last pillar. The pillar at time zero has df 1."""
+
+    num_points = len(pillar_times)
+
+    if np.any(times < 0.0):
+        raise FinError("Interpolate times must all be >= 0")
+
+    i = np.minimum(np.searchsorted(pillar_times, times, side="left"), num_points - 1)
+    i[times > pillar_times[i]] = num_points
+
+    rows = []
+    cols = []
+    vals = []
+
+    def add(mask, col, val):
+        rows.append(np.nonzero(mask)[0])
+        cols.append(col[mask])
+        vals.append(val[mask])
+
+    live = times > 0.0
+    inner = live & (i < num_points)
+    beyond = live & (i == num_points)
+
+    lo = np.maximum(i - 1, 0)
+    hi = np.minimum(i, num_points - 1)
+    dt = pillar_times[hi] - pillar_times[lo]
+    dt[dt == 0.0] = 1.0
+    w_lo = (pillar_times[hi] - times) / dt
+    w_hi = (times - pillar_times[lo]) / dt
+
+    # pillar times as divisors, the zero time pillar is never divided by
+    pillar_scales = np.where(pillar_times > 0.0, pillar_times, 1.0)
+
+    if interp_type == InterpTypes.LINEAR_ZERO_RATES:
+        # log df = -t * z(t) with zero rates linear between pillars, flat
+        # before the first pillar and after the last
+        first = inner & (i == 1)
+        middle = inner & (i > 1)
+        last = np.full(len(times), num_points - 1)
+
+        add(first, hi, times / pillar_scales[hi])
+        add(middle, lo, times * w_lo / pillar_scales[lo])
+        add(middle, hi, times * w_hi / pillar_scales[hi])
+        add(beyond, last, times / pillar_scales[last])
+
+    else:
+        # log df linear between pillars, extrapolated on the last segment
+        add(inner, lo, w_lo)
+        add(inner, hi, w_hi)
+
+        prev = np.full(len(times), num_points - 2)
+        last = np.full(len(times), num_points - 1)
+        dt_last = pillar_times[-1] - pillar_times[-2]
+        add(beyond, prev, (pillar_times[-1] - times) / dt_last)
+        add(beyond, last, (times - pillar_times[-2]) / dt_last)
+
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+    vals = np.concatenate(vals)
+
+    # The time zero pillar is fixed at log df 0 so it has no column
+    keep = cols > 0
+
+    return sparse.csr_matrix(
+        (vals[keep], (rows[keep], cols[keep] - 1)),
+        shape=(len(times), num_points - 1),
+    )
+
+
+###############################################################################
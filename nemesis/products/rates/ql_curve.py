@@ -13,7 +13,11 @@ from ...utils.error import FinError
 from ...utils.frequency import FrequencyTypes
 from ...utils.global_vars import g_days_in_year
 from ...utils.helpers import _func_name, check_argument_types, label_to_string
-from ...utils.ql_helper import ql_date_to_date
+from ...utils.ql_helper import (
+    ql_date_to_date,
+    ql_dates_to_serials,
+    ql_discount_factors,
+)
 
 ###############################################################################
 
@@ -113,22 +117,23 @@ class QLCurve(DiscountCurve):
 
     def _build_curve_from_ql(self, value_dt, ql_curve, dc_type, interp_type):
         """Build Curve from a QuantLib curve."""
-        times = []
-        dfs = []
 
         # Extract dates and discount factors from the QuantLib curve
         curve = ql_curve.curve
-        ql_pillar_dts = ql_curve.curve.dates()
-        self.pillar_dts = ql_date_to_date(ql_pillar_dts)
+        ql_pillar_dts = curve.dates()
+        pillar_serials = ql_dates_to_serials(ql_pillar_dts)
 
-        for ql_dt, dt in zip(ql_pillar_dts, self.pillar_dts):
-            t = (dt - value_dt) / g_days_in_year
-            df = curve.discount(ql_dt)
-            times.append(t)
-            dfs.append(df)
+        # Bumped curves share the pillar dates of the base curve so only
+        # convert them to Dates when they have changed
+        cached_serials = getattr(self, "_pillar_serials", None)
+        if cached_serials is None or not np.array_equal(
+            cached_serials, pillar_serials
+        ):
+            self.pillar_dts = ql_date_to_date(ql_pillar_dts)
+            self._pillar_serials = pillar_serials
 
-        self._times = np.array(times)
-        self._dfs = dfs
+        self._times = (pillar_serials - value_dt.excel_dt) / g_days_in_year
+        self._dfs = ql_discount_factors(curve, ql_pillar_dts)
 
         # Fit the interpolator with the extracted times and discount factors
         self._interpolator = Interpolator(interp_type)
@@ -154,14 +159,7 @@ class QLCurve(DiscountCurve):
             self._build_curve_from_ql(self.value_dt, bumped_ql_curve, self.dc_type, self._interp_type)
             return self
         else:
-            return QLCurve(
-                value_dt=self.value_dt,
-                ql_curve=bumped_ql_curve,
-                dc_type=self.dc_type,
-                interp_type=self._interp_type,
-                from_ql=self._from_ql,
-                is_index=self._is_index
-            )
+            return self._from_bumped_ql_curve(bumped_ql_curve)
             # return self.from_bump(self, bump)
 
     ###############################################################################
@@ -174,14 +172,7 @@ class QLCurve(DiscountCurve):
             self._build_curve_from_ql(self.value_dt, bumped_ql_curve, self.dc_type, self._interp_type)
             return self
         else:
-            return QLCurve(
-                value_dt=self.value_dt,
-                ql_curve=bumped_ql_curve,
-                dc_type=self.dc_type,
-                interp_type=self._interp_type,
-                from_ql=self._from_ql,
-                is_index=self._is_index
-            )
+            return self._from_bumped_ql_curve(bumped_ql_curve)
             # return self.from_bump(self, bump)
 
     ###############################################################################
@@ -190,14 +181,19 @@ class QLCurve(DiscountCurve):
     def from_bump(cls, curve, bump):
         """Create a curve by applying a bump to an existing curve."""
         bumped_ql_curve = curve.ql_curve.tweak_parallel(bump)
-        return cls(
-            value_dt=curve.value_dt,
-            ql_curve=bumped_ql_curve,
-            dc_type=curve.dc_type,
-            interp_type=curve._interp_type,
-            from_ql=curve._from_ql,
-            is_index=curve._is_index
+        return curve._from_bumped_ql_curve(bumped_ql_curve)
+
+    ###############################################################################
+
+    def _from_bumped_ql_curve(self, bumped_ql_curve):
+        """Create a new curve on a bumped QuantLib curve. The pillar dates of
+        this curve are reused as only the discount factors change."""
+        bumped_curve = copy.copy(self)
+        bumped_curve.ql_curve = bumped_ql_curve
+        bumped_curve._build_curve_from_ql(
+            self.value_dt, bumped_ql_curve, self.dc_type, self._interp_type
         )
+        return bumped_curve
 
     ###############################################################################
 
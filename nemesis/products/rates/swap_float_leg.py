@@ -133,10 +133,15 @@ class SwapFloatLeg:
         self.start_accrued_dts: list[Date] = []
         self.end_accrued_dts: list[Date] = []
         self.reset_dts: list[Date] = []
+        self.fixing_dts: list[Date] = []
         self.payment_dts: list[Date] = []
         self.year_fracs: list[float] = []
         self.accrued_days: list[int] = []
 
+        self._payment_serials = np.array([])
+        self._year_fracs = np.array([])
+        self._rate_rule_cache = None
+
         self.generate_payment_dts()
 
     ###########################################################################
@@ -163,6 +168,7 @@ class SwapFloatLeg:
         self.start_accrued_dts = []
         self.end_accrued_dts = []
         self.reset_dts = []
+        self.fixing_dts = []
         self.payment_dts = []
         self.year_fracs = []
         self.accrued_days = []
@@ -179,6 +185,11 @@ class SwapFloatLeg:
             reset_dt = prev_dt
             self.reset_dts.append(reset_dt)
 
+            fixing_dt = self.rate_index.calendar.add_business_days(
+                reset_dt, -self.rate_index.fixing_lag
+            )
+            self.fixing_dts.append(fixing_dt)
+
             if self.payment_lag == 0:
                 payment_dt = next_dt
             else:
@@ -193,6 +204,14 @@ class SwapFloatLeg:
 
             prev_dt = next_dt
 
+        # Array copies used by value
+        self._payment_serials = np.array([dt.excel_dt for dt in self.payment_dts])
+        self._year_fracs = np.array(self.year_fracs)
+
+        # Rate rule data such as reset sub-period schedules, so that repricing
+        # only touches rates and discount factors
+        self._rate_rule_cache = self.rate_rule.build_period_cache(self)
+
     ###########################################################################
 
     @property
@@ -240,63 +259,33 @@ class SwapFloatLeg:
         if discount_curve is None:
             raise FinError("Discount curve is None")
 
-        df_value = discount_curve.df(value_dt)
-        leg_pv = 0.0
         num_payments = len(self.payment_dts)
+        rates = np.zeros(num_payments)
+        payment_dfs = np.zeros(num_payments)
+
+        # payment dates are increasing so live payments are a tail slice
+        i_live = np.searchsorted(self._payment_serials, value_dt.excel_dt, side="right")
+
+        if i_live < num_payments:
+            df_value = discount_curve.df(value_dt)
+
+            # Full coupon rates (index + spread) of all live periods
+            rates[i_live:] = self.rate_rule.period_rates(
+                self,
+                value_dt,
+                i_live,
+                projection_curve=projection_curve,
+                fixing_source=fixing_source,
+            )
+            payment_dfs[i_live:] = discount_curve.df(self.payment_dts[i_live:]) / df_value
 
-        rates: list[float] = []
-        payments: list[float] = []
-        payment_dfs: list[float] = []
-        payment_pvs: list[float] = []
-        cumulative_pvs: list[float] = []
-
-        for i_pmnt in range(num_payments):
-            payment_dt = self.payment_dts[i_pmnt]
-
-            if payment_dt > value_dt:
-                start_accrued_dt = self.start_accrued_dts[i_pmnt]
-                end_accrued_dt = self.end_accrued_dts[i_pmnt]
-                reset_dt = self.reset_dts[i_pmnt]
-                pay_alpha = self.year_fracs[i_pmnt]
-
-                # Returns full coupon rate (index + spread)
-                coupon_rate = self._compute_period_rate(
-                    value_dt,
-                    reset_dt,
-                    start_accrued_dt,
-                    end_accrued_dt,
-                    projection_curve=projection_curve,
-                    fixing_source=fixing_source,
-                )
-
-                payment_amount = (
-                    coupon_rate * pay_alpha * self.notional
-                )
+        payments = rates * self._year_fracs * self.notional
+        payment_pvs = payments * payment_dfs
 
-                df_payment = (
-                    discount_curve.df(payment_dt) / df_value
-                )
-                payment_pv = payment_amount * df_payment
-                leg_pv += payment_pv
+        if i_live < num_payments:
+            payment_pvs[-1] += self.principal * payment_dfs[-1] * self.notional
 
-                rates.append(coupon_rate)
-                payments.append(payment_amount)
-                payment_dfs.append(df_payment)
-                payment_pvs.append(payment_pv)
-                cumulative_pvs.append(leg_pv)
-
-            else:
-                rates.append(0.0)
-                payments.append(0.0)
-                payment_dfs.append(0.0)
-                payment_pvs.append(0.0)
-                cumulative_pvs.append(leg_pv)
-
-        if payment_dt > value_dt:
-            principal_pv = self.principal * df_payment * self.notional
-            payment_pvs[-1] += principal_pv
-            leg_pv += principal_pv
-            cumulative_pvs[-1] = leg_pv
+        leg_pv = float(payment_pvs.sum())
 
         if self.leg_type == SwapTypes.PAY:
             leg_pv = leg_pv * (-1.0)
@@ -313,9 +302,9 @@ class SwapFloatLeg:
         df["reset_date"] = self.reset_dts
         df["year_frac"] = self.year_fracs
         df["rate"] = rates
-        df["payment"] = np.array(payments) * leg_type_sign
+        df["payment"] = payments * leg_type_sign
         df["payment_df"] = payment_dfs
-        df["payment_pv"] = np.array(payment_pvs) * leg_type_sign
+        df["payment_pv"] = payment_pvs * leg_type_sign
         df["leg"] = "FLOAT"
 
         return leg_pv, df
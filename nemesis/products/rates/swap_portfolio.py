@@ -0,0 +1,452 @@
+from __future__ import annotations
+
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+import numpy as np
+
+from ...market.curves.discount_curve import DiscountCurve
+from ...market.indices.interest_rate_index import FixingSource, InterestRateIndex
+from ...utils.date import Date
+from ...utils.day_count import DayCountTypes
+from ...utils.error import FinError
+from ...utils.global_types import SwapTypes
+from ...utils.helpers import label_to_string
+from .float_rate_rule import FloatRateRule
+from .ir_swap import InterestRateSwap
+
+
+###############################################################################
+
+
+@dataclass(frozen=True)
+class SwapPortfolioValuation:
+    """Per-trade results of a SwapPortfolio valuation, in trade order.
+
+    pv is the swap value, par_rate the fixed coupon that sets it to zero and
+    pv01 the unit-notional annuity of the fixed leg, all as returned by
+    InterestRateSwap.value, swap_rate and pv01."""
+
+    pv: np.ndarray
+    fixed_leg_pv: np.ndarray
+    float_leg_pv: np.ndarray
+    par_rate: np.ndarray
+    pv01: np.ndarray
+
+
+###############################################################################
+
+
+@dataclass(frozen=True)
+class _DiscountGroup:
+    """Cashflows discounted on the same curve with the same day count. The
+    distinct payment dates are held once and mapped back to the flows."""
+
+    curve_key: Hashable
+    dc_type: DayCountTypes | None
+    flow_idx: np.ndarray
+    serials: np.ndarray
+    dts: list[Date]
+    inverse: np.ndarray
+
+
+###############################################################################
+
+
+@dataclass(frozen=True)
+class _RateGroup:
+    """Float periods of plain rate rule legs that share an index, multiplier
+    and projection curve, so their rates come from one index call."""
+
+    curve_key: Hashable
+    rate_index: InterestRateIndex
+    multiplier: float
+    flow_idx: np.ndarray
+    reset_dts: np.ndarray
+    start_dts: np.ndarray
+    end_dts: np.ndarray
+    fixing_dts: np.ndarray
+    year_fracs: np.ndarray
+    spreads: np.ndarray
+
+
+###############################################################################
+
+
+class SwapPortfolio:
+    """Book of fixed-vs-floating interest rate swaps valued together.
+
+    The cashflows of all fixed legs and all float legs are flattened into
+    contiguous arrays with the offset of each trade's first flow. Discount
+    factors are taken in one curve call per discount curve and day count,
+    float rates in one index call per index and projection curve, and the
+    per-trade sums use np.add.reduceat over the trade offsets.
+
+    Each trade is assigned a discount and a projection curve key. The curves
+    themselves are passed to value as a dict keyed by these, or as a single
+    curve used for every key. The portfolio snapshots the swap schedules on
+    construction so swaps must not be rebuilt afterwards, although fixed
+    coupons are read from the swaps at each valuation."""
+
+    def __init__(
+        self,
+        swaps: list[InterestRateSwap],
+        discount_keys: list[Hashable] | None = None,
+        projection_keys: list[Hashable] | None = None,
+    ):
+        """Flatten the cashflows of a list of swaps. Curve keys default to
+        None for all trades. Projection keys default to the discount keys."""
+
+        self.swaps = list(swaps)
+        num_trades = len(self.swaps)
+
+        if num_trades == 0:
+            raise FinError("Swap portfolio needs at least one swap")
+
+        if discount_keys is None:
+            discount_keys = [None] * num_trades
+        if projection_keys is None:
+            projection_keys = discount_keys
+
+        if len(discount_keys) != num_trades or len(projection_keys) != num_trades:
+            raise FinError("Curve keys must have one entry per swap")
+
+        self.discount_keys = list(discount_keys)
+        self.projection_keys = list(projection_keys)
+
+        fixed_legs = [swap.fixed_leg for swap in self.swaps]
+        float_legs = [swap.float_leg for swap in self.swaps]
+
+        self.notionals = np.array([swap.notional for swap in self.swaps])
+
+        # InterestRateSwap legs exchange no principal so only coupons enter
+        (
+            self._fixed_offsets,
+            self._fixed_serials,
+            self._fixed_accruals,
+        ) = self._flatten_legs(fixed_legs)
+
+        (
+            self._float_offsets,
+            self._float_serials,
+            self._float_accruals,
+        ) = self._flatten_legs(float_legs)
+
+        self._fixed_discount_groups = self._build_discount_groups(
+            fixed_legs,
+            self._fixed_offsets,
+            [leg.dc_type for leg in fixed_legs],
+        )
+
+        # Float legs discount with the curve day count
+        self._float_discount_groups = self._build_discount_groups(
+            float_legs,
+            self._float_offsets,
+            [None] * num_trades,
+        )
+
+        self._build_rate_groups(float_legs)
+
+    ###########################################################################
+
+    def __len__(self):
+        return len(self.swaps)
+
+    ###########################################################################
+
+    def value(
+        self,
+        value_dt: Date,
+        discount_curves: DiscountCurve | dict,
+        projection_curves: DiscountCurve | dict | None = None,
+        fixing_source: FixingSource | None = None,
+    ) -> SwapPortfolioValuation:
+        """Value all swaps and return their PVs, par rates and PV01s.
+
+        Args:
+            discount_curves: Curve or dict of curves keyed by discount key.
+            projection_curves: Curve or dict of curves keyed by projection
+                key. Falls back to discount_curves.
+            fixing_source: Source for historical fixings.
+        """
+
+        if discount_curves is None:
+            raise FinError("Discount curves are required")
+        if projection_curves is None:
+            projection_curves = discount_curves
+
+        value_serial = value_dt.excel_dt
+
+        # Fixed legs: the annuity per unit coupon times the current coupons
+        fixed_dfs = self._group_dfs(
+            self._fixed_discount_groups, value_dt, discount_curves
+        )
+        annuity_flows = self._fixed_accruals * fixed_dfs
+        annuities = np.add.reduceat(annuity_flows, self._fixed_offsets)
+
+        cpns = np.array([swap.fixed_leg.cpn for swap in self.swaps])
+        fixed_leg_pvs = annuities * cpns
+
+        # Float legs: rates of the live periods only
+        float_live = self._float_serials > value_serial
+        rates = np.zeros(len(self._float_serials))
+
+        for group in self._rate_groups:
+            live = float_live[group.flow_idx]
+            if not live.any():
+                continue
+            projection_curve = self._curve(projection_curves, group.curve_key)
+            rates[group.flow_idx[live]] = group.rate_index.period_rates(
+                value_dt,
+                group.reset_dts[live].tolist(),
+                group.start_dts[live].tolist(),
+                group.end_dts[live].tolist(),
+                projection_curve,
+                group.multiplier,
+                fixing_source,
+                fixing_dts=group.fixing_dts[live].tolist(),
+                year_fracs=group.year_fracs[live],
+            ) + group.spreads[live]
+
+        for i_trade in self._rule_trades:
+            leg = self.swaps[i_trade].float_leg
+            i_live = np.searchsorted(leg._payment_serials, value_serial, side="right")
+            if i_live == len(leg.payment_dts):
+                continue
+            first_flow = self._float_offsets[i_trade]
+            projection_curve = self._curve(
+                projection_curves, self.projection_keys[i_trade]
+            )
+            rates[first_flow + i_live:first_flow + len(leg.payment_dts)] = (
+                leg.rate_rule.period_rates(
+                    leg,
+                    value_dt,
+                    i_live,
+                    projection_curve=projection_curve,
+                    fixing_source=fixing_source,
+                )
+            )
+
+        float_dfs = self._group_dfs(
+            self._float_discount_groups, value_dt, discount_curves
+        )
+        float_leg_pvs = np.add.reduceat(
+            rates * self._float_accruals * float_dfs, self._float_offsets
+        )
+
+        # Leg signs are held in the accruals so annuities carry the fixed one
+        pv01s = np.abs(annuities) / self.notionals
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            par_rates = float_leg_pvs / pv01s / self.notionals
+
+        return SwapPortfolioValuation(
+            pv=fixed_leg_pvs + float_leg_pvs,
+            fixed_leg_pv=fixed_leg_pvs,
+            float_leg_pv=float_leg_pvs,
+            par_rate=par_rates,
+            pv01=pv01s,
+        )
+
+    ###########################################################################
+
+    @staticmethod
+    def _flatten_legs(legs: list):
+        """Concatenate the payment serials and signed notional-weighted year
+        fractions of a list of legs, with the offset of each leg's first
+        flow."""
+
+        num_flows = np.array([len(leg.payment_dts) for leg in legs])
+        offsets = np.concatenate(([0], np.cumsum(num_flows)[:-1]))
+
+        serials = np.concatenate([leg._payment_serials for leg in legs])
+        accruals = np.concatenate(
+            [
+                leg._year_fracs
+                * leg.notional
+                * (-1.0 if leg.leg_type == SwapTypes.PAY else 1.0)
+                for leg in legs
+            ]
+        )
+
+        return offsets, serials, accruals
+
+    ###########################################################################
+
+    def _build_discount_groups(
+        self,
+        legs: list,
+        offsets: np.ndarray,
+        dc_types: list,
+    ) -> list[_DiscountGroup]:
+        """Group the flows of the legs by discount curve key and day count."""
+
+        flow_idx_by_key = {}
+        for i_trade, leg in enumerate(legs):
+            key = (self.discount_keys[i_trade], dc_types[i_trade])
+            first_flow = offsets[i_trade]
+            flow_idx_by_key.setdefault(key, []).append(
+                np.arange(first_flow, first_flow + len(leg.payment_dts))
+            )
+
+        all_dts = [dt for leg in legs for dt in leg.payment_dts]
+        serials = np.concatenate([leg._payment_serials for leg in legs])
+
+        groups = []
+        for (curve_key, dc_type), idx_list in flow_idx_by_key.items():
+            flow_idx = np.concatenate(idx_list)
+            unique_serials, first, inverse = np.unique(
+                serials[flow_idx], return_index=True, return_inverse=True
+            )
+            groups.append(
+                _DiscountGroup(
+                    curve_key=curve_key,
+                    dc_type=dc_type,
+                    flow_idx=flow_idx,
+                    serials=unique_serials,
+                    dts=[all_dts[i] for i in flow_idx[first]],
+                    inverse=inverse,
+                )
+            )
+
+        return groups
+
+    ###########################################################################
+
+    def _build_rate_groups(self, float_legs: list):
+        """Group float periods of plain rate rule legs by index, multiplier and
+        projection key. Legs with other rules are priced through their rule."""
+
+        self._rule_trades = []
+        members = []
+
+        for i_trade, leg in enumerate(float_legs):
+            if type(leg.rate_rule) is not FloatRateRule:
+                self._rule_trades.append(i_trade)
+                continue
+
+            multiplier = leg.rate_rule.convention.multiplier
+            curve_key = self.projection_keys[i_trade]
+
+            # Indices are unhashable dataclasses so match them by equality
+            for member in members:
+                if (
+                    member[0] == curve_key
+                    and member[2] == multiplier
+                    and member[1] == leg.rate_index
+                ):
+                    member[3].append(i_trade)
+                    break
+            else:
+                members.append((curve_key, leg.rate_index, multiplier, [i_trade]))
+
+        self._rate_groups = []
+        for curve_key, rate_index, multiplier, trades in members:
+            legs = [float_legs[i] for i in trades]
+            start_dts = _object_array([leg.start_accrued_dts for leg in legs])
+            end_dts = _object_array([leg.end_accrued_dts for leg in legs])
+            first_flows = [self._float_offsets[i] for i in trades]
+            flow_idx = np.concatenate(
+                [
+                    np.arange(first_flow, first_flow + len(leg.payment_dts))
+                    for first_flow, leg in zip(first_flows, legs)
+                ]
+            )
+            self._rate_groups.append(
+                _RateGroup(
+                    curve_key=curve_key,
+                    rate_index=rate_index,
+                    multiplier=multiplier,
+                    flow_idx=flow_idx,
+                    reset_dts=_object_array([leg.reset_dts for leg in legs]),
+                    start_dts=start_dts,
+                    end_dts=end_dts,
+                    fixing_dts=_object_array([leg.fixing_dts for leg in legs]),
+                    year_fracs=np.array(
+                        [
+                            rate_index.day_count.year_frac(start_dt, end_dt)[0]
+                            for start_dt, end_dt in zip(start_dts, end_dts)
+                        ]
+                    ),
+                    spreads=np.concatenate(
+                        [
+                            np.full(len(leg.payment_dts), leg.rate_rule.convention.spread)
+                            for leg in legs
+                        ]
+                    ),
+                )
+            )
+
+    ###########################################################################
+
+    def _group_dfs(
+        self,
+        groups: list[_DiscountGroup],
+        value_dt: Date,
+        curves: DiscountCurve | dict,
+    ) -> np.ndarray:
+        """Discount factors from the value date to every flow of the groups.
+        Flows paid on or before the value date get zero."""
+
+        num_flows = sum(len(group.flow_idx) for group in groups)
+        dfs = np.zeros(num_flows)
+        value_serial = value_dt.excel_dt
+
+        for group in groups:
+            # distinct serials are sorted so live dates are a tail slice
+            i_live = np.searchsorted(group.serials, value_serial, side="right")
+            if i_live == len(group.serials):
+                continue
+
+            curve = self._curve(curves, group.curve_key)
+            unique_dfs = np.zeros(len(group.serials))
+            unique_dfs[i_live:] = curve.df(
+                group.dts[i_live:], group.dc_type
+            ) / curve.df(value_dt, group.dc_type)
+            dfs[group.flow_idx] = unique_dfs[group.inverse]
+
+        return dfs
+
+    ###########################################################################
+
+    @staticmethod
+    def _curve(curves: DiscountCurve | dict, key: Hashable) -> DiscountCurve:
+        """Look up the curve for a key, or return the single curve given."""
+
+        if not isinstance(curves, dict):
+            return curves
+
+        if key not in curves:
+            raise FinError(f"No curve supplied for key {key}")
+
+        return curves[key]
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("NUM TRADES", len(self.swaps))
+        s += label_to_string("NUM FIXED FLOWS", len(self._fixed_serials))
+        s += label_to_string("NUM FLOAT FLOWS", len(self._float_serials))
+        s += label_to_string("NUM RATE GROUPS", len(self._rate_groups))
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        print(self)
+
+
+###############################################################################
+
+
+def _object_array(dt_lists: list[list[Date]]) -> np.ndarray:
+    """Concatenate lists of dates into one object array so they can be
+    selected with boolean masks."""
+
+    dts = np.empty(sum(len(dt_list) for dt_list in dt_lists), dtype=object)
+    dts[:] = [dt for dt_list in dt_lists for dt in dt_list]
+    return dts
+
+
+###############################################################################
@@ -0,0 +1,579 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from ...market.curves.discount_curve import DiscountCurve
+from ...market.indices.interest_rate_index import (
+    _DAILY_DC_DENOMINATORS,
+    FixingSource,
+    InterestRateIndex,
+    OvernightIndex,
+    _dates_from_serials,
+)
+from ...utils.calendar import (
+    BusDayAdjustTypes,
+    Calendar,
+    CalendarTypes,
+    DateGenRuleTypes,
+)
+from ...utils.date import Date
+from ...utils.day_count import DayCount, DayCountTypes
+from ...utils.error import FinError
+from ...utils.frequency import FrequencyTypes, annual_frequency
+from ...utils.tenor import Tenor, TenorUnit
+from .curve_builder import SwapConvention
+from .float_rate_rule import FloatRateRule, ResetCompoundedFloatRateRule
+from .swap_float_leg import FloatRateConvention, _create_float_rate_rule
+
+
+# Calendar days added either side of a set of dates when reading the
+# business days needed to adjust or roll them
+_BUSINESS_DAY_MARGIN = 40
+
+
+###############################################################################
+
+
+def par_swap_rate_surface(
+    value_dt: Date,
+    projection_curve: DiscountCurve,
+    convention: SwapConvention,
+    start_tenors: list[str],
+    swap_tenors: list[str],
+    settle_lag: int = 0,
+    discount_curve: DiscountCurve | None = None,
+    fixing_source: FixingSource | None = None,
+) -> pd.DataFrame:
+    """Par swap rates for a grid of forward starts and swap tenors.
+
+    The spot date is settle_lag business days after value_dt, as in
+    CurveBuildConfig. Each forward start date is the spot date plus a start
+    tenor adjusted with the convention business day rule, and each swap runs
+    for a swap tenor from there. No swap objects are built. The schedules of
+    all grid cells are generated together on date serials following the
+    rules of Schedule, and the accruals, payment dates, discount factors and
+    float rates of the whole grid are computed as arrays. The rates match
+    InterestRateSwap.swap_rate with the same conventions.
+
+    Returns a DataFrame of par rates indexed by start tenor with one column
+    per swap tenor. If discount_curve is None the projection curve is also
+    used for discounting."""
+
+    if len(start_tenors) == 0 or len(swap_tenors) == 0:
+        raise FinError("Start tenors and swap tenors must not be empty")
+
+    if discount_curve is None:
+        discount_curve = projection_curve
+
+    calendar = Calendar(convention.cal_type)
+    business_days = _BusinessDays(calendar)
+    rate_index = convention.rate_index
+    index_business_days = _BusinessDays(rate_index.calendar)
+
+    spot_serial = int(calendar.add_business_days(value_dt, settle_lag).excel_dt)
+    value_serial = int(value_dt.excel_dt)
+
+    start_serials = business_days.adjust(
+        np.concatenate(
+            [_add_tenor(np.array([spot_serial]), tenor) for tenor in start_tenors]
+        ),
+        convention.bd_type,
+    )
+
+    # Grid cells run over the swap tenors within each start tenor
+    num_tenors = len(swap_tenors)
+    effective_serials = np.repeat(start_serials, num_tenors)
+    termination_serials = np.concatenate(
+        [_add_tenor(start_serials, tenor) for tenor in swap_tenors]
+    )
+    termination_serials = np.reshape(
+        termination_serials, (num_tenors, len(start_serials))
+    ).T.ravel()
+
+    if np.any(termination_serials <= effective_serials):
+        raise FinError("Swap tenors must be positive")
+
+    # Fixed legs: annuities per unit coupon and notional
+    fixed_starts, fixed_ends, fixed_cells = _periods(
+        *_schedule_serials(
+            business_days,
+            effective_serials,
+            termination_serials,
+            convention.fixed_freq_type,
+            convention.bd_type,
+            convention.dg_type,
+            convention.end_of_month,
+        )
+    )
+    fixed_payments = business_days.add(fixed_ends, convention.payment_lag)
+    fixed_live = fixed_payments > value_serial
+
+    fixed_dfs = _curve_dfs(
+        discount_curve, fixed_payments[fixed_live], convention.fixed_dc_type
+    ) / discount_curve.df(value_dt, convention.fixed_dc_type)
+
+    annuities = np.bincount(
+        fixed_cells[fixed_live],
+        weights=_year_fracs(
+            convention.fixed_dc_type,
+            fixed_starts[fixed_live],
+            fixed_ends[fixed_live],
+        )
+        * fixed_dfs,
+        minlength=len(effective_serials),
+    )
+
+    # Float legs: coupon rates of the live periods per unit notional
+    float_starts, float_ends, float_cells = _periods(
+        *_schedule_serials(
+            business_days,
+            effective_serials,
+            termination_serials,
+            convention.float_freq_type,
+            convention.bd_type,
+            convention.dg_type,
+            convention.end_of_month,
+        )
+    )
+    float_payments = business_days.add(float_ends, convention.payment_lag)
+    float_live = float_payments > value_serial
+    float_starts = float_starts[float_live]
+    float_ends = float_ends[float_live]
+
+    float_convention = convention.float_convention
+    if float_convention is None:
+        float_convention = FloatRateConvention()
+    rate_rule = _create_float_rate_rule(float_convention)
+
+    if type(rate_rule) is FloatRateRule:
+        rates = _index_rates(
+            rate_index,
+            index_business_days,
+            value_dt,
+            float_starts,
+            float_starts,
+            float_ends,
+            projection_curve,
+            float_convention.multiplier,
+            fixing_source,
+        ) + float_convention.spread
+    elif isinstance(rate_rule, ResetCompoundedFloatRateRule):
+        rates = _compounded_rates(
+            rate_rule,
+            rate_index,
+            index_business_days,
+            value_dt,
+            float_starts,
+            float_ends,
+            convention.float_dc_type,
+            projection_curve,
+            fixing_source,
+        )
+    else:
+        raise FinError(f"Unsupported float rate rule {type(rate_rule).__name__}")
+
+    float_dfs = _curve_dfs(
+        discount_curve, float_payments[float_live], None
+    ) / discount_curve.df(value_dt)
+
+    float_leg_pvs = np.bincount(
+        float_cells[float_live],
+        weights=rates
+        * _year_fracs(convention.float_dc_type, float_starts, float_ends)
+        * float_dfs,
+        minlength=len(effective_serials),
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        par_rates = float_leg_pvs / annuities
+
+    return pd.DataFrame(
+        np.reshape(par_rates, (len(start_tenors), num_tenors)),
+        index=list(start_tenors),
+        columns=list(swap_tenors),
+    )
+
+
+###############################################################################
+
+
+class _BusinessDays:
+    """Sorted business day serials of a calendar, read from its bitmaps and
+    extended as needed, used to adjust and roll arrays of date serials the
+    way Calendar.adjust and Calendar.add_business_days do for one Date."""
+
+    def __init__(self, calendar: Calendar):
+        self.calendar = calendar
+        self.serials = np.zeros(0, dtype=np.int64)
+        self._start = 0
+        self._end = 0
+
+    def adjust(self, serials: np.ndarray, bd_type: BusDayAdjustTypes):
+        """Business day adjusted date serials."""
+
+        if self.calendar.cal_type == CalendarTypes.NONE:
+            return serials
+
+        if bd_type == BusDayAdjustTypes.NONE or len(serials) == 0:
+            return serials
+
+        self._cover(serials, _BUSINESS_DAY_MARGIN)
+
+        following = self.serials[np.searchsorted(self.serials, serials, side="left")]
+        preceding = self.serials[np.searchsorted(self.serials, serials, side="right") - 1]
+
+        if bd_type == BusDayAdjustTypes.FOLLOWING:
+            return following
+
+        if bd_type == BusDayAdjustTypes.PRECEDING:
+            return preceding
+
+        months = _month_parts(serials)[0]
+
+        if bd_type == BusDayAdjustTypes.MODIFIED_FOLLOWING:
+            return np.where(_month_parts(following)[0] == months, following, preceding)
+
+        if bd_type == BusDayAdjustTypes.MODIFIED_PRECEDING:
+            return np.where(_month_parts(preceding)[0] == months, preceding, following)
+
+        raise FinError("Unknown adjustment convention" + str(bd_type))
+
+    def add(self, serials: np.ndarray, num_days: int):
+        """Date serials num_days business days after the given ones."""
+
+        if num_days == 0 or len(serials) == 0:
+            return serials
+
+        self._cover(serials, _BUSINESS_DAY_MARGIN + 14 * abs(num_days))
+
+        if num_days > 0:
+            idx = np.searchsorted(self.serials, serials, side="right") + num_days - 1
+        else:
+            idx = np.searchsorted(self.serials, serials, side="left") + num_days
+
+        return self.serials[idx]
+
+    def _cover(self, serials: np.ndarray, margin: int):
+        """Read the business days again if the serials plus a margin of
+        calendar days either side are not all inside the current range."""
+
+        start = int(serials.min()) - margin
+        end = int(serials.max()) + margin + 1
+
+        if start >= self._start and end <= self._end:
+            return
+
+        self._start = min(start, self._start) if self._end > 0 else start
+        self._end = max(end, self._end)
+        start_dt, end_dt = _dates_from_serials([self._start, self._end])
+        self.serials = self.calendar.business_day_serials(start_dt, end_dt)
+
+
+###############################################################################
+
+
+def _month_parts(serials: np.ndarray):
+    """Months since January 1970 and days of the month of date serials."""
+
+    dts = np.datetime64("1899-12-30", "D") + serials.astype("timedelta64[D]")
+    months = dts.astype("datetime64[M]")
+    days = (dts - months.astype("datetime64[D]")).astype(np.int64) + 1
+    return months.astype(np.int64), days
+
+
+def _month_serials(months: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """Date serials of a day in each month, moved back to the month end if
+    the month is shorter, as Date.add_months does."""
+
+    month_starts = months.astype("datetime64[M]").astype("datetime64[D]")
+    next_starts = (months + 1).astype("datetime64[M]").astype("datetime64[D]")
+    month_lengths = (next_starts - month_starts).astype(np.int64)
+    serials = (month_starts - np.datetime64("1899-12-30", "D")).astype(np.int64)
+    return serials + np.minimum(days, month_lengths) - 1
+
+
+def _eom(serials: np.ndarray) -> np.ndarray:
+    """Serials of the last day of the month of each date serial."""
+    return _month_serials(_month_parts(serials)[0], 31)
+
+
+def _add_months(serials: np.ndarray, num_months) -> np.ndarray:
+    """Date serials num_months after the given ones as in Date.add_months."""
+    months, days = _month_parts(serials)
+    return _month_serials(months + num_months, days)
+
+
+def _add_tenor(serials: np.ndarray, tenor: str) -> np.ndarray:
+    """Date serials a tenor after the given ones as in Date.add_tenor."""
+
+    tenor = Tenor.as_tenor(tenor)
+    num_periods = tenor._num_periods
+
+    if tenor._units == TenorUnit.DAYS:
+        return serials + num_periods
+
+    if tenor._units == TenorUnit.WEEKS:
+        return serials + 7 * num_periods
+
+    if tenor._units == TenorUnit.MONTHS:
+        return _add_months(serials, num_periods)
+
+    if tenor._units == TenorUnit.YEARS:
+        # Years are added one at a time so that 29 Feb rolls as in add_tenor
+        for _ in range(abs(num_periods)):
+            serials = _add_months(serials, 12 * int(np.sign(num_periods)))
+        return serials
+
+    raise FinError("Unknown tenor type in " + str(tenor))
+
+
+###############################################################################
+
+
+def _schedule_serials(
+    business_days: _BusinessDays,
+    effective_serials: np.ndarray,
+    termination_serials: np.ndarray,
+    freq_type: FrequencyTypes,
+    bd_type: BusDayAdjustTypes,
+    dg_type: DateGenRuleTypes,
+    end_of_month: bool,
+):
+    """Adjusted dates of many schedules at once following Schedule.generate
+    with the termination date adjusted. The candidate dates of every
+    schedule are laid out in one row of a 2D array and the ones inside the
+    schedule are kept. Returns the dates of all schedules one after the
+    other together with the row of each date."""
+
+    frequency = annual_frequency(freq_type)
+    num_months = int(12 / frequency)
+    num_rows = len(effective_serials)
+
+    if num_months == 0 and freq_type == FrequencyTypes.WEEKLY:
+        num_steps = (termination_serials - effective_serials) // 7 + 2
+    elif num_months > 0:
+        month_spans = (
+            _month_parts(termination_serials)[0] - _month_parts(effective_serials)[0]
+        )
+        num_steps = month_spans // num_months + 2
+    else:
+        raise FinError(f"Frequency {freq_type} is not supported for swap grids")
+
+    steps = np.arange(int(num_steps.max()) + 1)
+
+    if dg_type == DateGenRuleTypes.BACKWARD:
+        base_serials = termination_serials
+        steps = -steps
+    elif dg_type in (DateGenRuleTypes.FORWARD, DateGenRuleTypes.FORWARD_OVERSHOOT):
+        base_serials = effective_serials
+    else:
+        raise FinError(f"Unknown date generation rule {dg_type}")
+
+    if num_months == 0:
+        candidates = base_serials[:, None] + 7 * steps[None, :]
+    else:
+        months, days = _month_parts(base_serials)
+        candidates = _month_serials(
+            months[:, None] + num_months * steps[None, :], days[:, None]
+        )
+
+    # ISDA EOM rule as in Schedule.generate, not applied to the first date
+    if end_of_month:
+        apply_eom = (_eom(effective_serials) == effective_serials) | (
+            _eom(termination_serials) == termination_serials
+        )
+        candidates[apply_eom, 1:] = _eom(candidates[apply_eom, 1:])
+
+    first = np.ones((num_rows, 1), dtype=bool)
+    effective_col = effective_serials[:, None]
+    termination_col = termination_serials[:, None]
+
+    if dg_type == DateGenRuleTypes.BACKWARD:
+        # Effective date, the backward dates after it and the termination date
+        middle = candidates[:, :0:-1]
+        table = np.hstack([effective_col, middle, termination_col])
+        keep = np.hstack([first, middle > effective_col, first])
+        adjust = np.hstack([~first, np.ones_like(middle, dtype=bool), first])
+    elif dg_type == DateGenRuleTypes.FORWARD:
+        # The effective date is adjusted here as in Schedule.generate
+        table = np.hstack([candidates, termination_col])
+        keep = np.hstack([first, candidates[:, 1:] < termination_col, first])
+        adjust = np.ones_like(table, dtype=bool)
+    else:
+        # The last date is the first on or after the termination date
+        table = candidates
+        keep = np.hstack([first, candidates[:, :-1] < termination_col])
+        adjust = np.hstack([~first, np.ones_like(candidates[:, 1:], dtype=bool)])
+
+    rows = np.nonzero(keep)[0]
+    serials = table[keep]
+    to_adjust = adjust[keep]
+    serials[to_adjust] = business_days.adjust(serials[to_adjust], bd_type)
+
+    # The first date is never before the effective date
+    is_first = np.append(True, rows[1:] != rows[:-1])
+    serials[is_first] = np.maximum(serials[is_first], effective_serials)
+
+    # Dates that adjust onto the previous one are dropped
+    is_repeat = np.append(False, (serials[1:] == serials[:-1]) & ~is_first[1:])
+
+    return serials[~is_repeat], rows[~is_repeat]
+
+
+def _periods(serials: np.ndarray, rows: np.ndarray):
+    """Start and end serials and rows of the periods between consecutive
+    dates of the same schedule."""
+
+    same_row = rows[1:] == rows[:-1]
+    return serials[:-1][same_row], serials[1:][same_row], rows[1:][same_row]
+
+
+def _year_fracs(dc_type: DayCountTypes, start_serials, end_serials) -> np.ndarray:
+    """Year fractions between date serials. Actual day counts are computed
+    on the serials and the others through DayCount."""
+
+    if dc_type in _DAILY_DC_DENOMINATORS:
+        return (end_serials - start_serials) / _DAILY_DC_DENOMINATORS[dc_type]
+
+    day_count = DayCount(dc_type)
+    return np.array(
+        [
+            day_count.year_frac(start_dt, end_dt)[0]
+            for start_dt, end_dt in zip(
+                _dates_from_serials(start_serials), _dates_from_serials(end_serials)
+            )
+        ]
+    )
+
+
+def _curve_dfs(
+    curve: DiscountCurve, serials: np.ndarray, dc_type: DayCountTypes | None
+) -> np.ndarray:
+    """Discount factors at date serials, taken once per distinct date."""
+
+    if len(serials) == 0:
+        return np.zeros(0)
+
+    unique_serials, inverse = np.unique(serials, return_inverse=True)
+    dfs = curve.df(_dates_from_serials(unique_serials), dc_type)
+    return np.atleast_1d(dfs)[inverse]
+
+
+###############################################################################
+
+
+def _index_rates(
+    rate_index: InterestRateIndex,
+    index_business_days: _BusinessDays,
+    value_dt: Date,
+    reset_serials: np.ndarray,
+    start_serials: np.ndarray,
+    end_serials: np.ndarray,
+    projection_curve: DiscountCurve | None,
+    multiplier: float,
+    fixing_source: FixingSource | None,
+) -> np.ndarray:
+    """Index rates of periods given as date serials, following period_rates
+    of the index. Overnight periods that have started are compounded by the
+    index itself one at a time."""
+
+    value_serial = int(value_dt.excel_dt)
+    rates = np.zeros(len(reset_serials))
+
+    if isinstance(rate_index, OvernightIndex):
+        is_fwd = start_serials > value_serial
+    else:
+        fixing_serials = index_business_days.add(reset_serials, -rate_index.fixing_lag)
+        is_fwd = fixing_serials >= value_serial
+
+    if not is_fwd.all():
+        if isinstance(rate_index, OvernightIndex):
+            started = np.nonzero(~is_fwd)[0]
+            rates[started] = [
+                rate_index.period_rate(
+                    value_dt,
+                    reset_dt,
+                    start_dt,
+                    end_dt,
+                    projection_curve,
+                    multiplier,
+                    fixing_source,
+                )
+                for reset_dt, start_dt, end_dt in zip(
+                    _dates_from_serials(reset_serials[started]),
+                    _dates_from_serials(start_serials[started]),
+                    _dates_from_serials(end_serials[started]),
+                )
+            ]
+        else:
+            if fixing_source is None:
+                raise FinError("Require fixing data source")
+            fixings = fixing_source.get_fixings(fixing_serials[~is_fwd], value_dt)
+            if np.isnan(fixings).any():
+                raise FinError("Missing fixing for a historical period")
+            rates[~is_fwd] = fixings * multiplier
+
+    if is_fwd.any():
+        if projection_curve is None:
+            raise FinError("Projection curve is required for future period rates")
+        dfs1 = _curve_dfs(projection_curve, start_serials[is_fwd], rate_index.dc_type)
+        dfs2 = _curve_dfs(projection_curve, end_serials[is_fwd], rate_index.dc_type)
+        year_fracs = _year_fracs(
+            rate_index.dc_type, start_serials[is_fwd], end_serials[is_fwd]
+        )
+        rates[is_fwd] = (dfs1 / dfs2 - 1.0) / year_fracs * multiplier
+
+    return rates
+
+
+def _compounded_rates(
+    rate_rule: ResetCompoundedFloatRateRule,
+    rate_index: InterestRateIndex,
+    index_business_days: _BusinessDays,
+    value_dt: Date,
+    start_serials: np.ndarray,
+    end_serials: np.ndarray,
+    dc_type: DayCountTypes,
+    projection_curve: DiscountCurve | None,
+    fixing_source: FixingSource | None,
+) -> np.ndarray:
+    """Coupon rates of reset compounded periods. The reset sub-periods of
+    all periods are generated as one batch of schedules on the index
+    calendar, as ResetCompoundedFloatRateRule does period by period."""
+
+    reset_convention = rate_rule.reset_convention
+    sub_serials, sub_rows = _schedule_serials(
+        index_business_days,
+        start_serials,
+        end_serials,
+        reset_convention.reset_freq_type,
+        reset_convention.reset_bd_type,
+        reset_convention.reset_dg_type,
+        False,
+    )
+    reset_serials, next_serials, periods = _periods(sub_serials, sub_rows)
+
+    fixing_serials = index_business_days.add(reset_serials, -rate_index.fixing_lag)
+    rate_start_serials = fixing_serials + rate_index.spot_lag
+    rate_end_serials = _add_tenor(rate_start_serials, rate_index.tenor)
+    weight_end_serials = np.minimum(next_serials, end_serials[periods])
+
+    sub_rates = _index_rates(
+        rate_index,
+        index_business_days,
+        value_dt,
+        reset_serials,
+        rate_start_serials,
+        rate_end_serials,
+        projection_curve,
+        rate_rule.convention.multiplier,
+        fixing_source,
+    )
+    sub_dcfs = _year_fracs(dc_type, reset_serials, weight_end_serials)
+
+    offsets = np.nonzero(np.append(True, periods[1:] != periods[:-1]))[0]
+    return rate_rule.compound_periods(sub_rates, sub_dcfs, offsets)
+
+
+###############################################################################
@@ -96,6 +96,9 @@ class XccySwapFixedLeg:
         self.accrued_days = []
         self.rates = []
 
+        self._payment_serials = np.array([])
+        self._year_fracs = np.array([])
+
         self.generate_payments()
 
     ###########################################################################
@@ -162,58 +165,70 @@ class XccySwapFixedLeg:
 
             prev_dt = next_dt
 
+        # Array copies used by value
+        self._payment_serials = np.array(
+            [dt.excel_dt for dt in self.payment_dts]
+        )
+        self._year_fracs = np.array(self.year_fracs)
+
     ###########################################################################
 
-    def value(
-        self, value_dt: Date, discount_curve: DiscountCurve, pv_only=True
-    ):
+    def _payment_dfs(self, value_dt: Date, discount_curve: DiscountCurve):
+        """Discount factors from the value date to each payment date in one
+        vectorised curve call. Payments on or before the value date get zero.
+        Also returns the index of the first live payment."""
 
-        self.payment_dfs = []
-        self.payment_pvs = []
-        self.cumulative_pvs = []
+        payment_dfs = np.zeros(len(self._payment_serials))
 
-        notional = self.notional
-        df_value = discount_curve.df(value_dt)
-        leg_pv = 0.0
-        num_payments = len(self.payment_dts)
+        # payment dates are increasing so live payments are a tail slice
+        i_live = np.searchsorted(
+            self._payment_serials, value_dt.excel_dt, side="right"
+        )
 
-        df_payment = 0.0
+        if i_live < len(payment_dfs):
+            df_value = discount_curve.df(value_dt)
+            payment_dfs[i_live:] = (
+                discount_curve.df(self.payment_dts[i_live:]) / df_value
+            )
 
-        for i_pmnt in range(0, num_payments):
+        return payment_dfs, i_live
 
-            payment_dt = self.payment_dts[i_pmnt]
-            pmnt_amount = self.payments[i_pmnt]
+    ###########################################################################
 
-            if payment_dt > value_dt:
+    def value(
+        self, value_dt: Date, discount_curve: DiscountCurve, pv_only=True
+    ):
 
-                df_payment = discount_curve.df(payment_dt) / df_value
-                payment_pv = pmnt_amount * df_payment
-                leg_pv += payment_pv
+        notional = self.notional
+        payment_dfs, i_live = self._payment_dfs(value_dt, discount_curve)
 
-                self.payment_dfs.append(df_payment)
-                self.payment_pvs.append(pmnt_amount * df_payment)
-                self.cumulative_pvs.append(leg_pv)
+        # amounts follow the current coupon as it may be bumped in place
+        payment_amounts = self._year_fracs * (notional * self.cpn)
+        payment_pvs = payment_amounts * payment_dfs
 
-            else:
+        if self.is_final_notional_ex:
+            if i_live < len(payment_pvs):
+                payment_pvs[-1] += self.principal * payment_dfs[-1] * notional
+
+        self.payment_amounts = payment_amounts
+        self.payment_dfs = payment_dfs
+        self.payment_pvs = payment_pvs
+        self.cumulative_pvs = np.cumsum(payment_pvs)
+
+        # kept as a numpy scalar as in the loop it replaced
+        leg_pv = payment_pvs.sum()
 
-                self.payment_dfs.append(0.0)
-                self.payment_pvs.append(0.0)
-                self.cumulative_pvs.append(0.0)
+        # the initial exchange is not one of the coupon flows so it is kept
+        # out of the per payment arrays and added to the report as its own row
+        self.init_notional_ex_df = None
+        self.init_notional_ex_pv = 0.0
 
         if self.is_init_notional_ex:
             if self.effective_dt > value_dt:
                 df_settle = discount_curve.df(self.effective_dt) / discount_curve.df(value_dt)
-                payment_pv = - self.principal * df_settle * notional
-                self.payment_pvs.insert(1, payment_pv)
-                leg_pv += payment_pv
-                self.cumulative_pvs.insert(1, payment_pv)
-
-        if self.is_final_notional_ex:
-            if self.payment_dts[-1] > value_dt:
-                payment_pv = self.principal * self.payment_dfs[-1] * notional
-                self.payment_pvs[-1] += payment_pv
-                leg_pv += payment_pv
-                self.cumulative_pvs[-1] = leg_pv
+                self.init_notional_ex_df = df_settle
+                self.init_notional_ex_pv = - self.principal * df_settle * notional
+                leg_pv += self.init_notional_ex_pv
 
         if self.leg_type == SwapTypes.PAY:
             leg_pv = leg_pv * (-1.0)
@@ -258,11 +273,27 @@ class XccySwapFixedLeg:
         df["end_accrual_date"] = self.end_accrued_dts
         df["year_frac"] = self.year_fracs
         df["rate"] = self.cpn
-        df["payment"] = np.array(self.payments) * leg_type_sign
+        df["payment"] = self.payment_amounts * leg_type_sign
         df["payment_df"] = self.payment_dfs
         df["payment_pv"] = np.array(self.payment_pvs) * leg_type_sign
         df["leg"] = "FIXED"
 
+        if self.init_notional_ex_df is not None:
+            init_notional_ex = pd.DataFrame(
+                {
+                    "payment_date": [self.effective_dt],
+                    "start_accrual_date": [self.effective_dt],
+                    "end_accrual_date": [self.effective_dt],
+                    "year_frac": [0.0],
+                    "rate": [self.cpn],
+                    "payment": [-self.principal * self.notional * leg_type_sign],
+                    "payment_df": [self.init_notional_ex_df],
+                    "payment_pv": [self.init_notional_ex_pv * leg_type_sign],
+                    "leg": ["FIXED"],
+                }
+            )
+            df = pd.concat([init_notional_ex, df], ignore_index=True)
+
         return df
 
     ##########################################################################
@@ -350,7 +381,7 @@ class XccySwapFixedLeg:
                     self.payment_dts[i_flow],
                     round(self.notional, 0),
                     round(self.rates[i_flow] * 100.0, 4),
-                    round(self.payments[i_flow], 2),
+                    round(self.payment_amounts[i_flow], 2),
                     round(self.payment_dfs[i_flow], 4),
                     round(self.payment_pvs[i_flow], 2),
                     round(self.cumulative_pvs[i_flow], 2),
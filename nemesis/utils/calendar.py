@@ -1,6 +1,7 @@
 import datetime
 from enum import Enum
 
+import numpy as np
 from chinese_calendar import is_holiday
 
 from .date import Date
@@ -231,6 +232,56 @@ class Calendar:
             return False
         return not self.is_holiday(dt)
 
+###############################################################################
+
+    def business_day_serials(self,
+                             start_dt: Date,
+                             end_dt: Date):
+        """ Returns the date serials (Excel convention, as in Date.excel_dt)
+        of all business days in [start_dt, end_dt) as an integer array. These
+        are read from a bitmap of business days that is built once per year
+        and calendar and then shared by all calendar objects of that kind. """
+
+        start = int(start_dt.excel_dt)
+        end = int(end_dt.excel_dt)
+
+        if end <= start:
+            return np.zeros(0, dtype=np.int64)
+
+        serials = np.arange(start, end, dtype=np.int64)
+        is_bus_day = np.zeros(end - start, dtype=bool)
+
+        last_dt = end_dt.add_days(-1)
+
+        for year in range(start_dt.y, last_dt.y + 1):
+            year_start, bitmap = self._business_day_bitmap(year)
+            lo = max(start, year_start)
+            hi = min(end, year_start + len(bitmap))
+            is_bus_day[lo - start:hi - start] = \
+                bitmap[lo - year_start:hi - year_start]
+
+        return serials[is_bus_day]
+
+###############################################################################
+
+    def _business_day_bitmap(self, year: int):
+        """ Return the serial of 1 Jan of the year and a boolean array which
+        flags the business days of that year. """
+
+        key = (type(self), str(self), year)
+
+        if key not in _BUSINESS_DAY_BITMAPS:
+            dt = Date(1, 1, year)
+            end_dt = Date(1, 1, year + 1)
+            bitmap = np.zeros(int(end_dt.excel_dt - dt.excel_dt), dtype=bool)
+            for i in range(0, len(bitmap)):
+                bitmap[i] = self.is_business_day(dt)
+                dt = dt.add_days(1)
+            _BUSINESS_DAY_BITMAPS[key] = (int(Date(1, 1, year).excel_dt),
+                                          bitmap)
+
+        return _BUSINESS_DAY_BITMAPS[key]
+
 ###############################################################################
 
     def is_holiday(self,
@@ -1206,4 +1257,7 @@ _CALENDAR_CLASSES: dict[CalendarTypes, type] = {
     CalendarTypes.CHINA_IB: ChinaIBCalendar,
 }
 
+# Business day bitmaps keyed by (calendar class, calendar name, year)
+_BUSINESS_DAY_BITMAPS: dict = {}
+
 ###############################################################################
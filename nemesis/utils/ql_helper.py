@@ -17,3 +17,24 @@ def ql_date_to_date(ql_date: Union[ql.Date, list, tuple]):
 
     elif isinstance(ql_date, np.ndarray):
         return [Date(dt.dayOfMonth(), dt.month(), dt.year()) for dt in ql_date.squeeze()]
+
+
+def ql_dates_to_serials(ql_dates: Union[list, tuple]):
+    """Convert a vector of QuantLib Dates to an array of date serials. These
+    are the same as the Date excel_dt so can be differenced against it."""
+
+    return np.fromiter(
+        (dt.serialNumber() for dt in ql_dates), dtype=np.int64, count=len(ql_dates)
+    )
+
+
+def ql_discount_factors(ql_term_structure, ql_dates: Union[list, tuple]):
+    """Discount factors of a QuantLib term structure on a vector of QuantLib
+    Dates as a numpy array. QuantLib has no vectorised discount, so this is
+    still one discount call per date, filled straight into the array."""
+
+    discount = ql_term_structure.discount
+
+    return np.fromiter(
+        (discount(dt) for dt in ql_dates), dtype=float, count=len(ql_dates)
+    )
@@ -1,5 +1,6 @@
 import numpy as np
 
+from ..market.indices.interest_rate_index import DataFrameFixingSource
 from .calendar import BusDayAdjustTypes, Calendar
 from .day_count import DayCount, DayCountTypes
 from .error import FinError
@@ -14,6 +15,22 @@ def get_real_fixing_date(fixing_date, cal_type):
     return real_fixing_date
 
 
+def get_index_fixing(index_curve, fixing_date):
+    """Look up the historical fixing of an index curve on a date. The fixing
+    table of the curve is normalised to a sorted serial index on first use
+    and kept on the curve until the table is replaced."""
+    cached = getattr(index_curve, "_fixing_source", None)
+    if cached is None or cached.fixing_df is not index_curve.fixing:
+        cached = DataFrameFixingSource(index_curve.fixing, fixing_col="Fixing")
+        index_curve._fixing_source = cached
+
+    rate = cached.get_fixings([fixing_date], fixing_date)[0]
+    if np.isnan(rate):
+        raise FinError(f"No fixing found for {fixing_date}")
+
+    return rate
+
+
 def get_forward_rate(index_curve, cal_type, today, fixing_date, use_last_fixing=False):
     calendar = Calendar(cal_type)
     if today < index_curve.value_dt:
@@ -21,11 +38,11 @@ def get_forward_rate(index_curve, cal_type, today, fixing_date, use_last_fixing=
     real_fixing_date = get_real_fixing_date(fixing_date, cal_type)
     if real_fixing_date <= today:
         if real_fixing_date <= index_curve.value_dt:
-            rate = index_curve.fixing.loc[real_fixing_date.datetime().strftime("%Y%m%d")]["Fixing"]
+            rate = get_index_fixing(index_curve, real_fixing_date)
         else:
             if use_last_fixing:
                 last_fixing_date = calendar.adjust(index_curve.value_dt, bd_type=BusDayAdjustTypes.PRECEDING)
-                rate = index_curve.fixing.loc[last_fixing_date.datetime().strftime("%Y%m%d")]["Fixing"]
+                rate = get_index_fixing(index_curve, last_fixing_date)
             else:
                 real_date = calendar.add_business_days(real_fixing_date, num_days=index_curve.spot_days)
                 real_end_date = calendar.adjust(real_fixing_date.add_tenor(index_curve.tenor), BusDayAdjustTypes.FOLLOWING)
@@ -1,5 +1,90 @@
 import numpy as np
-from scipy.linalg import solve_banded
+from numba import njit
+
+from .math import solve_tridiagonal_matrix
+
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _tension_spline_coefs(x: np.ndarray, y: np.ndarray, sig: float):
+    """Compute the interval widths, hyperbolic terms and the second
+    derivatives of an exponential tension spline by solving the tridiagonal
+    system of [AP] Sec 6.A.3."""
+    n = len(x)
+    h = x[1:] - x[:-1]
+    sh = np.sinh(sig * h)
+    ch = np.cosh(sig * h)
+
+    # columns are lower, main and upper diagonals
+    a_matrix = np.zeros((n, 3))
+    r = np.zeros(n)
+
+    a_matrix[0, 1] = 1.0
+    a_matrix[n - 1, 1] = 1.0
+
+    for i in range(1, n - 1):
+        hl = h[i - 1]
+        hr = h[i]
+        a_matrix[i, 0] = 1.0 / hl - sig / sh[i - 1]
+        a_matrix[i, 1] = (
+            sig * (ch[i - 1] / sh[i - 1] + ch[i] / sh[i]) - 1.0 / hl - 1.0 / hr
+        )
+        a_matrix[i, 2] = 1.0 / hr - sig / sh[i]
+        r[i] = ((y[i + 1] - y[i]) / hr - (y[i] - y[i - 1]) / hl) * sig * sig
+
+    ypp = solve_tridiagonal_matrix(a_matrix, r)
+    return h, sh, ch, ypp
+
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _tension_spline_eval(
+    x: np.ndarray,
+    y: np.ndarray,
+    h: np.ndarray,
+    sh: np.ndarray,
+    ypp: np.ndarray,
+    sig: float,
+    xs: np.ndarray,
+):
+    """Evaluate a fitted tension spline at all points xs. Brackets are found
+    with a single binary search over the knots and values outside the knot
+    range are extrapolated flat."""
+    n = len(x)
+    sig2 = sig * sig
+    ids = np.searchsorted(x, xs)
+    out = np.empty(len(xs))
+
+    for i in range(len(xs)):
+        idx = ids[i]
+
+        # handle extrapolation first
+        if idx == 0:
+            out[i] = y[0]
+            continue
+        if idx == n:
+            out[i] = y[n - 1]
+            continue
+
+        # main calc. x[idx-1] < xs[i] <= x[idx]
+        dl = xs[i] - x[idx - 1]
+        dr = x[idx] - xs[i]
+        hi = h[idx - 1]
+        shi = sh[idx - 1]
+        v1 = (np.sinh(sig * dr) / shi - dr / hi) * ypp[idx - 1] / sig2
+        v2 = (np.sinh(sig * dl) / shi - dl / hi) * ypp[idx] / sig2
+        v3 = y[idx - 1] * dr / hi
+        v4 = y[idx] * dl / hi
+        out[i] = v1 + v2 + v3 + v4
+
+    return out
+
+
+###############################################################################
 
 
 class TensionSpline(object):
@@ -28,81 +113,19 @@ class TensionSpline(object):
 
         self.validate_inputs()
 
-        N = len(self._x)
-        sig = self._sigma
-
-        # prelim calcs
-        # TODO: cache 1/h, 1/sh etc not h, sh for efficiency
-        dy = np.diff(self._y)
-        self._h = np.diff(self._x)
-        self._sh = np.sinh(sig * self._h)
-        self._ch = np.cosh(sig * self._h)
-
-        # useful views
-        hl = self._h[:-1]
-        hr = self._h[1:]
-        shl = self._sh[:-1]
-        shr = self._sh[1:]
-        chl = self._ch[:-1]
-        chr = self._ch[1:]
-
-        # set up a tri-diagona matrix in the form needed for solve_baded
-        ab = np.zeros((3, N))
-
-        # main diagonal
-        ab[1, 0] = 1
-        ab[1, -1] = 1
-        ab[1, 1:-1] = sig * (chl / shl + chr / shr) - 1 / hl - 1 / hr
-
-        # lower diagonal
-        ab[2, :-2] = 1 / hl - sig / shl
-
-        # upper diagonal
-        ab[0, 2:] = 1 / hr - sig / shr
-
-        # rhs
-        b = np.zeros(N)
-        b[1:-1] = (dy[1:] / hr - dy[:-1] / hl) * sig * sig
-
-        self._ypp = solve_banded((1, 1), ab, b)
+        self._h, self._sh, self._ch, self._ypp = _tension_spline_coefs(
+            self._x, self._y, float(self._sigma)
+        )
 
     def __call__(self, xs):
         xs = np.atleast_1d(xs).astype(float)
 
-        # rename for brevity
-        h = self._h
-        sh = self._sh
-        sig = self._sigma
-        sig2 = sig * sig
-
-        ids = np.searchsorted(self._x, xs, side="left")
-        out = np.zeros_like(xs)
-        for i, x in enumerate(xs):
-            idx = ids[i]
-
-            # handle extrapolation first
-            if idx == 0:
-                out[i] = self._y[0]
-                continue
-            if idx == len(self._x):
-                out[i] = self._y[-1]
-                continue
-
-            # main calc. self._x[idx-1] < x <= self._x[idx]
-            xl = self._x[idx - 1]
-            xr = self._x[idx]
-            v1 = (
-                (np.sinh(sig * (xr - x)) / sh[idx - 1] - (xr - x) / h[idx - 1])
-                * self._ypp[idx - 1]
-                / sig2
-            )
-            v2 = (
-                (np.sinh(sig * (x - xl)) / sh[idx - 1] - (x - xl) / h[idx - 1])
-                * self._ypp[idx]
-                / sig2
-            )
-            v3 = self._y[idx - 1] * (xr - x) / h[idx - 1]
-            v4 = self._y[idx] * (x - xl) / h[idx - 1]
-            out[i] = v1 + v2 + v3 + v4
-
-        return out
+        return _tension_spline_eval(
+            self._x,
+            self._y,
+            self._h,
+            self._sh,
+            self._ypp,
+            float(self._sigma),
+            xs,
+        )
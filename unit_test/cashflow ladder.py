@@ -0,0 +1,120 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+parant_folder_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(parant_folder_path)
+
+from nemesis.market.curves.discount_curve_zeros import DiscountCurveZeros
+from nemesis.products.fx.fx_forward import FXForward
+from nemesis.products.general import CashflowLadder
+from nemesis.products.general.trs import FixedFundingLeg, TotalReturnSwap
+from nemesis.products.rates import *
+from nemesis.utils import *
+
+
+def ladder_pv(ladder, fx_rates=None):
+    """Sum of the discounted ladder amounts, converted with fx_rates keyed
+    by currency where given."""
+    pv = 0.0
+    for batch in ladder.batches():
+        for ccy, amount, df in zip(batch["currency"], batch["amount"], batch["df"]):
+            pv += amount * df * (fx_rates or {}).get(ccy, 1.0)
+    return pv
+
+
+value_dt = Date(13, 3, 2026)
+zero_dts = [value_dt.add_tenor(tenor) for tenor in ["3M", "1Y", "2Y", "5Y"]]
+usd_curve = DiscountCurveZeros(value_dt, zero_dts, [0.043, 0.041, 0.039, 0.038])
+eur_curve = DiscountCurveZeros(value_dt, zero_dts, [0.021, 0.022, 0.023, 0.025])
+
+
+#%% FX forwards sum to FXForward.value at the spot rate
+spot_fx_rate = 1.085
+strike_fx_rate = 1.10
+notional = 10_000_000
+
+for spot_days in [0, 2]:
+    expiry_dt = value_dt.add_tenor("1Y")
+    fx_forward = FXForward(
+        expiry_dt, spot_fx_rate, strike_fx_rate, "EURUSD", notional, "EUR", spot_days
+    )
+    product_pv = fx_forward.value(value_dt, usd_curve, eur_curve)["value"]
+
+    ladder = CashflowLadder(value_dt)
+    ladder.add_fx_forward("FXF", fx_forward, usd_curve, eur_curve)
+    pv = ladder_pv(ladder, {"EUR": spot_fx_rate})
+    print(f"spot days {spot_days}: ladder {pv:,.4f} product {product_pv:,.4f}")
+    assert abs(pv - product_pv) < 1e-6
+
+    # The same trade with its notional in the domestic currency
+    dom_forward = FXForward(
+        expiry_dt, spot_fx_rate, strike_fx_rate, "EURUSD",
+        notional * strike_fx_rate, "USD", spot_days
+    )
+    ladder = CashflowLadder(value_dt)
+    ladder.add_fx_forward("FXF", dom_forward, usd_curve, eur_curve)
+    assert abs(ladder_pv(ladder, {"EUR": spot_fx_rate}) - product_pv) < 1e-6
+
+
+#%% Swaps sum to InterestRateSwap.value
+config = SOFRConfig()
+sofr_dt = Date(11, 8, 2025)
+sofr_curve = config.build(sofr_dt, "./unit_test/data/sofr_curve_data_20250811.xlsx")
+conv = config.swap_conventions[0]
+
+swap = InterestRateSwap(
+    sofr_dt.add_weekdays(2), "5Y", SwapTypes.PAY, 0.035, conv.fixed_freq_type,
+    conv.fixed_dc_type, conv.float_freq_type, conv.float_dc_type, conv.rate_index,
+    conv.float_convention, 1e7, conv.payment_lag, conv.cal_type, conv.bd_type,
+    conv.dg_type, conv.end_of_month,
+)
+ladder = CashflowLadder(sofr_dt)
+ladder.add_swap("IRS", swap, "USD", sofr_curve)
+pv = ladder_pv(ladder)
+product_pv = swap.value(sofr_dt, sofr_curve, sofr_curve)
+print(f"swap: ladder {pv:,.4f} product {product_pv:,.4f}")
+assert abs(pv - product_pv) < 1e-6
+
+
+#%% TRS flows are projected over the full periods and discounted
+start_dt = Date(13, 12, 2025)
+reset_dts = [Date(13, 3, 2026), Date(15, 6, 2026), Date(14, 9, 2026)]
+payment_dts = [dt.add_weekdays(2) for dt in reset_dts]
+quantity = 250_000
+initial_asset_price = 96.115
+latest_asset_price = 96.055
+
+funding_leg = FixedFundingLeg(
+    0.0003,
+    [start_dt] + reset_dts[:-1],
+    reset_dts,
+    payment_dts,
+    SwapTypes.RECEIVE,
+    [quantity * initial_asset_price] * 3,
+    DayCountTypes.ACT_360,
+)
+trs = TotalReturnSwap(
+    start_dt, reset_dts[-1], reset_dts, payment_dts, SwapTypes.PAY, quantity,
+    initial_asset_price, asset_prices=pd.Series({reset_dts[0]: 96.2}),
+    funding_legs={"funding": funding_leg},
+)
+
+ladder = CashflowLadder(value_dt)
+ladder.add_trs("TRS", trs, latest_asset_price, usd_curve, ccy="USD")
+batch = next(ladder.batches())
+print(pd.DataFrame(batch))
+
+# The last period has not started, so its price return is projected from
+# the forward prices at its two resets
+asset = batch["amount"][batch["leg"] == "TOTAL_RETURN_ASSET"]
+fwd_prices = latest_asset_price * usd_curve.df(value_dt) / usd_curve.df(reset_dts[1:])
+assert abs(asset[-1] + quantity * (fwd_prices[1] - fwd_prices[0])) < 1e-6
+
+# Funding accrues over the full periods
+funding = batch["amount"][batch["leg"] == "TOTAL_RETURN_FUNDING_funding"]
+year_fracs = [(end - begin) / 360 for begin, end in zip([start_dt] + reset_dts[:-1], reset_dts)]
+assert np.allclose(funding, quantity * initial_asset_price * 0.0003 * np.array(year_fracs))
@@ -0,0 +1,96 @@
+import os
+import sys
+
+import numpy as np
+
+
+parant_folder_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(parant_folder_path)
+
+from nemesis.market.curves.discount_curve import DiscountCurve
+from nemesis.products.credit import CDS, CDSCurve, value_cds_batch
+from nemesis.utils import *
+
+
+# Results of the pure Python risky PV01, protection leg and fast approximation
+# that the compiled kernels replaced, for the trades below. Each row holds the
+# dirty and clean risky PV01 for pv01_method 0 and 1, the protection leg PV for
+# prot_method 0 and 1 and the four outputs of value_fast_approx
+REFERENCE = np.array(
+    [
+        [1.2304652169889279, 1.1137985503222612, 1.2304652169889279, 1.1137985503222612, 69056.14986325358, 69056.14986325358, -4037.7508652207143, 7628.915801445954, -8056.405621410362, -9155.711292899156],
+        [2.1610782432506355, 1.941633798806191, 2.1610782432506355, 1.941633798806191, 154376.06713852464, 154376.06713852464, -99069.52146161156, -110041.74368383377, -8063.052727427988, -6157.103205840875],
+        [3.010829404033493, 2.9413849595890484, 3.010829404033493, 2.9413849595890484, 301577.96485678403, 301577.96485678403, 13037.379753005625, 19981.82419745007, -21103.012587858248, -23986.445007217757],
+        [4.59844030851331, 4.426218086291088, 4.59844030851331, 4.426218086291088, 552422.3483232583, 552422.3483232583, -12905.458145946232, -30127.680368168454, -2624.422193436949, 1728.200876783747],
+        [4.539372840037397, 4.514372840037397, 4.539372840037397, 4.514372840037397, 579584.5456731075, 579584.5456731075, -1775754.6310008522, -1763254.6310008522, -38309.18757353723, -43028.614748694],
+        [5.924474583783541, 5.796696806005762, 5.924474583783541, 5.796696806005762, 815111.3603241958, 815111.3603241958, -26808.365363614375, -39586.14314139215, 16257.024997589942, 21983.79319944437],
+        [7.706408021714979, 7.475852466159424, 7.706408021714979, 7.475852466159424, 1126781.1980463266, 1126781.1980463266, 28276.09925131425, 51331.6548068698, -54222.99573699897, -61660.74207204452],
+        [3.7148987289880417, 3.637120951210264, 3.7148987289880417, 3.637120951210264, 468010.2238656448, 468010.2238656448, -313127.4279533921, -314682.98350894765, 22210.264178905636, 25753.095934319485],
+    ]
+)
+
+value_dt = Date(1, 11, 2024)
+libor_dts = [value_dt.add_tenor(tenor) for tenor in ["1M", "6M", "1Y", "2Y", "3Y", "5Y", "7Y", "10Y"]]
+libor_times = np.array([(dt - value_dt) / 365.0 for dt in libor_dts])
+libor_curve = DiscountCurve(
+    value_dt, libor_dts, np.exp(-0.04 * libor_times + 0.002 * libor_times ** 1.5)
+)
+
+curve_tenors = ["6M", "1Y", "2Y", "3Y", "5Y", "7Y", "10Y"]
+curve_spreads = [0.005, 0.0062, 0.0078, 0.0095, 0.0118, 0.0131, 0.0142]
+curve_cds = [CDS(value_dt, tenor, spread) for tenor, spread in zip(curve_tenors, curve_spreads)]
+issuer_curve = CDSCurve(value_dt, curve_cds, libor_curve, 0.4)
+
+# The pillars the reference was valued on, so that the kernels are pinned
+# independently of the bootstrap tolerance
+issuer_curve._times = np.array(
+    [0.0, 0.6328767123287671, 1.1342465753424658, 2.1342465753424658,
+     3.1342465753424658, 5.136986301369863, 7.136986301369863, 10.139726027397261]
+)
+issuer_curve._values = np.array(
+    [1.0, 0.9946953549836858, 0.9882122163363883, 0.9721955115484021,
+     0.9504516235642414, 0.9006558325692073, 0.849884342669812, 0.7768702111939603]
+)
+
+trades = [
+    CDS(value_dt.add_days(k * 37), tenor, cpn, 1e7, k % 2 == 0)
+    for k, (tenor, cpn) in enumerate(
+        [("1Y", 0.01), ("2Y", 0.005), ("3Y", 0.01), ("5Y", 0.01),
+         ("5Y", 0.05), ("7Y", 0.01), ("10Y", 0.01), ("4Y", 0.002)]
+    )
+]
+
+
+#%% single contracts against the reference
+results = []
+for cds in trades:
+    row = []
+    for pv01_method in [0, 1]:
+        rpv01 = cds.risky_pv01(value_dt, issuer_curve, pv01_method)
+        row += [rpv01["dirty_rpv01"], rpv01["clean_rpv01"]]
+    for prot_method in [0, 1]:
+        row.append(cds.prot_leg_pv(value_dt, issuer_curve, 0.4, prot_method=prot_method))
+    row += cds.value_fast_approx(value_dt, 0.04, 0.01, 0.4, 0.35)
+    results.append(row)
+
+assert np.allclose(np.array(results), REFERENCE, rtol=1e-10, atol=1e-8)
+print('Parity of the single contract kernels: OK')
+
+
+#%% batch valuation against the reference
+signs = np.array([1.0 if cds.long_protect else -1.0 for cds in trades])
+cpns = np.array([cds.running_cpn for cds in trades])
+notionals = np.array([cds.notional for cds in trades])
+
+for method in [0, 1]:
+    batch = value_cds_batch(
+        trades, value_dt, issuer_curve, 0.4, pv01_method=method, prot_method=method
+    )
+    prot_pvs = REFERENCE[:, 4 + method]
+    dirty_pvs = signs * (prot_pvs - cpns * REFERENCE[:, 2 * method] * notionals)
+    clean_pvs = signs * (prot_pvs - cpns * REFERENCE[:, 2 * method + 1] * notionals)
+
+    assert np.allclose(batch["dirty_pv"], dirty_pvs, rtol=1e-10, atol=1e-6)
+    assert np.allclose(batch["clean_pv"], clean_pvs, rtol=1e-10, atol=1e-6)
+
+print('Parity of the batch valuation: OK')
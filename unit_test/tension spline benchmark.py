@@ -0,0 +1,135 @@
+import os
+import sys
+import timeit
+
+import numpy as np
+from scipy.linalg import solve_banded
+
+
+parant_folder_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(parant_folder_path)
+
+from nemesis.utils.tension_spline import TensionSpline
+
+
+# The pure Python/NumPy tension spline that the compiled one replaced, kept
+# here as the reference for the benchmark and the parity checks
+class ReferenceTensionSpline:
+
+    def __init__(self, x, y, sigma):
+        self._x = np.atleast_1d(x).astype(float)
+        self._y = np.atleast_1d(y).astype(float)
+        self._sigma = max(sigma, 1e-2)
+        self.calculate_coefs()
+
+    def calculate_coefs(self):
+        N = len(self._x)
+        sig = self._sigma
+
+        dy = np.diff(self._y)
+        self._h = np.diff(self._x)
+        self._sh = np.sinh(sig * self._h)
+        self._ch = np.cosh(sig * self._h)
+
+        hl = self._h[:-1]
+        hr = self._h[1:]
+        shl = self._sh[:-1]
+        shr = self._sh[1:]
+        chl = self._ch[:-1]
+        chr = self._ch[1:]
+
+        ab = np.zeros((3, N))
+        ab[1, 0] = 1
+        ab[1, -1] = 1
+        ab[1, 1:-1] = sig * (chl / shl + chr / shr) - 1 / hl - 1 / hr
+        ab[2, :-2] = 1 / hl - sig / shl
+        ab[0, 2:] = 1 / hr - sig / shr
+
+        b = np.zeros(N)
+        b[1:-1] = (dy[1:] / hr - dy[:-1] / hl) * sig * sig
+
+        self._ypp = solve_banded((1, 1), ab, b)
+
+    def __call__(self, xs):
+        xs = np.atleast_1d(xs).astype(float)
+
+        h = self._h
+        sh = self._sh
+        sig = self._sigma
+        sig2 = sig * sig
+
+        ids = np.searchsorted(self._x, xs, side="left")
+        out = np.zeros_like(xs)
+        for i, x in enumerate(xs):
+            idx = ids[i]
+
+            if idx == 0:
+                out[i] = self._y[0]
+                continue
+            if idx == len(self._x):
+                out[i] = self._y[-1]
+                continue
+
+            xl = self._x[idx - 1]
+            xr = self._x[idx]
+            v1 = (
+                (np.sinh(sig * (xr - x)) / sh[idx - 1] - (xr - x) / h[idx - 1])
+                * self._ypp[idx - 1]
+                / sig2
+            )
+            v2 = (
+                (np.sinh(sig * (x - xl)) / sh[idx - 1] - (x - xl) / h[idx - 1])
+                * self._ypp[idx]
+                / sig2
+            )
+            v3 = self._y[idx - 1] * (xr - x) / h[idx - 1]
+            v4 = self._y[idx] * (x - xl) / h[idx - 1]
+            out[i] = v1 + v2 + v3 + v4
+
+        return out
+
+
+def best_time(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+#%% parity with the reference implementation
+rng = np.random.default_rng(42)
+
+for num_knots in [2, 3, 5, 11, 20]:
+    for sigma in [1e-2, 0.5, 2.0, 10.0]:
+        x = np.cumsum(rng.uniform(0.1, 2.0, num_knots))
+        y = 0.03 + 0.01 * rng.standard_normal(num_knots)
+        xs = np.linspace(x[0] - 1.0, x[-1] + 1.0, 1001)
+
+        spline = TensionSpline(x, y, sigma)
+        reference = ReferenceTensionSpline(x, y, sigma)
+
+        # the system loses about 1 / sigma^2 of precision near the 1e-2
+        # tension floor, so the second derivatives are compared relatively
+        assert np.allclose(spline._ypp, reference._ypp, rtol=1e-8, atol=1e-9), (num_knots, sigma)
+        assert np.max(np.abs(spline(xs) - reference(xs))) < 1e-10, (num_knots, sigma)
+
+print('Parity with the reference implementation: OK')
+
+
+#%% benchmark on a typical 11 knot zero curve
+x = np.array([0.08, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 20.0, 30.0])
+y = np.array([0.043, 0.044, 0.042, 0.040, 0.037, 0.036, 0.035, 0.036, 0.037, 0.038, 0.037])
+sigma = 2.0
+xs = np.linspace(0.0, 35.0, 10000)
+
+spline = TensionSpline(x, y, sigma)
+reference = ReferenceTensionSpline(x, y, sigma)
+
+cases = [
+    ('fit', lambda: ReferenceTensionSpline(x, y, sigma), lambda: TensionSpline(x, y, sigma), 2000),
+    ('evaluate 10k points', lambda: reference(xs), lambda: spline(xs), 5),
+    ('evaluate scalar', lambda: reference(7.5), lambda: spline(7.5), 20000),
+]
+
+print(f'{"case":<22}{"reference (us)":>16}{"compiled (us)":>16}{"speedup":>10}')
+for name, reference_func, compiled_func, number in cases:
+    reference_time = best_time(reference_func, number) * 1e6
+    compiled_time = best_time(compiled_func, number) * 1e6
+    print(f'{name:<22}{reference_time:>16.2f}{compiled_time:>16.2f}{reference_time / compiled_time:>10.1f}')